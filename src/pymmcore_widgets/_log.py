@@ -1,15 +1,19 @@
 from __future__ import annotations
 
 import os
-from collections import deque
+import re
+import threading
 from contextlib import suppress
 from typing import TYPE_CHECKING
 
+import numpy as np
 from pymmcore_plus import CMMCorePlus
 from qtpy.QtCore import (
     QFileSystemWatcher,
     QObject,
     QSize,
+    Qt,
+    QThread,
     QTimer,
     QTimerEvent,
     QUrl,
@@ -17,37 +21,91 @@ from qtpy.QtCore import (
 )
 from qtpy.QtGui import QCloseEvent, QDesktopServices, QFontDatabase, QPalette
 from qtpy.QtWidgets import (
+    QAbstractItemView,
     QApplication,
     QCheckBox,
+    QComboBox,
     QHBoxLayout,
-    QPlainTextEdit,
+    QLabel,
+    QLineEdit,
+    QListView,
     QPushButton,
     QSizePolicy,
+    QSplitter,
     QVBoxLayout,
     QWidget,
 )
 from superqt import QElidingLabel, QIconifyIcon
 
+from ._log_index import (
+    LEVELS,
+    LogChunk,
+    _concat_chunks,
+    _index_lines,
+    _LineTables,
+    _LogModel,
+    _LogSearcher,
+    _tail_offset,
+)
+from ._log_profiler import DeviceCallProfiler, DeviceLatencyTable
+
 if TYPE_CHECKING:
-    from io import TextIOWrapper
+    from io import BufferedReader
 
 
 class _LogReader(QObject):
-    """Watches a log file and emits new lines as they arrive."""
-
-    new_lines: Signal = Signal(str)
+    """Indexes a log file and keeps indexing new lines as they arrive.
+
+    On `start`, the last `tail_lines` lines of the file are indexed and emitted
+    right away (`new_chunk`). The rest of the file is then indexed block by block
+    in the background and emitted once complete (`head_chunk`), while the file
+    keeps being polled for new lines. All lines read in a single poll are emitted
+    together as one `LogChunk`.
+
+    The reader is meant to live in a worker thread (see `CoreLogWidget`): `start`
+    must be called from the thread that owns the reader (e.g. connected to
+    `QThread.started`), while `_stop` and `_read_new` are safe to call from any
+    thread. Chunks are delivered to receivers in other threads through queued
+    connections.
+
+    If `profiler` is set, newly appended lines are also fed to it (in the reader
+    thread).
+    """
+
+    new_chunk: Signal = Signal(object)  # LogChunk appended to the end of the index
+    head_chunk: Signal = Signal(object)  # LogChunk preceding the first new_chunk
+    progress: Signal = Signal(int)  # percentage of the file indexed
+    reset: Signal = Signal()  # the file was truncated or rotated
     finished: Signal = Signal()
 
+    HEAD_BLOCK_SIZE = 8 * 1024 * 1024
+
     def __init__(
         self,
         path: str,
         interval: int = 200,
         parent: QObject | None = None,
+        *,
+        tail_lines: int = 5_000,
     ) -> None:
         super().__init__(parent)
         self._path = path
         self._interval = interval
-        self._file: TextIOWrapper | None = None
+        self._tail_lines = tail_lines
+        self._file: BufferedReader | None = None
+        # guards the file handle, which may be touched from the GUI thread
+        self._lock = threading.Lock()
+        self._stopped = False
+
+        self._tables = _LineTables()
+        # byte offset of the next line to be read from the tail of the file
+        self._pos = 0
+        self._prev = (-1, -1, -1)
+        # [_head_pos, _head_end) is the part of the file still to be indexed
+        self._head_pos = self._head_end = 0
+        self._head_prev = (-1, -1, -1)
+        self._head_chunks: list[LogChunk] = []
+        self.profiler: DeviceCallProfiler | None = None
 
         # Unfortunately, on Windows, QFileSystemWatcher does not detect file changes
         # unless the file is flushed from cache to disk. This does NOT happen
@@ -67,53 +125,139 @@ class _LogReader(QObject):
 
     def timerEvent(self, event: QTimerEvent | None) -> None:
         if event and event.timerId() == self._timer_id:
-            self._read_new()
+            if self._stopped:
+                # timers can only be killed from the thread that owns them.
+                self.killTimer(self._timer_id)
+                self._timer_id = None
+            else:
+                self._read_new()
 
     def start(self) -> None:
-        """Open the file and start polling."""
+        """Open the file and start indexing (from the thread owning the reader)."""
         if self._timer_id is None:
-            self._file = open(self._path, encoding="utf-8", errors="replace")
-            self._file.seek(0, os.SEEK_END)
+            with self._lock:
+                if self._stopped:  # stopped before the thread got to start us
+                    return
+                self._file = open(self._path, "rb")
+                self._pos = _tail_offset(self._path, self._tail_lines)
+                self._head_pos, self._head_end = 0, self._pos
+            self._read_new()
+            QTimer.singleShot(0, self._index_head_step)
             self._timer_id = self.startTimer(self._interval)
 
     def _stop(self) -> None:
         """Stop polling and close the file."""
-        if self._timer_id is not None:
-            self.killTimer(self._timer_id)
-            self._timer_id = None
-        if self._file is not None:
-            with suppress(Exception):
-                self._file.close()
-            self._file = None
+        with self._lock:
+            if self._stopped:
+                return
+            self._stopped = True
+            if self._file is not None:
+                with suppress(Exception):
+                    self._file.close()
+                self._file = None
         self.finished.emit()
 
     def _on_file_changed(self, path: str) -> None:
         """Handle log rotation or truncation."""
-        try:
-            real_size = os.path.getsize(path)
-            current_pos = self._file.tell() if self._file else 0
-            if real_size < current_pos:
-                # rotated or truncated
-                if self._file:
-                    self._file.close()
-                self._file = open(self._path, encoding="utf-8", errors="replace")
+        with suppress(Exception):
             self._read_new()
-        except Exception:
-            pass
 
     def _read_new(self) -> None:
-        """Read and emit any new lines."""
-        if not self._file:
-            return
-        # Seek to current position to clear Python's internal read buffers,
-        # ensuring we see data written externally since the last read.
-        self._file.seek(self._file.tell())
-        for line in self._file:
-            self.new_lines.emit(line.rstrip("\n"))
+        """Index any new lines and emit them as a single chunk."""
+        with self._lock:
+            if self._file is None:
+                return
+            if os.path.getsize(self._path) < self._pos:
+                # rotated or truncated: start over from the beginning
+                self._tables = _LineTables()
+                self._pos = self._head_pos = self._head_end = 0
+                self._prev = (-1, -1, -1)
+                self._head_chunks.clear()
+                self.reset.emit()
+            # a buffered read of everything appended since the last poll.
+            # Incomplete trailing lines are left for the next poll.
+            self._file.seek(self._pos)
+            data = self._file.read()
+            chunk = _index_lines(data, self._pos, self._tables, self._prev, True)
+            if len(chunk):
+                self._pos = chunk.end
+                self._prev = chunk.last_meta()
+                if (profiler := self.profiler) is not None and chunk.data:
+                    profiler.feed(chunk.data.split(b"\n"))
+                # emitted under the lock (and queued, see CoreLogWidget), so that
+                # chunks read by different threads are appended in file order
+                self.new_chunk.emit(chunk)
+
+    def _index_head_step(self) -> None:
+        """Index the next block of the part of the file preceding the tail.
+
+        Reschedules itself (returning to the event loop in between, so that polling
+        continues) until the whole file has been indexed.
+        """
+        with self._lock:
+            if self._file is None or self._head_pos >= self._head_end:
+                return
+            self._file.seek(self._head_pos)
+            size = min(self.HEAD_BLOCK_SIZE, self._head_end - self._head_pos)
+            data = self._file.read(size)
+            if not data.endswith(b"\n"):
+                data += self._file.readline()  # complete the last line
+            chunk = _index_lines(data, self._head_pos, self._tables, self._head_prev)
+            self._head_chunks.append(chunk)
+            self._head_pos = chunk.end if len(chunk) else self._head_end
+            self._head_prev = chunk.last_meta()
+            done = self._head_pos >= self._head_end
+            if done and self._head_chunks:
+                head = _concat_chunks(self._head_chunks)
+                self._head_chunks.clear()
+            percent = 100 * self._head_pos // max(self._head_end, 1)
+
+        self.progress.emit(percent)
+        if not done:
+            QTimer.singleShot(0, self._index_head_step)
+        elif len(head):
+            self.head_chunk.emit(head)
+
+
+def _stop_workers(
+    reader: _LogReader, searcher: _LogSearcher, *threads: QThread
+) -> None:
+    """Stop `reader` and `searcher` and wait for their worker `threads` to finish."""
+    reader._stop()
+    searcher.cancel(np.iinfo(np.int64).max)
+    for thread in threads:
+        with suppress(RuntimeError):  # thread already deleted
+            thread.quit()
+            thread.wait()
 
 
 class CoreLogWidget(QWidget):
-    """High-performance log console with pause, follow-tail, clear, and initial load."""
+    """High-performance log console with filtering, search, and live tailing.
+
+    The whole log file is indexed in the background (byte offset, level, component
+    and thread of every line), and shown in a virtualized view that only reads the
+    lines on screen from disk, so even very large log files can be browsed and
+    filtered. The last `max_lines` lines are shown immediately.
+
+    Parameters
+    ----------
+    path : str | None
+        Path to the log file to display. If `None`, the primary log file of the
+        core is used.
+    max_lines : int
+        Number of lines from the end of the file that are shown immediately, before
+        the rest of the file has been indexed. By default, 5000.
+    parent : QWidget | None
+        Optional parent widget. By default, None.
+    mmcore : CMMCorePlus | None
+        Optional [`pymmcore_plus.CMMCorePlus`][] micromanager core.
+        By default, None. If not specified, the widget will use the active
+        (or create a new)
+        [`CMMCorePlus.instance`][pymmcore_plus.core._mmcore_plus.CMMCorePlus.instance].
+    """
+
+    # generation, pattern, start, end (byte offsets may not fit in a C int)
+    _searchRequested = Signal(int, str, object, object)
 
     def __init__(
         self,
@@ -149,28 +293,102 @@ class CoreLogWidget(QWidget):
         self._log_btn.setIcon(QIconifyIcon("majesticons:open", color=color))
         self._log_btn.setToolTip("Open log file in native editor")
 
+        # --- Filters ---
+        self._level_combo = QComboBox()
+        self._level_combo.setToolTip("Minimum level of the lines to show.")
+        self._level_combo.addItem("All levels", -1)
+        for i, level in enumerate(LEVELS):
+            self._level_combo.addItem(f"≥ {level}", i)
+
+        self._device_combo = QComboBox()
+        self._device_combo.setToolTip("Only show lines from this device/component.")
+        self._device_combo.setSizeAdjustPolicy(
+            QComboBox.SizeAdjustPolicy.AdjustToContents
+        )
+        self._device_combo.addItem("All components", None)
+
+        self._thread_combo = QComboBox()
+        self._thread_combo.setToolTip("Only show lines from this thread.")
+        self._thread_combo.addItem("All threads", None)
+
+        self._search = QLineEdit()
+        self._search.setPlaceholderText("Search (regex)...")
+        self._search.setClearButtonEnabled(True)
+        # searches run in a worker thread, (re)started once typing pauses
+        self._search_timer = QTimer(self)
+        self._search_timer.setSingleShot(True)
+        self._search_timer.setInterval(300)
+        self._search_gen = 0
+        self._search_pattern = ""  # pattern of the latest search
+        self._search_end = 0
+
+        self._status = QLabel()
+
+        self._profile_btn = QPushButton("Device Latency")
+        self._profile_btn.setCheckable(True)
+        self._profile_btn.setToolTip(
+            "Profile device call latencies from new log lines.\nRequires debug logging."
+        )
+
         # --- Log view ---
-        self._log_view = QPlainTextEdit(self)
-        self._log_view.setReadOnly(True)
-        self._log_view.setMaximumBlockCount(max_lines)
-        self._log_view.setLineWrapMode(QPlainTextEdit.LineWrapMode.NoWrap)
+        path = path or self._mmcore.getPrimaryLogFile()
+        self._path = path
+        self._log_path.setText(path)
+        self._model = _LogModel(path, self)
+
+        self._log_view = QListView(self)
+        self._log_view.setModel(self._model)
+        # all rows have the same height: lets the view skip measuring every row
+        self._log_view.setUniformItemSizes(True)
+        self._log_view.setLayoutMode(QListView.LayoutMode.Batched)
+        self._log_view.setSelectionMode(
+            QAbstractItemView.SelectionMode.ExtendedSelection
+        )
         # Monospaced font
         fixed_font = QFontDatabase.systemFont(QFontDatabase.SystemFont.FixedFont)
         fixed_font.setPixelSize(12)
         self._log_view.setFont(fixed_font)
-
-        path = path or self._mmcore.getPrimaryLogFile()
-        self._log_path.setText(path)
-        # Load the last `max_lines` from file
-        try:
-            with open(path, encoding="utf-8", errors="replace") as f:
-                for line in deque(f, maxlen=max_lines):
-                    self._log_view.appendPlainText(line.rstrip("\n"))
-        except Exception:
-            pass
+        self._follow_tail = True
+
+        # --- Device latency profiler ---
+        self._profiler = DeviceCallProfiler()
+        self._profile_table = DeviceLatencyTable(self._profiler)
+        self._profile_table.hide()
+        self._splitter = QSplitter(self)
+        self._splitter.addWidget(self._log_view)
+        self._splitter.addWidget(self._profile_table)
+        self._splitter.setStretchFactor(0, 2)
+        self._splitter.setStretchFactor(1, 1)
 
         # --- Reader thread setup ---
-        self._reader = _LogReader(path)
+        # The reader indexes and polls the file in its own thread, so that slow
+        # (e.g. network-mounted) disks never block the event loop. New chunks of
+        # the index are delivered to the model through queued connections.
+        self._reader = _LogReader(path, tail_lines=max_lines)
+        self._reader_thread = QThread()
+        self._reader_thread.setObjectName("CoreLogReader")
+        self._reader.moveToThread(self._reader_thread)
+        self._reader_thread.started.connect(self._reader.start)
+
+        self._searcher = _LogSearcher(path)
+        self._search_thread = QThread()
+        self._search_thread.setObjectName("CoreLogSearcher")
+        self._searcher.moveToThread(self._search_thread)
+
+        # make sure the threads are shut down even if we are never closed.
+        self._workers = workers = (
+            self._reader,
+            self._searcher,
+            self._reader_thread,
+            self._search_thread,
+        )
+        model = self._model
+
+        def _cleanup(*_: object) -> None:
+            _stop_workers(*workers)
+            model.close()
+
+        self.destroyed.connect(_cleanup)
 
         # --- Layout ---
         file_layout = QHBoxLayout()
@@ -178,19 +396,46 @@ class CoreLogWidget(QWidget):
         file_layout.addWidget(self._log_path)
         file_layout.addWidget(self._debug_box)
         file_layout.addWidget(self._clear_btn)
+        file_layout.addWidget(self._profile_btn)
         file_layout.addWidget(self._log_btn)
 
+        filter_layout = QHBoxLayout()
+        filter_layout.setContentsMargins(5, 0, 5, 0)
+        filter_layout.addWidget(self._level_combo)
+        filter_layout.addWidget(self._device_combo)
+        filter_layout.addWidget(self._thread_combo)
+        filter_layout.addWidget(self._search, 1)
+        filter_layout.addWidget(self._status)
+
         layout = QVBoxLayout(self)
         layout.setContentsMargins(0, 0, 0, 0)
         layout.addLayout(file_layout)
-        layout.addWidget(self._log_view)
+        layout.addLayout(filter_layout)
+        layout.addWidget(self._splitter)
 
         # --- Connections ---
-        self._reader.new_lines.connect(self._append_line)
+        self._reader.new_chunk.connect(
+            self._model.appendChunk, Qt.ConnectionType.QueuedConnection
+        )
+        self._reader.head_chunk.connect(self._on_head_chunk)
+        self._reader.progress.connect(self._on_index_progress)
+        self._reader.reset.connect(self._model.resetIndex)
+        self._model.namesChanged.connect(self._update_filter_combos)
+        self._model.rowsAboutToBeInserted.connect(self._on_rows_about_to_be_inserted)
+        self._model.rowsInserted.connect(self._on_rows_inserted)
+        self._searchRequested.connect(self._searcher.search)
+        self._searcher.finished.connect(self._on_search_finished)
+        self._search_timer.timeout.connect(self._start_search)
+        self._search.textChanged.connect(self._search_timer.start)
+        self._level_combo.currentIndexChanged.connect(self._apply_filter)
+        self._device_combo.currentIndexChanged.connect(self._apply_filter)
+        self._thread_combo.currentIndexChanged.connect(self._apply_filter)
         self._debug_box.toggled.connect(self._mmcore.enableDebugLog)
         self._clear_btn.clicked.connect(self.clear)
+        self._profile_btn.toggled.connect(self._set_profiling)
         self._log_btn.clicked.connect(self._open_native)
-        self._reader.start()
+        self._search_thread.start()
+        self._reader_thread.start()
 
         # scroll left to begin
         def _scroll_left() -> None:
@@ -200,22 +445,105 @@ class CoreLogWidget(QWidget):
         QTimer.singleShot(0, _scroll_left)
 
     def clear(self) -> None:
-        """Clear the log view."""
-        self._log_view.clear()
+        """Clear the log view (and the device latency statistics)."""
+        self._model.clear()
+        self._profiler.clear()
+        self._profile_table.refresh()
 
     def sizeHint(self) -> QSize:
         hint = super().sizeHint()
         return hint.expandedTo(QSize(1000, 800))
 
-    def _append_line(self, line: str) -> None:
-        """Append a line, respecting pause/follow settings."""
-        self._log_view.appendPlainText(line)
-
     def closeEvent(self, event: QCloseEvent | None) -> None:
-        """Clean up thread on close."""
-        self._reader._stop()
+        """Clean up threads on close."""
+        _stop_workers(*self._workers)
+        self._model.close()
         super().closeEvent(event)
 
+    # ---------------------------------------------------------- tailing --
+
+    def _on_rows_about_to_be_inserted(self) -> None:
+        # follow the tail only if the view is already scrolled to the bottom
+        sb = self._log_view.verticalScrollBar()
+        self._follow_tail = sb is None or sb.value() == sb.maximum()
+
+    def _on_rows_inserted(self) -> None:
+        if self._follow_tail:
+            self._log_view.scrollToBottom()
+
+    def _on_head_chunk(self, chunk: LogChunk) -> None:
+        sb = self._log_view.verticalScrollBar()
+        at_bottom = sb is None or sb.value() == sb.maximum()
+        top = self._log_view.indexAt(self._log_view.rect().topLeft())
+        top_line = self._model.lineNumber(top.row()) if top.isValid() else None
+
+        self._model.prependChunk(chunk)
+
+        # keep the same lines on screen
+        if at_bottom:
+            self._log_view.scrollToBottom()
+        elif top_line is not None:
+            row = self._model.rowForLine(top_line + len(chunk))
+            self._log_view.scrollTo(
+                self._model.index(row), QAbstractItemView.ScrollHint.PositionAtTop
+            )
+        if self._search.text():
+            self._start_search()
+
+    def _on_index_progress(self, percent: int) -> None:
+        self._status.setText("" if percent >= 100 else f"Indexing... {percent}%")
+
+    def _set_profiling(self, enabled: bool) -> None:
+        """Start/stop feeding new log lines to the device latency profiler."""
+        self._reader.profiler = self._profiler if enabled else None
+        self._profile_table.setVisible(enabled)
+        self._profile_table.refresh()
+
+    # -------------------------------------------------------- filtering --
+
+    def _update_filter_combos(self) -> None:
+        """Add newly seen components/threads to the filter combos."""
+        for combo, values in (
+            (self._device_combo, self._model.componentNames()),
+            (self._thread_combo, self._model.threadIds()),
+        ):
+            known = {combo.itemData(i) for i in range(1, combo.count())}
+            for value in values:
+                if value not in known:
+                    label = str(value)
+                    combo.addItem(label.removeprefix("dev:"), value)
+
+    def _apply_filter(self) -> None:
+        self._model.setFilter(
+            min_level=self._level_combo.currentData(),
+            component=self._device_combo.currentData(),
+            thread=self._thread_combo.currentData(),
+        )
+
+    def _start_search(self) -> None:
+        self._search_gen += 1
+        self._searcher.cancel(self._search_gen)
+        if not (pattern := self._search.text()):
+            self._model.setSearchResults(None)
+            self._status.setText("")
+            return
+        try:
+            re.compile(pattern)
+        except re.error as e:
+            self._model.setSearchResults(None)
+            self._status.setText(f"Invalid regex: {e}")
+            return
+        self._search_pattern = pattern
+        start, self._search_end = self._model.indexedRange()
+        self._status.setText("Searching...")
+        self._searchRequested.emit(self._search_gen, pattern, start, self._search_end)
+
+    def _on_search_finished(self, generation: int, matches: np.ndarray) -> None:
+        if generation != self._search_gen:
+            return  # stale result of a superseded search
+        self._model.setSearchResults(self._search_pattern, matches, self._search_end)
+        self._status.setText(f"{len(matches)} matches")
+
     def _open_native(self) -> None:
         """Open the log file in the system's default text editor."""
-        QDesktopServices.openUrl(QUrl.fromLocalFile(self._mmcore.getPrimaryLogFile()))
+        QDesktopServices.openUrl(QUrl.fromLocalFile(self._path))
@@ -0,0 +1,632 @@
+"""Byte-offset line index and virtualized model for CoreLog files.
+
+A CoreLog line looks like this:
+
+    2024-05-01T10:55:49.578215 tid15084 [IFO,dev:Camera] Some message
+
+Lines that do not start with such a prefix (e.g. continuations of multi-line
+messages) inherit the level, component and thread of the preceding line.
+"""
+
+from __future__ import annotations
+
+import os
+import re
+import threading
+from collections import OrderedDict
+from contextlib import suppress
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+
+import numpy as np
+from qtpy.QtCore import QAbstractListModel, QModelIndex, QObject, Qt, Signal, Slot
+from qtpy.QtGui import QColor
+
+if TYPE_CHECKING:
+    from io import BufferedReader
+
+#: CoreLog level codes, in order of increasing severity.
+LEVELS: tuple[str, ...] = ("trc", "dbg", "IFO", "WRN", "ERR", "FTL")
+_LEVEL_IDS = {level.encode(): i for i, level in enumerate(LEVELS)}
+_PREFIX = re.compile(rb"\S+ tid(\d+) \[(\w+),([^\]]*)\]")
+_NEWLINE = ord("\n")
+_LEVEL_COLORS = {
+    LEVELS.index("WRN"): QColor("darkorange"),
+    LEVELS.index("ERR"): QColor("red"),
+    LEVELS.index("FTL"): QColor("red"),
+}
+
+
+def _decode_line(line: bytes) -> str:
+    """Decode a single raw log line (without its newline) to text."""
+    return line.rstrip(b"\r").decode("utf-8", errors="replace")
+
+
+def _tail_offset(path: str, n: int, block_size: int = 64 * 1024) -> int:
+    """Return the byte offset at which the last `n` lines of the file start.
+
+    The file is read backwards from its end in blocks of `block_size` bytes, until
+    enough lines have been found. The cost thus depends on `n` (and the length of
+    the lines), not on the total size of the file.
+    """
+    with open(path, "rb") as f:
+        end = pos = f.seek(0, os.SEEK_END)
+        if n <= 0:
+            return end
+        blocks: list[bytes] = []
+        n_newlines = 0
+        # n + 1 newlines guarantee that the first of the last n lines is complete,
+        # even if the file ends with a newline.
+        while pos > 0 and n_newlines <= n:
+            size = min(block_size, pos)
+            pos -= size
+            f.seek(pos)
+            block = f.read(size)
+            blocks.append(block)
+            n_newlines += block.count(b"\n")
+
+    data = b"".join(reversed(blocks))
+    # ignore a final newline, then walk back n line starts
+    idx = len(data) - 1 if data.endswith(b"\n") else len(data)
+    for _ in range(n):
+        if (idx := data.rfind(b"\n", 0, idx)) < 0:
+            return 0  # fewer than n lines in the file
+    return pos + idx + 1
+
+
+def _tail_lines(path: str, n: int, block_size: int = 64 * 1024) -> list[str]:
+    """Return the last `n` lines of the file at `path`."""
+    with open(path, "rb") as f:
+        f.seek(_tail_offset(path, n, block_size))
+        lines = f.read().split(b"\n")
+    if lines[-1] == b"":  # file ends with a newline
+        lines.pop()
+    return [_decode_line(line) for line in lines]
+
+
+# ------------------------------------------------------------------ index --
+
+
+class _LineTables:
+    """Interning tables for the component names and thread ids of a log.
+
+    Shared by all chunks of the same file, so that the integer ids stored in the
+    index are consistent.
+    """
+
+    def __init__(self) -> None:
+        self.components: list[str] = []
+        self.threads: list[int] = []
+        self._component_ids: dict[bytes, int] = {}
+        self._thread_ids: dict[bytes, int] = {}
+
+    def component_id(self, name: bytes) -> int:
+        if (idx := self._component_ids.get(name)) is None:
+            idx = self._component_ids[name] = len(self.components)
+            self.components.append(name.decode("utf-8", errors="replace"))
+        return idx
+
+    def thread_id(self, tid: bytes) -> int:
+        if (idx := self._thread_ids.get(tid)) is None:
+            idx = self._thread_ids[tid] = len(self.threads)
+            self.threads.append(int(tid))
+        return idx
+
+
+class _GrowingArray:
+    """1D array with amortized O(1) appends: its capacity doubles when full."""
+
+    def __init__(self, values: np.ndarray) -> None:
+        self._data = values
+        self._size = len(values)
+
+    def view(self) -> np.ndarray:
+        """Return the (read-only by convention) items appended so far."""
+        return self._data[: self._size]
+
+    def extend(self, values: np.ndarray) -> np.ndarray:
+        """Append `values`, and return the updated `view()`."""
+        end = self._size + len(values)
+        if end > len(self._data):
+            data = np.empty(max(end, 2 * len(self._data)), self._data.dtype)
+            data[: self._size] = self._data[: self._size]
+            self._data = data
+        self._data[self._size : end] = values
+        self._size = end
+        return self.view()
+
+
+@dataclass
+class LogChunk:
+    """Index of a contiguous range of complete lines of a log file."""
+
+    offsets: np.ndarray  # int64: byte offset at which each line starts
+    end: int  # byte offset just past the newline of the last line
+    levels: np.ndarray  # int8: index into LEVELS, or -1
+    components: np.ndarray  # int32: index into component_names, or -1
+    threads: np.ndarray  # int32: index into thread_ids, or -1
+    component_names: tuple[str, ...]
+    thread_ids: tuple[int, ...]
+    # raw bytes of the lines, only kept for small (live-tail) chunks
+    data: bytes | None = None
+
+    def __len__(self) -> int:
+        return len(self.offsets)
+
+    def last_meta(self) -> tuple[int, int, int]:
+        """Return (level, component, thread) of the last line."""
+        if not len(self):
+            return (-1, -1, -1)
+        return int(self.levels[-1]), int(self.components[-1]), int(self.threads[-1])
+
+
+def _index_lines(
+    data: bytes,
+    start: int,
+    tables: _LineTables,
+    prev: tuple[int, int, int] = (-1, -1, -1),
+    keep_data: bool = False,
+) -> LogChunk:
+    """Index the complete lines in `data`, which begins at byte `start` of a file.
+
+    Any bytes after the last newline in `data` are ignored.
+    """
+    newlines = np.flatnonzero(np.frombuffer(data, np.uint8) == _NEWLINE)
+    n = len(newlines)
+    offsets = np.empty(n, np.int64)
+    if n:
+        offsets[0] = 0
+        offsets[1:] = newlines[:-1] + 1
+    offsets += start
+    end = start + int(newlines[-1]) + 1 if n else start
+
+    levels: list[int] = []
+    comps: list[int] = []
+    threads: list[int] = []
+    level, comp, thread = prev
+    match = _PREFIX.match
+    for line in data.split(b"\n", n)[:n]:
+        if m := match(line):
+            tid, lvl, component = m.groups()
+            level = _LEVEL_IDS.get(lvl, -1)
+            comp = tables.component_id(component)
+            thread = tables.thread_id(tid)
+        levels.append(level)
+        comps.append(comp)
+        threads.append(thread)
+
+    return LogChunk(
+        offsets=offsets,
+        end=end,
+        levels=np.array(levels, np.int8),
+        components=np.array(comps, np.int32),
+        threads=np.array(threads, np.int32),
+        component_names=tuple(tables.components),
+        thread_ids=tuple(tables.threads),
+        data=data[: end - start] if keep_data else None,
+    )
+
+
+def _concat_chunks(chunks: list[LogChunk]) -> LogChunk:
+    """Concatenate consecutive chunks (indexed with the same tables)."""
+    last = chunks[-1]
+    return LogChunk(
+        offsets=np.concatenate([c.offsets for c in chunks]),
+        end=last.end,
+        levels=np.concatenate([c.levels for c in chunks]),
+        components=np.concatenate([c.components for c in chunks]),
+        threads=np.concatenate([c.threads for c in chunks]),
+        component_names=last.component_names,
+        thread_ids=last.thread_ids,
+    )
+
+
+# ----------------------------------------------------------------- search --
+
+
+class _LogSearcher(QObject):
+    """Runs regex searches over a range of a log file, in a worker thread.
+
+    `search` is meant to be invoked through a queued connection. Every request
+    carries a `generation`; a search is abandoned as soon as a newer one has been
+    requested (see `cancel`), and results are tagged with their generation so the
+    receiver can discard stale ones.
+    """
+
+    # generation, sorted array of matching line numbers (relative to `start`)
+    finished: Signal = Signal(int, object)
+
+    BLOCK_SIZE = 8 * 1024 * 1024
+
+    def __init__(self, path: str, parent: QObject | None = None) -> None:
+        super().__init__(parent)
+        self._path = path
+        self._latest = 0
+
+    def cancel(self, generation: int) -> None:
+        """Abandon every search older than `generation` (thread-safe)."""
+        self._latest = max(self._latest, generation)
+
+    @Slot(int, str, object, object)
+    def search(self, generation: int, pattern: str, start: int, end: int) -> None:
+        """Find the lines between byte offsets `start` and `end` matching `pattern`."""
+        self.cancel(generation)
+        try:
+            regex = re.compile(pattern.encode(), re.IGNORECASE)
+        except re.error:
+            self.finished.emit(generation, np.empty(0, np.int64))
+            return
+
+        found: list[np.ndarray] = []
+        n_lines = 0
+        with open(self._path, "rb") as f:
+            f.seek(start)
+            pos = start
+            while pos < end:
+                if generation < self._latest:
+                    return  # a newer search has been requested
+                block = f.read(min(self.BLOCK_SIZE, end - pos))
+                if not block:
+                    break
+                if pos + len(block) < end:  # cut at the last complete line
+                    block = block[: block.rfind(b"\n") + 1] or block
+                    f.seek(pos + len(block))
+                newlines = np.flatnonzero(np.frombuffer(block, np.uint8) == _NEWLINE)
+                starts = [m.start() for m in regex.finditer(block)]
+                if starts:
+                    rows = np.searchsorted(newlines, starts) + n_lines
+                    found.append(np.unique(rows))
+                n_lines += len(newlines)
+                pos += len(block)
+
+        result = np.concatenate(found) if found else np.empty(0, np.int64)
+        self.finished.emit(generation, result.astype(np.int64))
+
+
+# ------------------------------------------------------------------ model --
+
+
+def _table_id(table: tuple, value: Any) -> int | None:
+    """Return the id of `value` in an interning `table` (None for no filter)."""
+    if value is None:
+        return None
+    return table.index(value) if value in table else -1  # -1 matches nothing
+
+
+class _LogModel(QAbstractListModel):
+    """Virtualized list model over the indexed lines of a log file.
+
+    The model only stores the byte offset and the parsed level, component and
+    thread of each line. Line text is read from disk on demand, one page of
+    `PAGE_SIZE` lines at a time, and a small LRU cache of pages is kept, so that
+    views only ever read the pages that are actually on screen.
+    """
+
+    PAGE_SIZE = 256
+    MAX_PAGES = 64
+
+    namesChanged = Signal()
+
+    def __init__(self, path: str, parent: QObject | None = None) -> None:
+        super().__init__(parent)
+        self._path = path
+        self._file: BufferedReader | None = None
+        self._file_lock = threading.Lock()
+        self._pages: OrderedDict[int, list[bytes]] = OrderedDict()
+
+        # per-line index (views of growing buffers, so that tailing is cheap)
+        self._set_index(
+            np.empty(0, np.int64),
+            np.empty(0, np.int8),
+            np.empty(0, np.int32),
+            np.empty(0, np.int32),
+        )
+        self._end = 0
+        self._component_names: tuple[str, ...] = ()
+        self._thread_ids: tuple[int, ...] = ()
+
+        # lines before `_base` have been cleared from the view
+        self._base = 0
+        self._cleared = False
+        # line numbers of the visible rows, or None if no filter is active
+        self._rows: np.ndarray | None = None
+        self._rows_buf: _GrowingArray | None = None
+        self._min_level = -1
+        self._component: int | None = None
+        self._thread: int | None = None
+        # sorted line numbers matching the current search, or None
+        self._matches: np.ndarray | None = None
+        # byte offset up to which `_matches` was computed
+        self._matches_end = 0
+        self._search_regex: re.Pattern[bytes] | None = None
+
+    # ---------------------------------------------------------- Qt API --
+
+    def rowCount(self, parent: QModelIndex | None = None) -> int:
+        if parent is not None and parent.isValid():
+            return 0
+        if self._rows is not None:
+            return len(self._rows)
+        return len(self._offsets) - self._base
+
+    def data(self, index: QModelIndex, role: int = Qt.ItemDataRole.DisplayRole) -> Any:
+        if not index.isValid() or (row := index.row()) >= self.rowCount():
+            return None
+        line = self.lineNumber(row)
+        if role == Qt.ItemDataRole.DisplayRole:
+            return self.lineText(line)
+        if role == Qt.ItemDataRole.ForegroundRole:
+            return _LEVEL_COLORS.get(int(self._levels[line]))
+        return None
+
+    # ----------------------------------------------------------- access --
+
+    def lineCount(self) -> int:
+        """Return the total number of indexed lines."""
+        return len(self._offsets)
+
+    def lineNumber(self, row: int) -> int:
+        """Return the line number (in the index) of visible `row`."""
+        if self._rows is not None:
+            return int(self._rows[row])
+        return self._base + row
+
+    def rowForLine(self, line: int) -> int:
+        """Return the first visible row showing `line` or a later line."""
+        if self._rows is not None:
+            return int(np.searchsorted(self._rows, line))
+        return max(line - self._base, 0)
+
+    def lineText(self, line: int) -> str:
+        """Return the text of indexed line number `line`."""
+        page, i = divmod(line, self.PAGE_SIZE)
+        return _decode_line(self._read_page(page)[i])
+
+    def visibleText(self) -> str:
+        """Return the text of all visible rows, joined by newlines."""
+        rows = range(self.rowCount())
+        return "\n".join(self.lineText(self.lineNumber(r)) for r in rows)
+
+    def componentNames(self) -> tuple[str, ...]:
+        """Return all component names ("Core", "dev:<label>", ...) seen so far."""
+        return self._component_names
+
+    def threadIds(self) -> tuple[int, ...]:
+        """Return all thread ids seen so far."""
+        return self._thread_ids
+
+    def indexedRange(self) -> tuple[int, int]:
+        """Return the (start, end) byte range of the file covered by the index."""
+        if not len(self._offsets):
+            return (self._end, self._end)
+        return (int(self._offsets[0]), self._end)
+
+    def _read_page(self, page: int) -> list[bytes]:
+        if (lines := self._pages.get(page)) is not None:
+            self._pages.move_to_end(page)
+            return lines
+        first = page * self.PAGE_SIZE
+        last = min(first + self.PAGE_SIZE, len(self._offsets))
+        start = int(self._offsets[first])
+        end = int(self._offsets[last]) if last < len(self._offsets) else self._end
+        lines = self._read_range(start, end).split(b"\n")
+        # pad in case the file was truncated underneath us
+        lines.extend([b""] * (last - first - len(lines)))
+        self._pages[page] = lines
+        if len(self._pages) > self.MAX_PAGES:
+            self._pages.popitem(last=False)
+        return lines
+
+    def _read_range(self, start: int, end: int) -> bytes:
+        with self._file_lock:
+            if self._file is None:
+                self._file = open(self._path, "rb")
+            self._file.seek(start)
+            return self._file.read(end - start)
+
+    def close(self) -> None:
+        """Close the file handle used to read pages."""
+        with self._file_lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    # ---------------------------------------------------------- updates --
+
+    def appendChunk(self, chunk: LogChunk) -> None:
+        """Append newly indexed lines to the end of the index."""
+        if not len(chunk):
+            return
+        n_old = len(self._offsets)
+        # the last cached page may have been incomplete
+        self._pages.pop((n_old - 1) // self.PAGE_SIZE, None)
+        self._update_names(chunk)
+
+        new_lines = np.arange(n_old, n_old + len(chunk))
+        if self._rows is not None:
+            mask = self._filter_mask(chunk.levels, chunk.components, chunk.threads)
+            if self._search_regex is not None:
+                mask &= self._search_chunk(chunk)
+            new_rows = new_lines[mask]
+        else:
+            new_rows = new_lines
+        if not len(new_rows):
+            self._extend(chunk)
+            return
+
+        first = self.rowCount()
+        self.beginInsertRows(QModelIndex(), first, first + len(new_rows) - 1)
+        self._extend(chunk)
+        if self._rows_buf is not None:
+            self._rows = self._rows_buf.extend(new_rows)
+        self.endInsertRows()
+
+    def prependChunk(self, chunk: LogChunk) -> None:
+        """Insert the lines of the file preceding the current index."""
+        if not len(chunk):
+            return
+        self.beginResetModel()
+        n = len(chunk)
+        self._set_index(
+            np.concatenate([chunk.offsets, self._offsets]),
+            np.concatenate([chunk.levels, self._levels]),
+            np.concatenate([chunk.components, self._components]),
+            np.concatenate([chunk.threads, self._threads]),
+        )
+        self._pages.clear()
+        self._update_names(chunk)
+        if self._cleared:
+            self._base += n
+        if self._matches is not None:
+            self._matches = self._matches + n
+        self._refilter()
+        self.endResetModel()
+
+    def resetIndex(self) -> None:
+        """Drop the whole index (e.g. after the file was truncated or rotated)."""
+        self.beginResetModel()
+        self._set_index(
+            np.empty(0, np.int64),
+            np.empty(0, np.int8),
+            np.empty(0, np.int32),
+            np.empty(0, np.int32),
+        )
+        self._end = self._base = 0
+        self._cleared = False
+        self._pages.clear()
+        if self._matches is not None:
+            self._matches = np.empty(0, np.int64)
+        self._refilter()
+        self.endResetModel()
+        self.close()
+
+    def clear(self) -> None:
+        """Hide all lines indexed so far (the file itself is left untouched)."""
+        self.beginResetModel()
+        self._base = len(self._offsets)
+        self._cleared = True
+        self._refilter()
+        self.endResetModel()
+
+    def _set_index(
+        self,
+        offsets: np.ndarray,
+        levels: np.ndarray,
+        components: np.ndarray,
+        threads: np.ndarray,
+    ) -> None:
+        self._index = [_GrowingArray(a) for a in (offsets, levels, components, threads)]
+        self._offsets = offsets
+        self._levels = levels
+        self._components = components
+        self._threads = threads
+
+    def _extend(self, chunk: LogChunk) -> None:
+        offsets, levels, components, threads = self._index
+        self._offsets = offsets.extend(chunk.offsets)
+        self._levels = levels.extend(chunk.levels)
+        self._components = components.extend(chunk.components)
+        self._threads = threads.extend(chunk.threads)
+        self._end = chunk.end
+
+    def _update_names(self, chunk: LogChunk) -> None:
+        changed = len(chunk.component_names) > len(self._component_names) or len(
+            chunk.thread_ids
+        ) > len(self._thread_ids)
+        if changed:
+            self._component_names = chunk.component_names
+            self._thread_ids = chunk.thread_ids
+            self.namesChanged.emit()
+
+    # -------------------------------------------------------- filtering --
+
+    def setFilter(
+        self,
+        min_level: int = -1,
+        component: str | None = None,
+        thread: int | None = None,
+    ) -> None:
+        """Show only lines at or above `min_level` from `component` and `thread`.
+
+        `min_level` is an index into `LEVELS` (-1 shows lines of any level).
+        `component` and `thread` may be None to show all components/threads.
+        """
+        self.beginResetModel()
+        self._min_level = min_level
+        self._component = _table_id(self._component_names, component)
+        self._thread = _table_id(self._thread_ids, thread)
+        self._refilter()
+        self.endResetModel()
+
+    def setSearchResults(
+        self, pattern: str | None, matches: np.ndarray | None = None, end: int = 0
+    ) -> None:
+        """Restrict the view to `matches`, the line numbers matching `pattern`.
+
+        `matches` must cover all indexed lines before byte offset `end` (see
+        `_LogSearcher`); lines indexed after that are matched against `pattern`
+        here. Pass `None` to clear the search, as does an invalid `pattern`.
+        """
+        regex = None
+        if pattern and matches is not None:
+            with suppress(re.error):
+                regex = re.compile(pattern.encode(), re.IGNORECASE)
+        self.beginResetModel()
+        if regex is not None and matches is not None:
+            self._search_regex = regex
+            first = int(np.searchsorted(self._offsets, end))
+            if first < len(self._offsets):
+                data = self._read_range(int(self._offsets[first]), self._end)
+                extra = np.flatnonzero(self._search_bytes(data)) + first
+                matches = np.concatenate([matches[matches < first], extra])
+            self._matches = matches
+        else:
+            self._search_regex = self._matches = None
+        self._refilter()
+        self.endResetModel()
+
+    def _filter_mask(
+        self, levels: np.ndarray, components: np.ndarray, threads: np.ndarray
+    ) -> np.ndarray:
+        mask = levels >= self._min_level
+        if self._component is not None:
+            mask &= components == self._component
+        if self._thread is not None:
+            mask &= threads == self._thread
+        return mask
+
+    def _search_chunk(self, chunk: LogChunk) -> np.ndarray:
+        """Return a boolean mask of the lines in `chunk` matching the search."""
+        data = chunk.data
+        if data is None:
+            data = self._read_range(int(chunk.offsets[0]), chunk.end)
+        return self._search_bytes(data)
+
+    def _search_bytes(self, data: bytes) -> np.ndarray:
+        """Return a boolean mask of the (complete) lines in `data` that match."""
+        newlines = np.flatnonzero(np.frombuffer(data, np.uint8) == _NEWLINE)
+        mask = np.zeros(len(newlines), bool)
+        if self._search_regex is not None:
+            starts = [m.start() for m in self._search_regex.finditer(data)]
+            rows = np.searchsorted(newlines, starts)
+            mask[rows[rows < len(mask)]] = True
+        return mask
+
+    def _refilter(self) -> None:
+        if (
+            self._min_level < 0
+            and self._component is None
+            and self._thread is None
+            and self._matches is None
+        ):
+            self._rows = self._rows_buf = None
+            return
+        mask = self._filter_mask(self._levels, self._components, self._threads)
+        mask[: self._base] = False
+        if self._matches is not None:
+            in_search = np.zeros(len(mask), bool)
+            matches = self._matches[self._matches < len(mask)]
+            in_search[matches] = True
+            mask &= in_search
+        self._rows_buf = _GrowingArray(np.flatnonzero(mask))
+        self._rows = self._rows_buf.view()
@@ -0,0 +1,270 @@
+"""Device call latency profiling derived from (debug) CoreLog lines.
+
+The core logs a "Will ..." line before and a "Did ..." line after most device
+operations, and a "Waiting for device ..." / "Finished waiting for device ..." pair
+around each wait, e.g.:
+
+    2024-05-01T10:55:49.578215 tid84 [dbg,Core] Will set Objective to state 2
+    2024-05-01T10:55:49.580113 tid84 [dbg,Core] Did set Objective to state 2
+    2024-05-01T10:55:49.590001 tid84 [dbg,Core] Will start relative move of Z ...
+    2024-05-01T10:55:49.590200 tid84 [dbg,Core] Waiting for device Z...
+    2024-05-01T10:55:49.680113 tid84 [dbg,Core] Finished waiting for device Z
+
+Stage moves have no "Did" line: they are timed until the wait for their device
+finishes. `DeviceCallProfiler` pairs these lines incrementally and aggregates call
+counts and latency histograms per (device, operation), using bounded memory.
+"""
+
+from __future__ import annotations
+
+import re
+import threading
+from bisect import bisect_right
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import TYPE_CHECKING
+
+from qtpy.QtCore import Qt, QTimer
+from qtpy.QtWidgets import QHeaderView, QTableWidget, QTableWidgetItem, QWidget
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+_CALL = re.compile(
+    rb"(\S+) tid(\d+) \[\w+,([^\]]*)\] "
+    rb"(Will|Did|Waiting for device|Finished waiting for device) (.+)"
+)
+_WAIT = "wait"
+# known "Will/Did" core messages: (pattern, group of the device label, operation
+# template). A device group of 0 means the device is the one of the log component
+# (e.g. "Core:dev:Camera"), or the core itself.
+_ACTIONS: list[tuple[re.Pattern[str], int, str]] = [
+    (re.compile(r'set property "([^"]*)" to '), 0, "set property {0}"),
+    (re.compile(r"set Core property: (.*?) = "), 0, "set property {0}"),
+    (re.compile(r"set camera (.+) exposure to "), 1, "set exposure"),
+    (re.compile(r"set (.+) to state "), 1, "set state"),
+    (re.compile(r"set (.+) to label "), 1, "set state label"),
+    (re.compile(r"snap image from current camera"), 0, "snap image"),
+    (re.compile(r"update system state cache"), 0, "update system state cache"),
+    # only the "Did" line has the label
+    (re.compile(r"load device "), 0, "load device"),
+    (re.compile(r"(initialize|unload) device (.+)"), 2, "{0} device"),
+    (re.compile(r"(home|stop) (?:xy )?stage (.+)"), 2, "{0}"),
+]
+# moves are only logged when they start: they end when waiting for the device does
+_MOVE = re.compile(r"start (absolute|relative) move of (.+?) (?:to position|by) ")
+_VALUES = re.compile(r'"[^"]*"|[-+]?\d+(?:\.\d+)?')
+
+#: upper edges (in seconds) of the latency histogram bins: 4 bins per decade,
+#: from 0.1 ms to 100 s (plus one overflow bin).
+BIN_EDGES: tuple[float, ...] = tuple(10 ** (k / 4) for k in range(-16, 9))
+
+
+def _parse_action(action: str, component: str) -> tuple[str, str]:
+    """Return the (device, operation) of a "Will/Did <action>" core message."""
+    for pattern, device_group, op in _ACTIONS:
+        if m := pattern.match(action):
+            if device_group:
+                device = m.group(device_group)
+            else:
+                device = (
+                    component.rpartition("dev:")[2] if "dev:" in component else "Core"
+                )
+            return device, op.format(*m.groups())
+    # unknown message: group by its text, without the values
+    return "Core", _VALUES.sub("#", action)
+
+
+@dataclass
+class CallStats:
+    """Aggregated latency statistics of one (device, operation)."""
+
+    count: int = 0
+    total: float = 0.0  # seconds
+    max: float = 0.0  # seconds
+    histogram: list[int] = field(default_factory=lambda: [0] * (len(BIN_EDGES) + 1))
+
+    def add(self, duration: float) -> None:
+        self.count += 1
+        self.total += duration
+        self.max = max(self.max, duration)
+        self.histogram[bisect_right(BIN_EDGES, duration)] += 1
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def percentile(self, q: float) -> float:
+        """Return (an upper bound of) the `q`th percentile from the histogram."""
+        target = q / 100 * self.count
+        cumulative = 0
+        for i, n in enumerate(self.histogram):
+            cumulative += n
+            if n and cumulative >= target:
+                return min(BIN_EDGES[i], self.max) if i < len(BIN_EDGES) else self.max
+        return 0.0
+
+
+class DeviceCallProfiler:
+    """Incrementally pairs CoreLog call boundaries into per-device call stats.
+
+    Lines are usually fed from the log reader thread, while `snapshot` is read
+    from the GUI thread, so both are guarded by a lock.
+
+    Parameters
+    ----------
+    max_pending : int
+        Maximum number of started but not (yet) finished calls to remember. The
+        oldest ones are dropped first, so that unmatched lines cannot grow memory.
+    max_operations : int
+        Maximum number of (device, operation) statistics to keep. The least recently
+        updated ones are dropped first, so that unknown messages (which are grouped
+        by their text) cannot grow memory either.
+    """
+
+    def __init__(self, max_pending: int = 1024, max_operations: int = 1024) -> None:
+        self._max_pending = max_pending
+        self._max_operations = max_operations
+        # (thread, device, operation) -> start time. Moves are keyed without a
+        # thread, as they may be waited for from any thread.
+        self._pending: OrderedDict[tuple[bytes, str, str], datetime] = OrderedDict()
+        self._stats: OrderedDict[tuple[str, str], CallStats] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def clear(self) -> None:
+        """Forget all statistics and pending calls."""
+        with self._lock:
+            self._pending.clear()
+            self._stats.clear()
+
+    def snapshot(self) -> dict[tuple[str, str], CallStats]:
+        """Return a copy of the current {(device, operation): CallStats}."""
+        with self._lock:
+            return {
+                key: CallStats(s.count, s.total, s.max, list(s.histogram))
+                for key, s in self._stats.items()
+            }
+
+    def feed(self, lines: Iterable[bytes]) -> None:
+        """Process raw (undecoded) log lines."""
+        with self._lock:
+            self._feed(lines)
+
+    def _feed(self, lines: Iterable[bytes]) -> None:
+        match = _CALL.match
+        for line in lines:
+            # cheap pre-check: the vast majority of lines are not call boundaries
+            if (
+                b"] Will " not in line
+                and b"] Did " not in line
+                and b"aiting for device " not in line
+            ):
+                continue
+            if not (m := match(line)):
+                continue
+            stamp, tid, component, when, message = m.groups()
+            try:
+                time = datetime.fromisoformat(stamp.decode())
+            except ValueError:
+                continue
+            text = message.decode("utf-8", errors="replace")
+            if when == b"Waiting for device":
+                self._start((tid, text.removesuffix("..."), _WAIT), time)
+            elif when == b"Finished waiting for device":
+                self._finish((tid, text, _WAIT), time)
+                for kind in ("absolute move", "relative move"):
+                    self._finish((b"", text, kind), time)
+            elif when == b"Will" and (move := _MOVE.match(text)):
+                self._start((b"", move.group(2), f"{move.group(1)} move"), time)
+            else:
+                device, op = _parse_action(text, component.decode(errors="replace"))
+                if when == b"Will":
+                    self._start((tid, device, op), time)
+                else:
+                    self._finish((tid, device, op), time)
+
+    def _start(self, key: tuple[bytes, str, str], time: datetime) -> None:
+        self._pending[key] = time
+        self._pending.move_to_end(key)
+        if len(self._pending) > self._max_pending:
+            self._pending.popitem(last=False)
+
+    def _finish(self, key: tuple[bytes, str, str], time: datetime) -> None:
+        if (start := self._pending.pop(key, None)) is None:
+            return
+        stat_key = key[1:]
+        if (stats := self._stats.get(stat_key)) is None:
+            stats = self._stats[stat_key] = CallStats()
+            if len(self._stats) > self._max_operations:
+                self._stats.popitem(last=False)
+        else:
+            self._stats.move_to_end(stat_key)
+        stats.add(max((time - start).total_seconds(), 0.0))
+
+
+class DeviceLatencyTable(QTableWidget):
+    """Table of per-device/operation call latencies, slowest total time first."""
+
+    HEADERS = ("Device", "Operation", "Calls", "Mean (ms)", "p95 (ms)", "Max (ms)")
+
+    def __init__(
+        self, profiler: DeviceCallProfiler, parent: QWidget | None = None
+    ) -> None:
+        super().__init__(0, len(self.HEADERS), parent)
+        self._profiler = profiler
+        self.setHorizontalHeaderLabels(self.HEADERS)
+        self.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        if vh := self.verticalHeader():
+            vh.setVisible(False)
+        if hh := self.horizontalHeader():
+            hh.setSectionResizeMode(QHeaderView.ResizeMode.ResizeToContents)
+            hh.setStretchLastSection(True)
+
+        # the stats change at log rate, redrawing once a second is plenty.
+        self._timer = QTimer(self)
+        self._timer.setInterval(1000)
+        self._timer.timeout.connect(self.refresh)
+        self._timer.start()
+
+    def refresh(self) -> None:
+        """Update the table from the current profiler statistics."""
+        if not self.isVisible():
+            return
+        stats = sorted(
+            self._profiler.snapshot().items(), key=lambda kv: kv[1].total, reverse=True
+        )
+        # items are reused (and only touched if their text changed), rather than
+        # rebuilt on every refresh
+        self.setRowCount(len(stats))
+        for row, ((device, op), stat) in enumerate(stats):
+            values = (
+                device,
+                op,
+                str(stat.count),
+                f"{stat.mean * 1000:.2f}",
+                f"{stat.percentile(95) * 1000:.2f}",
+                f"{stat.max * 1000:.2f}",
+            )
+            for col, text in enumerate(values):
+                if (item := self.item(row, col)) is None:
+                    item = QTableWidgetItem(text)
+                    if col >= 2:
+                        item.setTextAlignment(
+                            Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter
+                        )
+                    self.setItem(row, col, item)
+                elif item.text() != text:
+                    item.setText(text)
+                if col == 0:
+                    item.setToolTip(_histogram_tooltip(stat))
+
+
+def _histogram_tooltip(stat: CallStats) -> str:
+    return "Latency histogram (upper bin edge: calls)\n" + "\n".join(
+        f"≤ {BIN_EDGES[i] * 1000:g} ms: {n}"
+        if i < len(BIN_EDGES)
+        else f"> {BIN_EDGES[-1] * 1000:g} ms: {n}"
+        for i, n in enumerate(stat.histogram)
+        if n
+    )
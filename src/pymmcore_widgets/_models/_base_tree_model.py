@@ -1,13 +1,16 @@
 from __future__ import annotations
 
 import itertools
-from typing import overload
+from typing import TYPE_CHECKING, overload
 
 from qtpy.QtCore import QAbstractItemModel, QModelIndex, QObject, Qt
 from typing_extensions import Self
 
 from ._py_config_model import ConfigGroup, ConfigPreset, Device, DevicePropertySetting
 
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
 NULL_INDEX = QModelIndex()
 
 _node_id_counter = itertools.count()
@@ -18,6 +21,7 @@ class _Node:
 
     __slots__ = (
         "_id",
+        "_row",
         "check_state",
         "children",
         "name",
@@ -51,6 +55,7 @@ class _Node:
             elif isinstance(payload, Device):
                 for prop in payload.properties:
                     node.children.append(_Node.create(prop, node))
+            node.renumber_children()
         return node
 
     def __init__(
@@ -64,6 +69,8 @@ class _Node:
         parent: _Node | None = None,
     ) -> None:
         self._id: int = next(_node_id_counter)
+        # cached position in parent.children, see `row_in_parent`
+        self._row = -1
         self.name = name
         self.payload = payload
         self.parent = parent
@@ -73,21 +80,35 @@ class _Node:
     # convenience ------------------------------------------------------------
 
     @property
-    def siblings(self) -> list[_Node]:
+    def siblings(self) -> Iterator[_Node]:
         if self.parent is None:
-            return []  # pragma: no cover
-        return [x for x in self.parent.children if x is not self]
+            return iter(())  # pragma: no cover
+        return (x for x in self.parent.children if x is not self)
 
     def num_children(self) -> int:
         return len(self.children)
 
     def row_in_parent(self) -> int:
-        if self.parent is None:
+        """Return the position of this node in its parent's children, or -1.
+
+        The row is cached, and validated in O(1). When the children of the parent
+        were inserted, removed or moved since, all of them are renumbered once
+        (rather than searching the list on every call, as Qt asks for the parent of
+        every index it paints).
+        """
+        if (parent := self.parent) is None:
             return -1  # pragma: no cover
-        try:
-            return self.parent.children.index(self)
-        except ValueError:  # pragma: no cover
-            return -1
+        children = parent.children
+        if not (0 <= self._row < len(children) and children[self._row] is self):
+            parent.renumber_children()
+            if not (0 <= self._row < len(children) and children[self._row] is self):
+                return -1  # pragma: no cover
+        return self._row
+
+    def renumber_children(self) -> None:
+        """Update the cached rows of all children."""
+        for row, child in enumerate(self.children):
+            child._row = row
 
     # type helpers -----------------------------------------------------------
 
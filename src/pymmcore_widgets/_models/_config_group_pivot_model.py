@@ -1,6 +1,7 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, Any
+from bisect import bisect_left
+from typing import TYPE_CHECKING, Any, cast
 
 from qtpy.QtCore import QAbstractTableModel, QModelIndex, QSize, Qt
 
@@ -12,17 +13,29 @@ from ._q_config_model import QConfigGroupsModel
 if TYPE_CHECKING:
     from qtpy.QtWidgets import QWidget
 
+    DevProp = tuple[str, str]
+
 
 class ConfigGroupPivotModel(QAbstractTableModel):
-    """Pivot a single ConfigGroup into rows=Device/Property, cols=Presets."""
+    """Pivot a single ConfigGroup into rows=Device/Property, cols=Presets.
+
+    Changes to the source model are applied incrementally: value edits emit
+    `dataChanged` for the affected cells only, and added or removed presets and
+    settings insert or remove the corresponding columns and rows, so that views
+    keep their selection and scroll position. The model is only reset when the
+    group or the whole source model changes.
+    """
 
     def __init__(self, parent: QWidget | None = None) -> None:
         super().__init__(parent)
         self._src: QConfigGroupsModel | None = None
         self._gidx: QModelIndex | None = None
         self._presets: list[ConfigPreset] = []
-        self._rows: list[tuple[str, str]] = []  # (device_name, property_name)
-        self._data: dict[tuple[int, int], DevicePropertySetting] = {}
+        self._rows: list[DevProp] = []  # sorted (device_name, property_name)
+        # one {(device, property): setting} dict per column (preset)
+        self._cells: list[dict[DevProp, DevicePropertySetting]] = []
+        # {(device, property): row}, rebuilt lazily after rows are added/removed
+        self._row_of: dict[DevProp, int] | None = None
         self._in_set_data = False  # guard to prevent rebuild during setData
 
     def sourceModel(self) -> QConfigGroupsModel | None:
@@ -37,8 +50,8 @@ class ConfigGroupPivotModel(QAbstractTableModel):
 
         # -> keep the pivot up-to-date whenever the tree model changes
         src_model.modelReset.connect(self._rebuild)
-        src_model.rowsInserted.connect(self._rebuild)
-        src_model.rowsRemoved.connect(self._rebuild)
+        src_model.rowsInserted.connect(self._on_source_rows_changed)
+        src_model.rowsRemoved.connect(self._on_source_rows_changed)
         src_model.dataChanged.connect(self._on_source_data_changed)
 
     def setGroup(self, group_name_or_index: str | QModelIndex) -> None:
@@ -67,10 +80,9 @@ class ConfigGroupPivotModel(QAbstractTableModel):
             return False  # pragma: no cover
 
         # Reject writes to empty cells (no existing setting)
-        if (row, col) not in self._data:
+        if (setting := self._setting_at(row, col)) is None:
             return False  # pragma: no cover
 
-        setting = self._data[(row, col)]
         new_value = str(value)
         if setting.value == new_value:
             return True  # no change
@@ -103,7 +115,8 @@ class ConfigGroupPivotModel(QAbstractTableModel):
         self.beginResetModel()
         self._presets.clear()
         self._rows.clear()
-        self._data.clear()
+        self._cells.clear()
+        self._row_of = None
         if self._gidx is None:  # nothing selected yet
             self.endResetModel()
             return  # pragma: no cover
@@ -113,24 +126,93 @@ class ConfigGroupPivotModel(QAbstractTableModel):
             if not isinstance(group, ConfigGroup):
                 return  # pragma: no cover
             self._presets = list(group.presets.values())
-            keys = (setting.key() for p in self._presets for setting in p.settings)
-            self._rows = sorted(dict.fromkeys(keys, None))
-
-            for col, preset in enumerate(self._presets):
-                for row, (device, prop) in enumerate(self._rows):
-                    for s in preset.settings:
-                        if s.key() == (device, prop):
-                            self._data[(row, col)] = s
-                            break
+            self._cells = [_cells_of(p) for p in self._presets]
+            self._rows = sorted({key for cells in self._cells for key in cells})
         finally:
             self.endResetModel()
 
+    def _sync(self) -> None:
+        """Bring the pivot up to date with the group, without resetting it.
+
+        Columns of removed presets and rows of properties that are no longer used
+        are removed, new ones are inserted, and `dataChanged` is emitted for the
+        cells whose setting changed.
+        """
+        gidx = self._gidx
+        group = gidx.data(Qt.ItemDataRole.UserRole) if gidx is not None else None
+        if not isinstance(group, ConfigGroup):
+            self._rebuild()
+            return
+
+        presets = list(group.presets.values())
+        new_ids = {id(p) for p in presets}
+        kept = [p for p in self._presets if id(p) in new_ids]
+        old_ids = {id(p) for p in kept}
+        if [id(p) for p in kept] != [id(p) for p in presets if id(p) in old_ids]:
+            self._rebuild()  # presets were reordered
+            return
+
+        # -- columns --
+        root = QModelIndex()
+        for col in reversed(range(len(self._presets))):
+            if id(self._presets[col]) not in new_ids:
+                self.beginRemoveColumns(root, col, col)
+                del self._presets[col]
+                del self._cells[col]
+                self.endRemoveColumns()
+        for col, preset in enumerate(presets):
+            if col >= len(self._presets) or self._presets[col] is not preset:
+                self.beginInsertColumns(root, col, col)
+                self._presets.insert(col, preset)
+                self._cells.insert(col, {})
+                self.endInsertColumns()
+
+        # -- rows --
+        new_cells = [_cells_of(p) for p in presets]
+        new_keys = {key for cells in new_cells for key in cells}
+        for row in reversed(range(len(self._rows))):
+            if self._rows[row] not in new_keys:
+                self._row_of = None
+                self.beginRemoveRows(root, row, row)
+                del self._rows[row]
+                self.endRemoveRows()
+        if len(self._rows) != len(new_keys):
+            self._row_of = None
+            for key in sorted(new_keys.difference(self._rows)):
+                row = bisect_left(self._rows, key)
+                self.beginInsertRows(root, row, row)
+                self._rows.insert(row, key)
+                self.endInsertRows()
+
+        # -- cells --
+        old_cells, self._cells = self._cells, new_cells
+        row_of = self._row_index()
+        for col, (old, new) in enumerate(zip(old_cells, new_cells, strict=True)):
+            changed = [
+                row_of[key]
+                for key in old.keys() | new.keys()
+                if old.get(key) is not new.get(key)
+            ]
+            if changed:
+                self.dataChanged.emit(
+                    self.index(min(changed), col), self.index(max(changed), col), []
+                )
+
+    def _row_index(self) -> dict[DevProp, int]:
+        if self._row_of is None:
+            self._row_of = {key: row for row, key in enumerate(self._rows)}
+        return self._row_of
+
+    def _setting_at(self, row: int, col: int) -> DevicePropertySetting | None:
+        if 0 <= row < len(self._rows) and 0 <= col < len(self._cells):
+            return self._cells[col].get(self._rows[row])
+        return None
+
     def _empty_setting_for_row(self, row: int) -> DevicePropertySetting:
         """Create an empty setting for the given row, preserving metadata."""
         # Try to copy metadata from an existing setting in another column
         for col in range(len(self._presets)):
-            if (row, col) in self._data:
-                src = self._data[(row, col)]
+            if (src := self._setting_at(row, col)) is not None:
                 return src.model_copy(update={"value": src.default_value})
         dev, prop = self._rows[row]
         return DevicePropertySetting(device=dev, property_name=prop)
@@ -172,7 +254,7 @@ class ConfigGroupPivotModel(QAbstractTableModel):
         if not index.isValid():  # pragma: no cover
             return None
 
-        setting = self._data.get((index.row(), index.column()))
+        setting = self._setting_at(index.row(), index.column())
         if setting is None:
             return None
 
@@ -190,7 +272,7 @@ class ConfigGroupPivotModel(QAbstractTableModel):
         if not index.isValid():  # pragma: no cover
             return Qt.ItemFlag.NoItemFlags
         base = Qt.ItemFlag.ItemIsEnabled | Qt.ItemFlag.ItemIsSelectable
-        if self._data.get((index.row(), index.column())) is not None:
+        if self._setting_at(index.row(), index.column()) is not None:
             base |= Qt.ItemFlag.ItemIsEditable
         return base
 
@@ -201,7 +283,7 @@ class ConfigGroupPivotModel(QAbstractTableModel):
             or self._gidx is None
             or row >= len(self._rows)
             or col >= len(self._presets)
-            or (row, col) in self._data
+            or self._setting_at(row, col) is not None
         ):
             return False  # pragma: no cover
 
@@ -224,7 +306,7 @@ class ConfigGroupPivotModel(QAbstractTableModel):
             or self._gidx is None
             or row >= len(self._rows)
             or col >= len(self._presets)
-            or (row, col) not in self._data
+            or self._setting_at(row, col) is None
         ):
             return False
 
@@ -265,7 +347,7 @@ class ConfigGroupPivotModel(QAbstractTableModel):
         ):
             return None, QModelIndex()
 
-        setting = self._data.get((row, col))
+        setting = self._setting_at(row, col)
         if setting is None:
             return None, QModelIndex()
 
@@ -279,6 +361,18 @@ class ConfigGroupPivotModel(QAbstractTableModel):
 
         return None, QModelIndex()
 
+    def _on_source_rows_changed(self, parent: QModelIndex, *_: int) -> None:
+        """Handle presets or settings being added to or removed from the source."""
+        if self._gidx is None or self._in_set_data:
+            return
+        # groups (root), presets (group parent) or settings (preset parent)
+        if (
+            not parent.isValid()
+            or self._is_current_group(parent)
+            or self._is_current_group(parent.parent())
+        ):
+            self._sync()
+
     def _on_source_data_changed(
         self,
         top_left: QModelIndex,
@@ -286,48 +380,72 @@ class ConfigGroupPivotModel(QAbstractTableModel):
         roles: list[int] | None = None,
     ) -> None:
         """Handle dataChanged signals from the source model."""
-        if not self._in_set_data and self._should_rebuild_for_changes(
-            top_left, bottom_right
-        ):
-            self._rebuild()
-
-    def _should_rebuild_for_changes(
-        self, top_left: QModelIndex, bottom_right: QModelIndex
-    ) -> bool:
-        """Determine if model changes require rebuilding the pivot."""
-        if self._gidx is None or self._src is None:
-            return False  # pragma: no cover
+        if self._in_set_data or self._gidx is None or self._src is None:
+            return
+        parent = top_left.parent()
+        if self._is_current_group(parent):
+            # presets renamed
+            cols = [
+                col
+                for row in range(top_left.row(), bottom_right.row() + 1)
+                if (col := self._column_of(self._src.index(row, 0, parent))) >= 0
+            ]
+            if cols:
+                self.headerDataChanged.emit(
+                    Qt.Orientation.Horizontal, min(cols), max(cols)
+                )
+        elif parent.isValid() and self._is_current_group(parent.parent()):
+            self._on_settings_changed(parent, top_left.row(), bottom_right.row())
+
+    def _on_settings_changed(
+        self, preset_idx: QModelIndex, first: int, last: int
+    ) -> None:
+        """Emit dataChanged for the cells of settings `first`-`last` of a preset.
 
-        tl_col = top_left.column()
-        tl_par = top_left.parent()
-        gid_row = self._gidx.row()
-        for row in range(top_left.row(), bottom_right.row() + 1):
-            changed_index = self._src.index(row, tl_col, tl_par)
-            # Skip group metadata changes (at root level with our group row)
-            if tl_par.isValid() or row != gid_row:
-                if self._is_within_current_group(changed_index):
-                    # Preset or setting data changed, rebuild needed
-                    return True
-        return False
-
-    def _is_within_current_group(self, index: QModelIndex) -> bool:
-        """Check if the given index is within the currently displayed group."""
-        current_group_row = self._gidx.row()  # type: ignore[union-attr]
-
-        # Walk up the parent hierarchy
-        check_index = index
-        while check_index.isValid():
-            parent = check_index.parent()
-
-            # At root level: check if this is our group
-            if not parent.isValid():
-                return check_index.row() == current_group_row  # type: ignore[no-any-return]
-
-            # Parent at root level: check if parent is our group
-            if not parent.parent().isValid():
-                return parent.row() == current_group_row  # type: ignore[no-any-return]
-
-            # Move up one level
-            check_index = parent
-
-        return False
+        This is the common case of a value being edited, and takes O(1) per setting.
+        If a setting was replaced (e.g. its device or property changed), the pivot
+        is synced instead.
+        """
+        if (col := self._column_of(preset_idx)) < 0:
+            self._sync()  # pragma: no cover
+            return
+        src = cast("QConfigGroupsModel", self._src)
+        cells = self._cells[col]
+        row_of = self._row_index()
+        rows: list[int] = []
+        for i in range(first, last + 1):
+            setting = src.index(i, 0, preset_idx).data(Qt.ItemDataRole.UserRole)
+            key = setting.key() if isinstance(setting, DevicePropertySetting) else None
+            if key not in row_of or cells.get(key) is not setting:
+                self._sync()
+                return
+            rows.append(row_of[key])
+        if rows:
+            self.dataChanged.emit(
+                self.index(min(rows), col), self.index(max(rows), col), []
+            )
+
+    def _column_of(self, preset_idx: QModelIndex) -> int:
+        """Return the column of the preset at `preset_idx`, or -1."""
+        preset = preset_idx.data(Qt.ItemDataRole.UserRole)
+        for col, p in enumerate(self._presets):
+            if p is preset:
+                return col
+        return -1
+
+    def _is_current_group(self, index: QModelIndex) -> bool:
+        """Return True if `index` points to the group shown in the pivot."""
+        return bool(
+            self._gidx is not None
+            and index.isValid()
+            and not index.parent().isValid()
+            and index.internalId() == self._gidx.internalId()
+        )
+
+
+def _cells_of(preset: ConfigPreset) -> dict[DevProp, DevicePropertySetting]:
+    """Return the settings of `preset` by key (the first one wins, if duplicated)."""
+    cells: dict[DevProp, DevicePropertySetting] = {}
+    for setting in preset.settings:
+        cells.setdefault(setting.key(), setting)
+    return cells
@@ -6,6 +6,7 @@ from pymmcore_plus import CMMCorePlus, DeviceType
 
 from pymmcore_widgets._util import block_core
 
+from ._core_metadata import CoreMetadataCache
 from ._py_config_model import ConfigGroup, ConfigPreset, Device, DevicePropertySetting
 
 if TYPE_CHECKING:
@@ -17,13 +18,7 @@ if TYPE_CHECKING:
 
 def _get_device(core: CMMCorePlus, label: str) -> Device:
     """Get a Device model for the given label."""
-    return Device(
-        label=label,
-        name=core.getDeviceName(label),
-        description=core.getDeviceDescription(label),
-        library=core.getDeviceLibrary(label),
-        type=core.getDeviceType(label),
-    )
+    return Device(**CoreMetadataCache.for_core(core).device_info(label))
 
 
 def get_config_groups(core: CMMCorePlus) -> Iterable[ConfigGroup]:
@@ -62,27 +57,11 @@ def get_preset_settings(
 def get_property_info(core: CMMCorePlus, device_label: str, property_name: str) -> dict:
     """Get information about a property of a device.
 
-    Doe *NOT* include the current value of the property.
+    Doe *NOT* include the current value of the property. The information is read
+    from the core's shared `CoreMetadataCache`.
     """
-    max_len = 0
-    limits = None
-    if core.isPropertySequenceable(device_label, property_name):
-        max_len = core.getPropertySequenceMaxLength(device_label, property_name)
-    if core.hasPropertyLimits(device_label, property_name):
-        limits = (
-            core.getPropertyLowerLimit(device_label, property_name),
-            core.getPropertyUpperLimit(device_label, property_name),
-        )
-
-    return {
-        "property_name": property_name,
-        "property_type": core.getPropertyType(device_label, property_name),
-        "is_read_only": core.isPropertyReadOnly(device_label, property_name),
-        "is_pre_init": core.isPropertyPreInit(device_label, property_name),
-        "allowed_values": core.getAllowedPropertyValues(device_label, property_name),
-        "sequence_max_length": max_len,
-        "limits": limits,
-    }
+    cache = CoreMetadataCache.for_core(core)
+    return dict(cache.property_info(device_label, property_name))
 
 
 def set_config_groups(
@@ -94,13 +73,17 @@ def set_config_groups(
 ) -> None:
     """Update config groups in the core.
 
+    Only the differences between *groups* and the current state of the core are
+    applied (added, removed or changed presets and settings), and a single
+    ``configDefined`` event is emitted per group that actually changed.
+
     Parameters
     ----------
     core : CMMCorePlus
         The core instance to update.
     groups : Sequence[ConfigGroup]
         Groups to create or update in the core. If a group with the same name
-        already exists, it is deleted and recreated.
+        already exists, it is updated to match the given group.
     deleted_groups : Sequence[str] | None
         If provided, only these group names are deleted from the core
         (incremental mode). If None (default), all existing groups not present
@@ -120,24 +103,8 @@ def set_config_groups(
 
     with block_core(core.events):
         for name in names_to_delete:
-            print("Deleting config group:", name)
             core.deleteConfigGroup(name)
-
-        existing = set(core.getAvailableConfigGroups())
-        for group in groups:
-            if group.name in existing:
-                core.deleteConfigGroup(group.name)
-            if not group.presets:
-                core.defineConfigGroup(group.name)
-            for preset in group.presets.values():
-                for setting in preset.settings:
-                    core.defineConfig(
-                        group.name,
-                        preset.name,
-                        setting.device_label,
-                        setting.property_name,
-                        setting.value,
-                    )
+        changed = [group for group in groups if _apply_group_diff(core, group)]
 
     # NOTE:
     # I dislike that we're manually emitting signals here, but short of a
@@ -146,7 +113,7 @@ def set_config_groups(
     for name in names_to_delete:
         core.events.configGroupDeleted.emit(name)
 
-    for group in groups:
+    for group in changed:
         if group.presets:
             last_preset = next(reversed(group.presets.values()))
             if last_preset.settings:
@@ -170,6 +137,45 @@ def set_config_groups(
                 break
 
 
+def _apply_group_diff(core: CMMCorePlus, group: ConfigGroup) -> bool:
+    """Make the core's version of `group` match the model, with minimal changes.
+
+    Returns True if anything was changed.
+    """
+    name = group.name
+    if not core.isGroupDefined(name):
+        core.defineConfigGroup(name)
+        current: dict[str, dict[tuple[str, str], str]] = {}
+        changed = True
+    else:
+        current = {
+            preset: {(d, p): v for d, p, v in core.getConfigData(name, preset)}
+            for preset in core.getAvailableConfigs(name)
+        }
+        changed = False
+
+    for preset_name in current.keys() - group.presets.keys():
+        core.deleteConfig(name, preset_name)
+        changed = True
+
+    for preset in group.presets.values():
+        wanted = {(s.device_label, s.property_name): s.value for s in preset.settings}
+        if (existing := current.get(preset.name)) is None:
+            # an empty preset must still be defined
+            if not wanted:
+                core.defineConfig(name, preset.name)
+            existing = {}
+            changed = True
+        for dev, prop in existing.keys() - wanted.keys():
+            core.deleteConfig(name, preset.name, dev, prop)
+            changed = True
+        for (dev, prop), value in wanted.items():
+            if existing.get((dev, prop)) != value:
+                core.defineConfig(name, preset.name, dev, prop, value)
+                changed = True
+    return changed
+
+
 def get_loaded_devices(core: CMMCorePlus) -> Iterable[Device]:
     """Get the model for all devices."""
     for label in core.getLoadedDevices():
@@ -0,0 +1,137 @@
+"""Shared cache of (static) device and property metadata of a core."""
+
+from __future__ import annotations
+
+import weakref
+from typing import Any, ClassVar
+
+from pymmcore_plus import CMMCorePlus
+
+from pymmcore_widgets._util import connect_first
+
+
+class CoreMetadataCache:
+    """Per-core cache of device and property metadata.
+
+    Building a property model takes about 8 core calls per property (type,
+    read-only, pre-init, allowed values, limits, sequenceability), and widgets,
+    models and editors all ask again for the same properties. With slow device
+    adapters, this adds up quickly. This cache queries each device/property once,
+    until it is invalidated.
+
+    The cache is cleared on `systemConfigurationLoaded` and `propertiesChanged`
+    (emitted by devices when e.g. their allowed values change). Code that loads
+    or unloads devices individually should call `invalidate` for those labels.
+
+    Create using the `for_core` class method, which returns a cached instance for
+    the given core.
+
+    Attributes
+    ----------
+    calls_saved : int
+        Number of core calls that were avoided by reading from this cache.
+    """
+
+    @classmethod
+    def for_core(cls, mmcore: CMMCorePlus | None = None) -> CoreMetadataCache:
+        """Get the metadata cache for the given core (or the global instance)."""
+        mmcore = mmcore or CMMCorePlus.instance()
+        key = id(mmcore)
+        if key not in cls._CACHE:
+            cls._CACHE[key] = CoreMetadataCache(mmcore)
+            weakref.finalize(mmcore, cls._CACHE.pop, key, None)
+        return cls._CACHE[key]
+
+    _CACHE: ClassVar[dict[int, CoreMetadataCache]] = {}
+
+    def __init__(self, mmcore: CMMCorePlus) -> None:
+        # don't keep the core alive: the class cache is cleaned up when it dies
+        self._core_ref = weakref.ref(mmcore)
+        # {key: (info, number of core calls it took to get info)}
+        self._devices: dict[str, tuple[dict[str, Any], int]] = {}
+        self._properties: dict[tuple[str, str], tuple[dict[str, Any], int]] = {}
+        self.calls_saved = 0
+
+        ev = mmcore.events
+        connect_first(ev.systemConfigurationLoaded, self._on_config_loaded)
+        connect_first(ev.propertiesChanged, self._on_properties_changed)
+
+    @property
+    def _core(self) -> CMMCorePlus:
+        if (core := self._core_ref()) is None:  # pragma: no cover
+            raise RuntimeError("The core of this metadata cache has been deleted.")
+        return core
+
+    def device_info(self, label: str) -> dict[str, Any]:
+        """Return the name, description, library and type of a loaded device.
+
+        The returned dict must not be modified.
+        """
+        if (cached := self._devices.get(label)) is not None:
+            self.calls_saved += cached[1]
+            return cached[0]
+        core = self._core
+        info = {
+            "label": label,
+            "name": core.getDeviceName(label),
+            "description": core.getDeviceDescription(label),
+            "library": core.getDeviceLibrary(label),
+            "type": core.getDeviceType(label),
+        }
+        self._devices[label] = (info, 4)
+        return info
+
+    def property_info(self, device_label: str, property_name: str) -> dict[str, Any]:
+        """Return the metadata of a property (not including its current value).
+
+        The keys match the fields of `DevicePropertySetting`. The returned dict must
+        not be modified.
+        """
+        key = (device_label, property_name)
+        if (cached := self._properties.get(key)) is not None:
+            self.calls_saved += cached[1]
+            return cached[0]
+
+        core = self._core
+        n_calls = 6
+        max_len = 0
+        limits = None
+        if core.isPropertySequenceable(device_label, property_name):
+            max_len = core.getPropertySequenceMaxLength(device_label, property_name)
+            n_calls += 1
+        if core.hasPropertyLimits(device_label, property_name):
+            limits = (
+                core.getPropertyLowerLimit(device_label, property_name),
+                core.getPropertyUpperLimit(device_label, property_name),
+            )
+            n_calls += 2
+
+        info = {
+            "property_name": property_name,
+            "property_type": core.getPropertyType(device_label, property_name),
+            "is_read_only": core.isPropertyReadOnly(device_label, property_name),
+            "is_pre_init": core.isPropertyPreInit(device_label, property_name),
+            "allowed_values": tuple(
+                core.getAllowedPropertyValues(device_label, property_name)
+            ),
+            "sequence_max_length": max_len,
+            "limits": limits,
+        }
+        self._properties[key] = (info, n_calls)
+        return info
+
+    def invalidate(self, device_label: str | None = None) -> None:
+        """Forget the cached metadata of one device, or of all devices if None."""
+        if device_label is None:
+            self._devices.clear()
+            self._properties.clear()
+            return
+        self._devices.pop(device_label, None)
+        for key in [k for k in self._properties if k[0] == device_label]:
+            del self._properties[key]
+
+    def _on_config_loaded(self) -> None:
+        self.invalidate()
+
+    def _on_properties_changed(self) -> None:
+        self.invalidate()
@@ -354,6 +354,7 @@ class QConfigGroupsModel(_BaseTreeModel):
         for child in parent_node.children[row : row + count]:
             self._unregister_tree(child)
         del parent_node.children[row : row + count]
+        parent_node.renumber_children()
 
         # keep the owning dataclass in sync with the new order
         if isinstance((group := parent_node.payload), ConfigGroup):
@@ -592,6 +593,7 @@ class QConfigGroupsModel(_BaseTreeModel):
             parent_node.children.insert(
                 row + i, self._create_node(payload, parent_node)
             )
+        parent_node.renumber_children()
 
         # ---------- keep dataclasses in sync ----------
         if isinstance((grp := parent_node.payload), ConfigGroup):
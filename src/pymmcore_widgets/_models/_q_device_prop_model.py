@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from bisect import bisect_left
 from contextlib import suppress
 from copy import deepcopy
 from typing import TYPE_CHECKING, Any, cast
@@ -161,12 +162,23 @@ class QDevicePropertyModel(_BaseTreeModel):
 
 
 class DevicePropertyFlatProxy(QAbstractItemModel):
-    """Flatten `Device → Property` into rows:  Device | Property."""
+    """Flatten `Device → Property` into rows:  Device | Property.
+
+    Rows inserted into, removed from or changed in the source model are mapped
+    incrementally to the matching row signals of this proxy (a value change only
+    looks up the affected rows), so views keep their selection and scroll position.
+    The proxy is only reset when the source model is reset or its layout changes.
+    """
 
     def __init__(self, parent: QObject | None = None) -> None:
         super().__init__(parent)
         self._source_model: QAbstractItemModel | None = None
-        self._rows: list[tuple[int, int]] = []
+        self._rows: list[tuple[int, int]] = []  # (device row, property row)
+        # {(device row, property row): flat row}, rebuilt lazily after changes
+        self._flat_of: dict[tuple[int, int], int] | None = None
+        # column and order of the last `sort`, used to place inserted rows
+        self._sort_column: int | None = None
+        self._sort_order = Qt.SortOrder.AscendingOrder
 
     def setSourceModel(self, source_model: QAbstractItemModel | None) -> None:
         """Set the source model and connect to its signals."""
@@ -175,8 +187,8 @@ class DevicePropertyFlatProxy(QAbstractItemModel):
             with suppress(RuntimeError):
                 self._source_model.modelReset.disconnect(self._rebuild_rows)
                 self._source_model.layoutChanged.disconnect(self._rebuild_rows)
-                self._source_model.rowsInserted.disconnect(self._rebuild_rows)
-                self._source_model.rowsRemoved.disconnect(self._rebuild_rows)
+                self._source_model.rowsInserted.disconnect(self._on_rows_inserted)
+                self._source_model.rowsRemoved.disconnect(self._on_rows_removed)
                 self._source_model.dataChanged.disconnect(self._on_source_data_changed)
 
         self._source_model = source_model
@@ -185,8 +197,8 @@ class DevicePropertyFlatProxy(QAbstractItemModel):
         if source_model is not None:
             source_model.modelReset.connect(self._rebuild_rows)
             source_model.layoutChanged.connect(self._rebuild_rows)
-            source_model.rowsInserted.connect(self._rebuild_rows)
-            source_model.rowsRemoved.connect(self._rebuild_rows)
+            source_model.rowsInserted.connect(self._on_rows_inserted)
+            source_model.rowsRemoved.connect(self._on_rows_removed)
             source_model.dataChanged.connect(self._on_source_data_changed)
 
         self._rebuild_rows()
@@ -279,15 +291,15 @@ class DevicePropertyFlatProxy(QAbstractItemModel):
     def sort(
         self, column: int, order: Qt.SortOrder = Qt.SortOrder.AscendingOrder
     ) -> None:
-        if column not in (0, 1) or not (sm := self._source_model):
+        if column not in (0, 1) or not self._source_model:
             return
 
-        def _key(x: tuple[int, int]) -> Any:
-            par = sm.index(x[0], 0) if column == 1 else NULL_INDEX
-            return sm.index(x[column], 0, par).data() or ""
-
+        self._sort_column, self._sort_order = column, order
         self.layoutAboutToBeChanged.emit()
-        self._rows.sort(key=_key, reverse=order == Qt.SortOrder.DescendingOrder)
+        self._rows.sort(
+            key=self._sort_key, reverse=order == Qt.SortOrder.DescendingOrder
+        )
+        self._flat_of = None
         self.layoutChanged.emit()
 
     # ------------------------------------------------------------------
@@ -328,10 +340,23 @@ class DevicePropertyFlatProxy(QAbstractItemModel):
             return self._source_model.index(prow, 0, device_idx)
         return QModelIndex()
 
+    def _sort_key(self, key: tuple[int, int]) -> str:
+        sm = cast("QAbstractItemModel", self._source_model)
+        column = self._sort_column or 0
+        par = sm.index(key[0], 0) if column == 1 else NULL_INDEX
+        return str(sm.index(key[column], 0, par).data() or "")
+
+    def _flat_index(self) -> dict[tuple[int, int], int]:
+        if self._flat_of is None:
+            self._flat_of = {key: row for row, key in enumerate(self._rows)}
+        return self._flat_of
+
     def _rebuild_rows(self) -> None:
         """Rebuild the flattened row structure."""
         self.beginResetModel()
         self._rows.clear()
+        self._flat_of = None
+        self._sort_column = None
 
         if self._source_model is not None:
             for drow in range(self._source_model.rowCount()):
@@ -344,49 +369,118 @@ class DevicePropertyFlatProxy(QAbstractItemModel):
 
         self.endResetModel()
 
+    def _on_rows_inserted(self, parent: QModelIndex, first: int, last: int) -> None:
+        """Insert the rows of devices or properties added to the source model."""
+        if (sm := self._source_model) is None:
+            return  # pragma: no cover
+        n = last - first + 1
+        if not parent.isValid():  # devices
+            self._rows = [(d + n, p) if d >= first else (d, p) for d, p in self._rows]
+            new = [
+                (d, p)
+                for d in range(first, last + 1)
+                for p in range(sm.rowCount(sm.index(d, 0)))
+            ]
+        elif not parent.parent().isValid():  # properties
+            drow = parent.row()
+            self._rows = [
+                (d, p + n) if d == drow and p >= first else (d, p)
+                for d, p in self._rows
+            ]
+            new = [(drow, p) for p in range(first, last + 1)]
+        else:
+            return  # pragma: no cover
+        self._flat_of = None
+        if not new:
+            return
+
+        if self._sort_column is None:
+            # rows are in source order: the new ones form one contiguous block
+            row = bisect_left(self._rows, new[0])
+            self.beginInsertRows(QModelIndex(), row, row + len(new) - 1)
+            self._rows[row:row] = new
+            self.endInsertRows()
+            return
+        for key in new:
+            row = self._sorted_position(key)
+            self.beginInsertRows(QModelIndex(), row, row)
+            self._rows.insert(row, key)
+            self.endInsertRows()
+
+    def _sorted_position(self, key: tuple[int, int]) -> int:
+        """Return the row at which `key` goes, given the current sort order."""
+        value = self._sort_key(key)
+        descending = self._sort_order == Qt.SortOrder.DescendingOrder
+        lo, hi = 0, len(self._rows)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            other = self._sort_key(self._rows[mid])
+            if (value > other) if descending else (value < other):
+                hi = mid
+            else:
+                lo = mid + 1
+        return lo
+
+    def _on_rows_removed(self, parent: QModelIndex, first: int, last: int) -> None:
+        """Remove the rows of devices or properties removed from the source model."""
+        n = last - first + 1
+        if not parent.isValid():  # devices
+            removed = [i for i, (d, _) in enumerate(self._rows) if first <= d <= last]
+
+            def _shift(d: int, p: int) -> tuple[int, int]:
+                return (d - n, p) if d > last else (d, p)
+
+        elif not parent.parent().isValid():  # properties
+            drow = parent.row()
+            removed = [
+                i
+                for i, (d, p) in enumerate(self._rows)
+                if d == drow and first <= p <= last
+            ]
+
+            def _shift(d: int, p: int) -> tuple[int, int]:
+                return (d, p - n) if d == drow and p > last else (d, p)
+
+        else:
+            return  # pragma: no cover
+
+        self._flat_of = None
+        for start, stop in reversed(_runs(removed)):
+            self.beginRemoveRows(QModelIndex(), start, stop)
+            del self._rows[start : stop + 1]
+            self.endRemoveRows()
+        # then point the remaining rows to their new source rows
+        self._rows = [_shift(d, p) for d, p in self._rows]
+
     def _on_source_data_changed(
         self, top_left: QModelIndex, bottom_right: QModelIndex, roles: list[int]
     ) -> None:
         """Handle dataChanged signal from source model and emit signals."""
-        if not self._source_model:
+        if not (sm := self._source_model) or top_left.column() > 0:
             return
 
         # Find which flat proxy rows correspond to changed indices in source model
-        changed_rows: set[int] = set()
-
-        # Check if any of our flattened rows correspond to the changed indices
-        for flat_row, (drow, prow) in enumerate(self._rows):
-            # Check if this flat row corresponds to a changed device or property
-            device_idx = self._source_model.index(drow, 0)
-            if device_idx.isValid():
-                prop_idx = self._source_model.index(prow, 0, device_idx)
-
-                # Check if the changed range includes our device or property
-                if self._index_in_range(
-                    device_idx, top_left, bottom_right
-                ) or self._index_in_range(prop_idx, top_left, bottom_right):
-                    changed_rows.add(flat_row)
-
-        # Emit dataChanged for all affected flat proxy rows
-        for flat_row in changed_rows:
-            top_left_flat = self.index(flat_row, 0)
-            bottom_right_flat = self.index(flat_row, 1)
-            if top_left_flat.isValid() and bottom_right_flat.isValid():
-                self.dataChanged.emit(top_left_flat, bottom_right_flat, roles)
-
-    def _index_in_range(
-        self, index: QModelIndex, top_left: QModelIndex, bottom_right: QModelIndex
-    ) -> bool:
-        """Check if an index falls within the given range."""
-        if not index.isValid() or not top_left.isValid() or not bottom_right.isValid():
-            return False
-
-        # Check if parent matches
-        if index.parent() != top_left.parent():
-            return False
-
-        # Check if row and column are in range
-        return bool(
-            top_left.row() <= index.row() <= bottom_right.row()
-            and top_left.column() <= index.column() <= bottom_right.column()
-        )
+        parent = top_left.parent()
+        rows = range(top_left.row(), bottom_right.row() + 1)
+        if not parent.isValid():  # devices: all their properties changed
+            keys = [(d, p) for d in rows for p in range(sm.rowCount(sm.index(d, 0)))]
+        elif not parent.parent().isValid():  # properties
+            keys = [(parent.row(), p) for p in rows]
+        else:
+            return  # pragma: no cover
+
+        flat_of = self._flat_index()
+        changed = sorted(r for key in keys if (r := flat_of.get(key)) is not None)
+        for start, stop in _runs(changed):
+            self.dataChanged.emit(self.index(start, 0), self.index(stop, 1), roles)
+
+
+def _runs(rows: list[int]) -> list[tuple[int, int]]:
+    """Group sorted `rows` into (first, last) runs of consecutive rows."""
+    runs: list[tuple[int, int]] = []
+    for row in rows:
+        if runs and runs[-1][1] == row - 1:
+            runs[-1] = (runs[-1][0], row)
+        else:
+            runs.append((row, row))
+    return runs
@@ -18,10 +18,10 @@ from qtpy.QtWidgets import (
     QVBoxLayout,
     QWidget,
 )
-from superqt.utils import signals_blocked
+from superqt.utils import QSignalDebouncer, signals_blocked
 
 if TYPE_CHECKING:
-    from collections.abc import Sequence
+    from collections.abc import Callable, Sequence
     from contextlib import AbstractContextManager
     from typing import Any
 
@@ -105,6 +105,35 @@ def block_core(obj: Any) -> AbstractContextManager:
     raise TypeError(f"Cannot block signals for {obj}")
 
 
+def connect_debounced(
+    signal: Any, slot: Callable[[], Any], parent: QObject, msec: int = 150
+) -> QSignalDebouncer:
+    """Connect `signal` to `slot`, calling it once `msec` after a burst of emissions.
+
+    Used e.g. to refilter a table once, rather than on every keystroke in a filter
+    line edit.
+    """
+    debouncer = QSignalDebouncer(parent=parent)
+    debouncer.setTimeout(msec)
+    debouncer.triggered.connect(slot)
+    signal.connect(debouncer.throttle)
+    return debouncer
+
+
+def connect_first(signal: Any, slot: Callable) -> None:
+    """Connect `slot` so that it runs before previously connected callbacks.
+
+    Used by shared caches that must be updated before the widgets that read them
+    handle the same event. psygnal supports connection priorities, Qt signals do
+    not (but those are called in connection order, and shared caches are usually
+    created before the widgets that use them).
+    """
+    try:
+        signal.connect(slot, priority=100)
+    except TypeError:
+        signal.connect(slot)
+
+
 def fov_kwargs(core: CMMCorePlus) -> dict:
     """Return image width and height in micron to be used for the grid plan."""
     if px := core.getPixelSizeUm():
@@ -17,6 +17,7 @@ from qtpy.QtWidgets import (
     QWidget,
 )
 
+from pymmcore_widgets._util import connect_debounced
 from pymmcore_widgets.device_properties._device_property_table import (
     DevicePropertyTable,
 )
@@ -94,7 +95,7 @@ class AddGroupWidget(QDialog):
         self._filter_text = QLineEdit()
         self._filter_text.setClearButtonEnabled(True)
         self._filter_text.setPlaceholderText("Filter by device or property name...")
-        self._filter_text.textChanged.connect(self._update_filter)
+        connect_debounced(self._filter_text.textChanged, self._update_filter, self)
 
         self._prop_table = DevicePropertyTable(
             mmcore=self._mmc, enable_property_widgets=False
@@ -14,7 +14,7 @@ from qtpy.QtWidgets import (
     QWidget,
 )
 
-from pymmcore_widgets._util import block_core
+from pymmcore_widgets._util import block_core, connect_debounced
 from pymmcore_widgets.device_properties._device_property_table import (
     DevicePropertyTable,
 )
@@ -93,7 +93,7 @@ class EditGroupWidget(QDialog):
         self._filter_text = QLineEdit()
         self._filter_text.setClearButtonEnabled(True)
         self._filter_text.setPlaceholderText("Filter by device or property name...")
-        self._filter_text.textChanged.connect(self._update_filter)
+        connect_debounced(self._filter_text.textChanged, self._update_filter, self)
 
         self._prop_table = DevicePropertyTable(
             mmcore=self._mmc, enable_property_widgets=False
@@ -27,6 +27,7 @@ from qtpy.QtWidgets import (
 )
 from superqt.utils import signals_blocked
 
+from pymmcore_widgets._util import connect_debounced
 from pymmcore_widgets.device_properties._device_property_table import (
     DevicePropertyTable,
 )
@@ -564,7 +565,7 @@ class _PropertySelector(QWidget):
         self._filter_text = QLineEdit()
         self._filter_text.setClearButtonEnabled(True)
         self._filter_text.setPlaceholderText("Filter by device or property name...")
-        self._filter_text.textChanged.connect(self._update_filter)
+        connect_debounced(self._filter_text.textChanged, self._update_filter, self)
 
         self._prop_table = DevicePropertyTable(
             mmcore=self._mmc, connect_core=False, enable_property_widgets=False
@@ -661,14 +662,17 @@ class _PropertySelector(QWidget):
                 "DeviceProperty",
                 self._prop_table.item(row, 0).data(self._prop_table.PROP_ROLE),
             )
-            val_wdg = cast("PropertyWidget", self._prop_table.cellWidget(row, 1))
 
             with signals_blocked(self._prop_table):
                 # check if the device-property is in value
                 if (dev_prop.device, dev_prop.name) in value_dict:
                     # get the value of the PropertyWidget from value
                     val = value_dict[(dev_prop.device, dev_prop.name)]
-                    # update the value of the PropertyWidget
+                    # update the value of the PropertyWidget (property widgets are
+                    # created lazily, so only request the ones we need)
+                    val_wdg = cast(
+                        "PropertyWidget", self._prop_table.cellWidget(row, 1)
+                    )
                     with signals_blocked(val_wdg.inner_widget):
                         val_wdg.setValue(val)
 
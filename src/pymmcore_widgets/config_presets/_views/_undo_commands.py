@@ -2,19 +2,24 @@
 
 Every command exposes ``affected_index()`` — the model index the UI should
 navigate to after the command runs (redo *or* undo).
+
+Commands keep references to the (removed or replaced) model objects instead of
+deep copies: while a command is on the undo stack, the objects it refers to are
+only modified by later commands, which are undone first. The value of a
+`DevicePropertySetting` is the only field that is edited in place (changing the
+device or property creates a new setting), so it is recorded alongside.
 """
 
 from __future__ import annotations
 
 from contextlib import contextmanager
-from copy import deepcopy
 from typing import TYPE_CHECKING, Any
 
 from qtpy.QtCore import QModelIndex, QPersistentModelIndex, Qt
 from qtpy.QtGui import QUndoStack
 
 if TYPE_CHECKING:
-    from collections.abc import Iterator, Sequence
+    from collections.abc import Iterable, Iterator, Sequence
 
     from PyQt6.QtGui import QUndoCommand
 
@@ -27,12 +32,34 @@ if TYPE_CHECKING:
 else:
     from qtpy.QtGui import QUndoCommand
 
+# QUndoCommand.id() of commands that can be merged with the next one
+_CHANGE_VALUE_ID = 1
+
 
 # ---------------------------------------------------------------------------
 # Helpers
 # ---------------------------------------------------------------------------
 
 
+def _snapshot(
+    settings: Iterable[DevicePropertySetting],
+) -> tuple[tuple[DevicePropertySetting, str], ...]:
+    """Record `settings` (shared, not copied) together with their current value."""
+    return tuple((s, s.value) for s in settings)
+
+
+def _restore(
+    snapshot: Iterable[tuple[DevicePropertySetting, str]],
+) -> list[DevicePropertySetting]:
+    """Return the settings of a `_snapshot`, with their recorded values."""
+    settings = []
+    for setting, value in snapshot:
+        if setting.value != value:
+            setting.value = value
+        settings.append(setting)
+    return settings
+
+
 @contextmanager
 def undo_macro(undo_stack: QUndoStack, text: str) -> Iterator[None]:
     """Context manager to group multiple commands into a single undo step."""
@@ -155,9 +182,8 @@ class RemoveGroupCommand(_ModelCommand):
 
     def redo(self) -> None:
         if self._group_index.isValid():
-            self._group_data = deepcopy(
-                self._group_index.data(Qt.ItemDataRole.UserRole)
-            )
+            # the removed group is kept as is: nothing modifies it while detached
+            self._group_data = self._group_index.data(Qt.ItemDataRole.UserRole)
             self._model.removeRows(self._row, 1, QModelIndex())
         self._last_affected = QModelIndex()
 
@@ -269,7 +295,7 @@ class RemovePresetCommand(_ModelCommand):
     def redo(self) -> None:
         preset_idx = self._preset.resolve(self._model)
         if preset_idx.isValid():
-            self._preset_data = deepcopy(preset_idx.data(Qt.ItemDataRole.UserRole))
+            self._preset_data = preset_idx.data(Qt.ItemDataRole.UserRole)
             group_idx = self._group.resolve(self._model)
             if group_idx.isValid():
                 self._model.removeRows(self._row, 1, group_idx)
@@ -420,24 +446,31 @@ class _UpdatePresetCommand(_ModelCommand):
     ) -> None:
         super().__init__(model=model, text=text, parent=parent)
         self._target = _TrackedIndex(preset_index)
-        self._new_data = deepcopy(list(new_data))
-        self._old_settings: list[DevicePropertySetting] | None = None
+        # settings already in the preset are shared, others are (shallow) copied so
+        # that the caller's objects never end up in the model.
+        preset = preset_index.data(Qt.ItemDataRole.UserRole)
+        current = {id(s) for s in getattr(preset, "settings", ())}
+        self._new_data = _snapshot(
+            s if id(s) in current else s.model_copy() for s in new_data
+        )
+        self._old_settings: tuple[tuple[DevicePropertySetting, str], ...] | None = None
 
     def redo(self) -> None:
         idx = self._target.resolve(self._model)
         if idx.isValid():
             preset_data = idx.data(Qt.ItemDataRole.UserRole)
             if preset_data:
-                self._old_settings = deepcopy(preset_data.settings)
+                self._old_settings = _snapshot(preset_data.settings)
+            new_data = _restore(self._new_data)
             with self._undo_mode():
-                getattr(self._model, self._redo_model_method)(idx, self._new_data)
+                getattr(self._model, self._redo_model_method)(idx, new_data)
         self._last_affected = idx
 
     def undo(self) -> None:
         idx = self._target.resolve(self._model)
         if self._old_settings is not None and idx.isValid():
             with self._undo_mode():
-                self._model.update_preset_settings(idx, self._old_settings)
+                self._model.update_preset_settings(idx, _restore(self._old_settings))
         self._last_affected = idx
 
 
@@ -518,6 +551,23 @@ class ChangePropertyValueCommand(_ModelCommand):
             self._model.setData(idx, self._old_value)
         self._last_affected = idx.parent() if idx.isValid() else QModelIndex()
 
+    def id(self) -> int:
+        return _CHANGE_VALUE_ID
+
+    def mergeWith(self, other: QUndoCommand | None) -> bool:
+        """Merge consecutive edits of the same cell into a single undo step."""
+        if (
+            not isinstance(other, ChangePropertyValueCommand)
+            or other._model is not self._model
+            or other._target.resolve(self._model) != self._target.resolve(self._model)
+        ):
+            return False
+        self._new_value = other._new_value
+        self._last_affected = other._last_affected
+        # editing back to the original value cancels the command
+        self.setObsolete(str(self._new_value) == self._old_value)
+        return True
+
 
 # ---------------------------------------------------------------------------
 # Channel group command
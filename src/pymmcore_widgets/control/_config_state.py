@@ -0,0 +1,234 @@
+"""Tracking of the config group presets matching the current system state."""
+
+from __future__ import annotations
+
+import weakref
+from typing import TYPE_CHECKING, ClassVar
+
+from pymmcore_plus import CMMCorePlus
+from qtpy.QtCore import QObject, Signal
+
+from pymmcore_widgets._util import connect_first
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    DevProp = tuple[str, str]
+
+# a state device reports changes of its position as either of these properties
+_STATE_PROPS = {"State": "Label", "Label": "State"}
+
+
+class PresetIndex:
+    """Maps the current values of a group's properties to the matching preset.
+
+    Each preset is compiled once into a *fingerprint* (the tuple of its values, for
+    its sorted (device, property) keys), so that finding the preset that matches
+    the current state takes one tuple of cached property values and one dict
+    lookup, instead of comparing every setting of every preset.
+
+    The index does not track changes to the group: build a new one when presets
+    are defined or deleted.
+
+    Parameters
+    ----------
+    core : CMMCorePlus
+        The core holding the group.
+    group : str
+        Name of the config group.
+    """
+
+    def __init__(self, core: CMMCorePlus, group: str) -> None:
+        self.group = group
+        # {preset: position in the group}, the first matching preset wins
+        self._order: dict[str, int] = {}
+        # {sorted keys: {fingerprint: preset}}. Presets of a (well-formed) group
+        # all share the same keys, so there's usually a single table.
+        self._tables: dict[tuple[DevProp, ...], dict[tuple[str, ...], str]] = {}
+        for i, preset in enumerate(core.getAvailableConfigs(group)):
+            self._order[preset] = i
+            settings = {(d, p): v for d, p, v in core.getConfigData(group, preset)}
+            keys = tuple(sorted(settings))
+            fingerprint = tuple(settings[k] for k in keys)
+            self._tables.setdefault(keys, {}).setdefault(fingerprint, preset)
+
+        #: all (device, property) pairs used by the group
+        self.properties: frozenset[DevProp] = frozenset(
+            k for keys in self._tables for k in keys
+        )
+
+    def match(self, core: CMMCorePlus) -> str | None:
+        """Return the first preset matching the (cached) state of `core`, if any."""
+        best: str | None = None
+        for keys, table in self._tables.items():
+            state = tuple(core.getPropertyFromCache(d, p) for d, p in keys)
+            if (preset := table.get(state)) is not None and (
+                best is None or self._order[preset] < self._order[best]
+            ):
+                best = preset
+        return best
+
+
+class ConfigStateTracker(QObject):
+    """Keeps track of the active preset of every config group of a core.
+
+    Instead of every preset widget listening to every `propertyChanged` and
+    `configSet` event and recomputing its own state, this tracker looks up the
+    groups affected by each event in a (device, property) -> groups reverse index,
+    re-matches only those (see `PresetIndex`), and emits a single `groupsChanged`
+    signal with all groups whose active preset changed.
+
+    Create using the `for_core` class method, which returns a cached instance for
+    the given core.
+
+    Attributes
+    ----------
+    groupsChanged : Signal
+        Emitted with a `{group: preset}` dict of the groups whose matching preset
+        changed. `preset` is None if no preset matches the current state.
+    """
+
+    groupsChanged = Signal(dict)
+
+    @classmethod
+    def for_core(cls, mmcore: CMMCorePlus | None = None) -> ConfigStateTracker:
+        """Get the tracker for the given core (or the global instance)."""
+        mmcore = mmcore or CMMCorePlus.instance()
+        key = id(mmcore)
+        if key not in cls._CACHE:
+            cls._CACHE[key] = ConfigStateTracker(mmcore)
+            weakref.finalize(mmcore, cls._CACHE.pop, key, None)
+        return cls._CACHE[key]
+
+    _CACHE: ClassVar[dict[int, ConfigStateTracker]] = {}
+
+    def __init__(self, mmcore: CMMCorePlus) -> None:
+        super().__init__()
+        # don't keep the core alive: the class cache is cleaned up when it dies
+        self._core_ref = weakref.ref(mmcore)
+        self._indexes: dict[str, PresetIndex] = {}
+        self._current: dict[str, str | None] = {}
+        self._groups_of: dict[DevProp, set[str]] = {}  # reverse index
+        # all groups must be (re)indexed before the next use
+        self._stale = True
+
+        ev = mmcore.events
+        ev.propertyChanged.connect(self._on_property_changed)
+        ev.configSet.connect(self._on_config_set)
+        # the index must be up to date before widgets handle these events
+        connect_first(ev.configDefined, self._on_config_defined)
+        connect_first(ev.configDeleted, self._on_config_deleted)
+        connect_first(ev.configGroupDeleted, self._on_group_deleted)
+        connect_first(ev.systemConfigurationLoaded, self._on_config_loaded)
+
+    @property
+    def _core(self) -> CMMCorePlus:
+        if (core := self._core_ref()) is None:  # pragma: no cover
+            raise RuntimeError("The core of this tracker has been deleted.")
+        return core
+
+    def currentPreset(self, group: str) -> str | None:
+        """Return the first preset of `group` that matches the current state."""
+        self._ensure_indexed()
+        return self._current.get(group)
+
+    def groupProperties(self, group: str) -> frozenset[DevProp]:
+        """Return the (device, property) pairs used by the presets of `group`."""
+        self._ensure_indexed()
+        if (index := self._indexes.get(group)) is None:
+            return frozenset()
+        return index.properties
+
+    def invalidate(self, group: str | None = None) -> None:
+        """Re-read the presets of `group` (or of all groups if None) from the core.
+
+        Needed only after changes made while the core's signals were blocked.
+        """
+        if group is None:
+            self._stale = True
+        elif not self._stale:
+            self._reindex(group)
+
+    # ------------------------------------------------------------------
+
+    def _ensure_indexed(self) -> None:
+        if not self._stale:
+            return
+        self._stale = False
+        self._indexes.clear()
+        self._current.clear()
+        self._groups_of.clear()
+        for group in self._core.getAvailableConfigGroups():
+            self._reindex(group)
+
+    def _reindex(self, group: str) -> None:
+        """Rebuild the index of one group (or remove it, if it doesn't exist)."""
+        if (old := self._indexes.pop(group, None)) is not None:
+            for key in old.properties:
+                if groups := self._groups_of.get(key):
+                    groups.discard(group)
+                    if not groups:
+                        del self._groups_of[key]
+        core = self._core
+        if not core.isGroupDefined(group):
+            self._current.pop(group, None)
+            return
+        self._indexes[group] = index = PresetIndex(core, group)
+        for key in index.properties:
+            self._groups_of.setdefault(key, set()).add(group)
+        self._current[group] = index.match(core)
+
+    def _update(
+        self, groups: Iterable[str], explicit: dict[str, str] | None = None
+    ) -> None:
+        """Re-match `groups` and emit the ones whose preset changed."""
+        explicit = explicit or {}
+        core = self._core
+        changed: dict[str, str | None] = {}
+        for group in groups:
+            if (index := self._indexes.get(group)) is None:
+                continue
+            preset = index.match(core)
+            # trust an explicitly set preset, if some preset matches at all
+            if preset is not None and group in explicit:
+                preset = explicit[group]
+            if preset != self._current.get(group):
+                self._current[group] = changed[group] = preset
+        if changed:
+            self.groupsChanged.emit(changed)
+
+    def _on_property_changed(self, device: str, prop: str, _value: object) -> None:
+        self._ensure_indexed()
+        groups = self._groups_of.get((device, prop), set())
+        if (other := _STATE_PROPS.get(prop)) is not None:
+            groups = groups | self._groups_of.get((device, other), set())
+        if groups:
+            self._update(groups)
+
+    def _on_config_set(self, group: str, preset: str) -> None:
+        self._ensure_indexed()
+        affected = {group}
+        for key in self.groupProperties(group):
+            affected.update(self._groups_of.get(key, ()))
+        self._update(affected, {group: preset})
+
+    def _on_config_defined(self, group: str, *_: str) -> None:
+        self._on_group_modified(group)
+
+    def _on_config_deleted(self, group: str, _preset: str) -> None:
+        self._on_group_modified(group)
+
+    def _on_group_modified(self, group: str) -> None:
+        if self._stale:
+            return
+        before = self._current.get(group)
+        self._reindex(group)
+        if (after := self._current.get(group)) != before and group in self._indexes:
+            self.groupsChanged.emit({group: after})
+
+    def _on_group_deleted(self, group: str) -> None:
+        if not self._stale:
+            self._reindex(group)
+
+    def _on_config_loaded(self) -> None:
+        self._stale = True
@@ -2,13 +2,15 @@ from __future__ import annotations
 
 import warnings
 
-from pymmcore_plus import CMMCorePlus, DeviceType
+from pymmcore_plus import CMMCorePlus
 from qtpy.QtCore import Slot
 from qtpy.QtWidgets import QComboBox, QHBoxLayout, QWidget
 from superqt.utils import signals_blocked
 
 from pymmcore_widgets._util import block_core
 
+from ._config_state import ConfigStateTracker
+
 NO_MATCH = "<no match>"
 
 
@@ -40,6 +42,9 @@ class PresetsWidget(QWidget):
         self._mmc = mmcore or CMMCorePlus.instance()
 
         self._group = group
+        # shared by all preset widgets of the core: keeps the matching preset of
+        # every group up to date, and tells us when ours changes.
+        self._tracker = ConfigStateTracker.for_core(self._mmc)
 
         if self._group not in self._mmc.getAvailableConfigGroups():
             raise ValueError(f"{self._group} group does not exist.")
@@ -66,9 +71,8 @@ class PresetsWidget(QWidget):
         self._combo.currentTextChanged.connect(self._on_combo_changed)
         self._combo.textActivated.connect(self._on_text_activate)
 
-        self._mmc.events.configSet.connect(self._on_cfg_set)
+        self._tracker.groupsChanged.connect(self._on_groups_changed)
         self._mmc.events.systemConfigurationLoaded.connect(self._refresh)
-        self._mmc.events.propertyChanged.connect(self._on_property_changed)
 
         self._mmc.events.configDeleted.connect(self._on_preset_deleted)
         self._mmc.events.configGroupDeleted.connect(self._on_group_deleted)
@@ -106,20 +110,18 @@ class PresetsWidget(QWidget):
     def _update_if_props_not_match_preset(self) -> None:
         if not self._mmc.getAvailableConfigs(self._group):
             return
-        for preset in self._presets:
-            _set_combo = True
-            for dev, prop, value in self._mmc.getConfigData(self._group, preset):
-                cache_value = self._mmc.getPropertyFromCache(dev, prop)
-                if cache_value != value:
-                    _set_combo = False
-                    break
-            if _set_combo:
+        self._set_current_preset(self._tracker.currentPreset(self._group))
+
+    def _set_current_preset(self, preset: str | None) -> None:
+        """Show `preset` in the combo, or NO_MATCH if None."""
+        if preset is not None:
+            # (removing the current NO_MATCH item would set another preset)
+            with signals_blocked(self._combo):
                 # remove NO_MATCH if it exists
                 if (no_match_index := self._combo.findText(NO_MATCH)) >= 0:
                     self._combo.removeItem(no_match_index)
-                with signals_blocked(self._combo):
-                    self._combo.setCurrentText(preset)
-                    return
+                self._combo.setCurrentText(preset)
+            return
         # if None of the presets match the current system state
         # add NO_MATCH to combo if not already there
         current_items = [self._combo.itemText(i) for i in range(self._combo.count())]
@@ -128,28 +130,10 @@ class PresetsWidget(QWidget):
         with signals_blocked(self._combo):
             self._combo.setCurrentText(NO_MATCH)
 
-    @Slot(str, str)
-    def _on_cfg_set(self, group: str, preset: str) -> None:
-        if group == self._group and self._combo.currentText() != preset:
-            with signals_blocked(self._combo):
-                self._combo.setCurrentText(preset)
-        else:
-            dev_prop_list = self._get_preset_dev_prop(self._group, self._presets[0])
-            if any(dev_prop for dev_prop in dev_prop_list if dev_prop in self.dev_prop):
-                self._update_if_props_not_match_preset()
-
-    @Slot(str, str, object)
-    def _on_property_changed(self, device: str, property: str, value: str) -> None:
-        if not device:
-            return
-        if (device, property) not in self.dev_prop:
-            if self._mmc.getDeviceType(device) != DeviceType.StateDevice:
-                return
-            # a StateDevice has also a "Label" property. If "Label" is not
-            # in dev_prop, we check if the property "State" is in dev_prop.
-            if (device, "State") not in self.dev_prop:
-                return
-        self._update_if_props_not_match_preset()
+    @Slot(dict)
+    def _on_groups_changed(self, changed: dict[str, str | None]) -> None:
+        if self._group in changed:
+            self._set_current_preset(changed[self._group])
 
     def _get_preset_dev_prop(self, group: str, preset: str) -> list:
         """Return a list with (device, property) for the selected group preset."""
@@ -158,6 +142,8 @@ class PresetsWidget(QWidget):
     @Slot()
     def _refresh(self) -> None:
         """Refresh widget based on mmcore."""
+        # presets may have been changed with the core's signals blocked
+        self._tracker.invalidate(self._group)
         with signals_blocked(self._combo):
             self._combo.clear()
             if self._group not in self._mmc.getAvailableConfigGroups():
@@ -306,9 +292,8 @@ class PresetsWidget(QWidget):
         self._refresh()
 
     def _disconnect(self) -> None:
-        self._mmc.events.configSet.disconnect(self._on_cfg_set)
+        self._tracker.groupsChanged.disconnect(self._on_groups_changed)
         self._mmc.events.systemConfigurationLoaded.disconnect(self._refresh)
-        self._mmc.events.propertyChanged.disconnect(self._on_property_changed)
         self._mmc.events.configDeleted.disconnect(self._on_preset_deleted)
         self._mmc.events.configGroupDeleted.disconnect(self._on_group_deleted)
         self._mmc.events.configDefined.disconnect(self._on_new_group_preset)
@@ -2,32 +2,57 @@ from __future__ import annotations
 
 from collections.abc import Iterable
 from logging import getLogger
-from re import Pattern
 from typing import TYPE_CHECKING, cast
 
+import numpy as np
 from pymmcore_plus import CMMCorePlus, DeviceProperty, DeviceType
 from pymmcore_plus.model import Setting
-from qtpy.QtCore import Qt, Signal, Slot
-from qtpy.QtGui import QColor
-from qtpy.QtWidgets import QAbstractScrollArea, QTableWidget, QTableWidgetItem, QWidget
+from qtpy.QtCore import Qt, QTimer, Signal, Slot
+from qtpy.QtGui import QColor, QResizeEvent, QShowEvent
+from qtpy.QtWidgets import (
+    QAbstractScrollArea,
+    QApplication,
+    QTableWidget,
+    QTableWidgetItem,
+    QWidget,
+)
 from superqt.utils import signals_blocked
 
 from pymmcore_widgets._icons import StandardIcon
 
+from ._property_loader import PropertyValueLoader
 from ._property_widget import PropertyWidget
 
 if TYPE_CHECKING:
     from collections.abc import Callable, Iterable
+    from re import Pattern
 
 logger = getLogger(__name__)
 
 
+# above this many PropertyWidgets, the ones far out of view are deleted
+_MAX_LIVE_WIDGETS = 200
+
+
 class DevicePropertyTable(QTableWidget):
     """Table of all currently loaded device properties.
 
     This table is used by `PropertyBrowser` to display all properties in the system,
     and by the `GroupPresetTableWidget`.
 
+    Rows are cheap to build; the `PropertyWidget` of each row is only created once
+    the row is scrolled into view, or when it is requested with `cellWidget`. When
+    connected to the core, widgets of rows scrolled far out of view are deleted
+    again. Values of the rows scrolled into view are read in the background (see
+    `PropertyValueLoader`), and the widgets are disabled until they arrive.
+
+    Many properties (temperatures, readbacks, status) change without the core
+    emitting `propertyChanged`. `setWatchVisibleProperties` enables a mode that
+    periodically re-reads the rows in view, within a reads/second budget (shared by
+    all watching views of the core), and pauses while an acquisition is running.
+    The attributes used by `filterDevices` are captured once per rebuild, so that
+    filtering does not query the core.
+
     Parameters
     ----------
     parent : QWidget, optional
@@ -63,6 +88,41 @@ class DevicePropertyTable(QTableWidget):
         self._mmc = mmcore or CMMCorePlus.instance()
         self._mmc.events.systemConfigurationLoaded.connect(self._rebuild_table)
 
+        # rows whose PropertyWidget has been created (or failed to be created)
+        self._materialized: set[int] = set()
+        # coalesces requests to create the widgets of the visible rows
+        self._materialize_timer = QTimer(self)
+        self._materialize_timer.setSingleShot(True)
+        self._materialize_timer.setInterval(0)
+        self._materialize_timer.timeout.connect(self._materialize_visible_rows)
+        if sb := self.verticalScrollBar():
+            sb.valueChanged.connect(self._materialize_timer.start)
+
+        # values of materialized rows are read in the background.
+        # {(device, property): row} of widgets still waiting for their value
+        self._loading: dict[tuple[str, str], int] = {}
+        self._loader = PropertyValueLoader(self._mmc, self)
+        self._loader.valueLoaded.connect(self._on_value_loaded)
+        self._loader.loadFailed.connect(self._on_load_failed)
+
+        # opt-in periodic refresh of the rows in view, see setWatchVisibleProperties
+        # {(device, property): row} of the current watch round
+        self._watched: dict[tuple[str, str], int] = {}
+        self._watcher = PropertyValueLoader(self._mmc, self, max_rate=20)
+        self._watcher.valueLoaded.connect(self._on_value_watched)
+        self._watch_timer = QTimer(self)
+        self._watch_timer.setInterval(1000)
+        self._watch_timer.timeout.connect(self._watch_visible_rows)
+
+        # filter index: per-row attributes, captured in _rebuild_table_inner
+        self._dev_types = np.zeros(0, dtype=np.int32)
+        self._read_only = np.zeros(0, dtype=bool)
+        self._pre_init = np.zeros(0, dtype=bool)
+        self._names: list[str] = []
+        self._names_lower = np.zeros(0, dtype=str)
+        # mirror of the rows' hidden state, to only touch rows that change
+        self._hidden = np.zeros(0, dtype=bool)
+
         self.itemChanged.connect(self._on_item_changed)
         # If we enable these, then the edit group dialog will lose all of it's checks
         # whenever modify group button is clicked.  However, We don't want this widget
@@ -108,6 +168,8 @@ class DevicePropertyTable(QTableWidget):
         self.valueChanged.emit()
 
     def _disconnect(self) -> None:
+        self._loader.cancel()
+        self._watcher.cancel()
         self._mmc.events.systemConfigurationLoaded.disconnect(self._rebuild_table)
         # self._mmc.events.configGroupDeleted.disconnect(self._rebuild_table)
         # self._mmc.events.configDeleted.disconnect(self._rebuild_table)
@@ -151,53 +213,240 @@ class DevicePropertyTable(QTableWidget):
             self.blockSignals(False)
 
     def _rebuild_table_inner(self) -> None:
+        self._loader.cancel()
+        self._loading.clear()
+        self._watcher.cancel()
+        self._watched.clear()
         self.clearContents()
+        self._materialized.clear()
         props = list(self._mmc.iterProperties(as_object=True))
         self.setRowCount(len(props))
 
+        n = len(props)
+        self._dev_types = np.zeros(n, dtype=np.int32)
+        self._read_only = np.zeros(n, dtype=bool)
+        self._pre_init = np.zeros(n, dtype=bool)
+        self._names = []
         for i, prop in enumerate(props):
-            extra = " 🅿" if prop.isPreInit() else ""
+            dev_type = prop.deviceType()
+            self._dev_types[i] = dev_type.value
+            self._read_only[i] = read_only = prop.isReadOnly()
+            self._pre_init[i] = pre_init = prop.isPreInit()
+
+            extra = " 🅿" if pre_init else ""
             item = QTableWidgetItem(f"{prop.device}-{prop.name}{extra}")
             item.setData(self.PROP_ROLE, prop)
-            if icon := StandardIcon.for_device_type(prop.deviceType()):
+            if icon := StandardIcon.for_device_type(dev_type):
                 item.setIcon(icon.icon())
+            if read_only:
+                # TODO: make this more theme aware
+                item.setBackground(QColor("#AAA"))
             self.setItem(i, 0, item)
+            self._names.append(item.text())
+        self._names_lower = np.array([nm.lower() for nm in self._names], dtype=str)
+        # rows keep their hidden state across rebuilds
+        self._hidden = np.fromiter(
+            (self.isRowHidden(row) for row in range(n)), dtype=bool, count=n
+        )
+
+        self.resizeColumnToContents(0)
+        self.setRowsCheckable(self._rows_checkable)
+        self._materialize_timer.start()
+
+    def cellWidget(self, row: int, column: int) -> QWidget | None:
+        """Return the widget in the given cell, creating a PropertyWidget if needed."""
+        if column == 1:
+            self._ensure_property_widget(row)
+            self._finish_loading(row)
+        return super().cellWidget(row, column)
+
+    def _ensure_property_widget(self, row: int, *, load_value: bool = True) -> bool:
+        """Create the PropertyWidget of `row` if it hasn't been created yet.
 
-            try:
-                wdg = PropertyWidget(
-                    prop.device,
-                    prop.name,
-                    mmcore=self._mmc,
-                    connect_core=self._connect_core,
-                )
-                # TODO: this is an over-emission.  if this is a checkable table,
-                # and the property is not checked, we should not emit.
-                wdg.valueChanged.connect(self.valueChanged)
-            except Exception as e:
-                logger.error(
-                    f"Error creating widget for {prop.device}-{prop.name}: {e}"
-                )
+        If `load_value` is False, the value is not read from the core, and the row is
+        registered as loading. Returns True if a widget was created.
+        """
+        if row in self._materialized or not (item := self.item(row, 0)):
+            return False
+        self._materialized.add(row)
+        prop = cast("DeviceProperty", item.data(self.PROP_ROLE))
+        try:
+            wdg = PropertyWidget(
+                prop.device,
+                prop.name,
+                mmcore=self._mmc,
+                connect_core=self._connect_core,
+                load_value=load_value,
+            )
+            # TODO: this is an over-emission.  if this is a checkable table,
+            # and the property is not checked, we should not emit.
+            wdg.valueChanged.connect(self.valueChanged)
+        except Exception as e:
+            logger.error(f"Error creating widget for {prop.device}-{prop.name}: {e}")
+            return False
+
+        self.setCellWidget(row, 1, wdg)
+        if not self._prop_widgets_enabled:
+            wdg.setEnabled(False)
+        if self._read_only[row]:
+            wdg.setStyleSheet("QLabel { background-color : #AAA }")
+        if not load_value:
+            self._loading[(prop.device, prop.name)] = row
+        return True
+
+    def _finish_loading(self, row: int) -> None:
+        """Synchronously read the value of `row` if it is still loading."""
+        if (item := self.item(row, 0)) is None:
+            return
+        prop = cast("DeviceProperty", item.data(self.PROP_ROLE))
+        if self._loading.pop((prop.device, prop.name), None) is not None:
+            wdg = cast("PropertyWidget", super().cellWidget(row, 1))
+            wdg.refresh()
+            wdg.setLoadedValue(None)
+
+    @Slot(str, str, object, int)
+    def _on_value_loaded(
+        self, device: str, prop: str, value: object, generation: int
+    ) -> None:
+        # drop values read before the table was rebuilt
+        if generation != self._loader.generation():
+            return
+        if (row := self._loading.pop((device, prop), None)) is not None:
+            if wdg := cast("PropertyWidget | None", super().cellWidget(row, 1)):
+                wdg.setLoadedValue(value)
+
+    @Slot(str, str, str, int)
+    def _on_load_failed(
+        self, device: str, prop: str, _error: str, generation: int
+    ) -> None:
+        self._on_value_loaded(device, prop, None, generation)
+
+    @Slot()
+    def _materialize_visible_rows(self) -> None:
+        """Create the PropertyWidgets of all rows currently in the viewport."""
+        if not (rows := self._viewport_rows()):
+            return
+        created = [
+            row
+            for row in rows
+            if not self.isRowHidden(row)
+            and self._ensure_property_widget(row, load_value=False)
+        ]
+        self._loader.load(
+            (prop.device, prop.name)
+            for row in created
+            if (item := self.item(row, 0)) and (prop := item.data(self.PROP_ROLE))
+        )
+        self._evict_offscreen_rows(rows.start, rows.stop - 1)
+
+    def _evict_offscreen_rows(self, first: int, last: int) -> None:
+        """Delete the PropertyWidgets of rows scrolled far out of view.
+
+        This bounds the number of live widgets after scrolling through the whole
+        table. Only done when connected to the core: the widgets then just mirror
+        the core state, and are recreated on demand without losing anything.
+        """
+        if not self._connect_core or len(self._materialized) <= _MAX_LIVE_WIDGETS:
+            return
+        # keep a page of rows on each side of the viewport
+        margin = last - first + 1
+        for row in [
+            r for r in self._materialized if r < first - margin or r > last + margin
+        ]:
+            self._materialized.discard(row)
+            self.removeCellWidget(row, 1)
+
+    def _viewport_rows(self) -> range:
+        """Return the rows currently in the viewport (including hidden ones)."""
+        if not self.rowCount() or (vp := self.viewport()) is None:
+            return range(0)
+        if (first := self.rowAt(0)) < 0:
+            return range(0)
+        if (last := self.rowAt(vp.height() - 1)) < 0:
+            last = self.rowCount() - 1
+        return range(first, last + 1)
+
+    def setWatchVisibleProperties(
+        self,
+        watch: bool = True,
+        *,
+        interval: int = 1000,
+        max_rate: float | None = 20,
+    ) -> None:
+        """Set whether the values of the rows in view are refreshed periodically.
+
+        Parameters
+        ----------
+        watch : bool
+            Whether to periodically re-read the visible properties, by default True.
+        interval : int
+            Time between refreshes in milliseconds, by default 1000. A refresh is
+            skipped if the previous one hasn't finished yet.
+        max_rate : float | None
+            Maximum number of property reads per second (over all devices, and all
+            watching views of the core), so that watching never starves other users
+            of the devices. By default 20. None means unlimited.
+        """
+        self._watch_timer.setInterval(interval)
+        self._watcher.setMaxRate(max_rate)
+        if watch:
+            self._watch_timer.start()
+        else:
+            self._watch_timer.stop()
+            self._watcher.cancel()
+            self._watched.clear()
+
+    def isWatchingVisibleProperties(self) -> bool:
+        """Return True if the visible properties are refreshed periodically."""
+        return bool(self._watch_timer.isActive())
+
+    @Slot()
+    def _watch_visible_rows(self) -> None:
+        """Start re-reading the values of the rows in view."""
+        if (
+            not self.isVisible()
+            or self._watcher.isBusy()
+            # don't compete with an acquisition for device access
+            or self._mmc.mda.is_running()
+        ):
+            return
+        self._watched.clear()
+        for row in self._viewport_rows():
+            if row not in self._materialized or self.isRowHidden(row):
                 continue
+            item = cast("QTableWidgetItem", self.item(row, 0))
+            prop = cast("DeviceProperty", item.data(self.PROP_ROLE))
+            if (key := (prop.device, prop.name)) not in self._loading:
+                self._watched[key] = row
+        self._watcher.load(list(self._watched))
 
-            self.setCellWidget(i, 1, wdg)
-            if not self._prop_widgets_enabled:
-                wdg.setEnabled(False)
+    @Slot(str, str, object, int)
+    def _on_value_watched(
+        self, device: str, prop: str, value: object, generation: int
+    ) -> None:
+        if generation != self._watcher.generation():
+            return
+        if (row := self._watched.pop((device, prop), None)) is None:
+            return
+        wdg = cast("PropertyWidget | None", super().cellWidget(row, 1))
+        # don't overwrite a value the user is editing
+        focus = QApplication.focusWidget()
+        if wdg is not None and (focus is None or not wdg.isAncestorOf(focus)):
+            wdg.setLoadedValue(value)
 
-            if prop.isReadOnly():
-                # TODO: make this more theme aware
-                item.setBackground(QColor("#AAA"))
-                wdg.setStyleSheet("QLabel { background-color : #AAA }")
+    def showEvent(self, event: QShowEvent | None) -> None:
+        super().showEvent(event)
+        self._materialize_timer.start()
 
-        self.resizeColumnsToContents()
-        self.setRowsCheckable(self._rows_checkable)
-        # TODO: install eventFilter to prevent mouse wheel from scrolling sliders
+    def resizeEvent(self, event: QResizeEvent | None) -> None:
+        super().resizeEvent(event)
+        self._materialize_timer.start()
 
     def setReadOnlyDevicesVisible(self, visible: bool = True) -> None:
         """Set whether read-only devices are visible."""
-        for row in range(self.rowCount()):
-            prop = cast("DeviceProperty", self.item(row, 0).data(self.PROP_ROLE))
-            if prop.isReadOnly():
-                self.setRowHidden(row, not visible)
+        hidden = self._hidden.copy()
+        hidden[self._read_only] = not visible
+        self._set_hidden_rows(hidden)
 
     def filterDevices(
         self,
@@ -213,12 +462,12 @@ class DevicePropertyTable(QTableWidget):
         """Update the table to only show devices that match the given query/filter.
 
         Filters are applied in the following order:
-        1. If `include_devices` is provided, only devices of the specified types
+        1. If `always_show_checked` is True, rows that are checked will always be
+           shown, regardless of other filters.
+        2. If `include_devices` is provided, only devices of the specified types
            will be considered.
-        2. If `exclude_devices` is provided, devices of the specified types will be
+        3. If `exclude_devices` is provided, devices of the specified types will be
            hidden (even if they are in `include_devices`).
-        3. If `always_show_checked` is True, remaining rows that are checked will
-           always be shown, regardless of other filters.
         4. If `predicate` is provided and it returns False, the row is hidden.
         5. If `include_read_only` is False, read-only properties are hidden.
         6. If `include_pre_init` is False, pre-initialized properties are hidden.
@@ -244,41 +493,43 @@ class DevicePropertyTable(QTableWidget):
             True to include the row, False to exclude it, or None to skip filtering.
             If None, no additional filtering is applied, by default None
         """
-        exclude_devices = set(exclude_devices)
-        include_devices = set(include_devices)
-        for row in range(self.rowCount()):
-            if (item := self.item(row, 0)) is None:
-                continue
-
-            if always_show_checked and item.checkState() == Qt.CheckState.Checked:
-                self.showRow(row)
-                continue
-
-            prop = cast("DeviceProperty", item.data(self.PROP_ROLE))
-            dev_type = prop.deviceType()
-            if (include_devices and dev_type not in include_devices) or (
-                exclude_devices and dev_type in exclude_devices
-            ):
-                self.hideRow(row)
-                continue
-
-            if (
-                (predicate and predicate(prop) is False)
-                or (not include_read_only and prop.isReadOnly())
-                or (not include_pre_init and prop.isPreInit())
-            ):
-                self.hideRow(row)
-                continue
-
-            if query:
-                if isinstance(query, str) and query.lower() not in item.text().lower():
-                    self.hideRow(row)
-                    continue
-                elif isinstance(query, Pattern) and not query.search(item.text()):
-                    self.hideRow(row)
-                    continue
-
-            self.showRow(row)
+        show = np.ones(len(self._names), dtype=bool)
+        # check states are read from the items: they may be set with signals blocked
+        checked = np.zeros_like(show)
+        if always_show_checked:
+            for row in range(self.rowCount()):
+                if (item := self.item(row, 0)) is not None:
+                    checked[row] = item.checkState() == Qt.CheckState.Checked
+        show &= ~checked
+        if include_devices:
+            show &= np.isin(self._dev_types, [int(d) for d in include_devices])
+        if exclude_devices:
+            show &= ~np.isin(self._dev_types, [int(d) for d in exclude_devices])
+
+        if not include_read_only:
+            show &= ~self._read_only
+        if not include_pre_init:
+            show &= ~self._pre_init
+        if query:
+            if isinstance(query, str):
+                show &= np.char.find(self._names_lower, query.lower()) >= 0
+            else:
+                rows = np.flatnonzero(show)
+                show[rows] = [bool(query.search(self._names[r])) for r in rows]
+        if predicate is not None:
+            for row in np.flatnonzero(show).tolist():
+                item = cast("QTableWidgetItem", self.item(row, 0))
+                if predicate(item.data(self.PROP_ROLE)) is False:
+                    show[row] = False
+
+        self._set_hidden_rows(~(show | checked))
+
+    def _set_hidden_rows(self, hidden: np.ndarray) -> None:
+        """Hide rows where `hidden` is True, touching only rows that change."""
+        for row in np.flatnonzero(hidden != self._hidden):
+            self.setRowHidden(int(row), bool(hidden[row]))
+        self._hidden = hidden
+        self._materialize_timer.start()
 
     def getCheckedProperties(self, *, visible_only: bool = False) -> list[Setting]:
         """Return a list of checked properties.
@@ -329,8 +580,10 @@ class DevicePropertyTable(QTableWidget):
         """Set whether each widget is enabled."""
         before, self._prop_widgets_enabled = self._prop_widgets_enabled, enabled
         if before != enabled:
-            for row in range(self.rowCount()):
-                self.cellWidget(row, 1).setEnabled(enabled)
+            # rows without a widget yet will pick up the setting on creation
+            for row in self._materialized:
+                if wdg := super().cellWidget(row, 1):
+                    wdg.setEnabled(enabled)
 
     def uncheckAll(self) -> None:
         """Uncheck all rows."""
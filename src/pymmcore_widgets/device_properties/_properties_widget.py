@@ -1,16 +1,18 @@
 """Whereas PropertyWidget shows a single property, PropertiesWidget is a container.
 
-It shows a number of properties, filtered by a given set of tags.
+It shows a number of properties, filtered by a given set of tags. Property values
+are read in the background, so that slow devices do not block the GUI.
 """
 
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, cast
+from typing import TYPE_CHECKING, Any, cast
 
 from pymmcore_plus import CMMCorePlus
 from qtpy.QtCore import Slot
 from qtpy.QtWidgets import QGridLayout, QLabel, QWidget
 
+from ._property_loader import PropertyValueLoader
 from ._property_widget import PropertyWidget
 
 if TYPE_CHECKING:
@@ -75,6 +77,11 @@ class PropertiesWidget(QWidget):
         self._is_read_only = is_read_only
         self._is_sequenceable = is_sequenceable
 
+        self._prop_widgets: dict[tuple[str, str], PropertyWidget] = {}
+        self._loader = PropertyValueLoader(self._mmc, self)
+        self._loader.valueLoaded.connect(self._on_value_loaded)
+        self._loader.loadFailed.connect(self._on_load_failed)
+
         self.destroyed.connect(self._disconnect)
         self.rebuild()
 
@@ -82,6 +89,8 @@ class PropertiesWidget(QWidget):
     def rebuild(self) -> None:
         """Rebuild the layout, populating based on current filters."""
         # clear
+        self._loader.cancel()
+        self._prop_widgets.clear()
         while self.layout().count():
             self.layout().takeAt(0).widget().deleteLater()
 
@@ -100,8 +109,32 @@ class PropertiesWidget(QWidget):
         # create and add widgets
         layout = cast("QGridLayout", self.layout())
         for i, (dev, prop) in enumerate(properties):
+            wdg = PropertyWidget(dev, prop, mmcore=self._mmc, load_value=False)
+            self._prop_widgets[(dev, prop)] = wdg
             layout.addWidget(QLabel(f"{dev}::{prop}"), i, 0)
-            layout.addWidget(PropertyWidget(dev, prop, mmcore=self._mmc), i, 1)
+            layout.addWidget(wdg, i, 1)
+        self._loader.load(self._prop_widgets)
+
+    def cancelLoading(self) -> None:
+        """Stop reading the values of properties that haven't been loaded yet."""
+        self._loader.cancel()
+
+    @Slot(str, str, object, int)
+    def _on_value_loaded(
+        self, device: str, prop: str, value: Any, generation: int
+    ) -> None:
+        # drop values read before the last rebuild
+        if generation != self._loader.generation():
+            return
+        if wdg := self._prop_widgets.get((device, prop)):
+            wdg.setLoadedValue(value)
+
+    @Slot(str, str, str, int)
+    def _on_load_failed(
+        self, device: str, prop: str, _error: str, generation: int
+    ) -> None:
+        self._on_value_loaded(device, prop, None, generation)
 
     def _disconnect(self) -> None:
+        self._loader.cancel()
         self._mmc.events.systemConfigurationLoaded.disconnect(self.rebuild)
@@ -2,7 +2,16 @@ from __future__ import annotations
 
 from pymmcore_plus import CMMCorePlus
 from qtpy.QtCore import Slot
-from qtpy.QtWidgets import QDialog, QHBoxLayout, QLineEdit, QVBoxLayout, QWidget
+from qtpy.QtWidgets import (
+    QCheckBox,
+    QDialog,
+    QHBoxLayout,
+    QLineEdit,
+    QVBoxLayout,
+    QWidget,
+)
+
+from pymmcore_widgets._util import connect_debounced
 
 from ._device_property_table import DevicePropertyTable
 from ._device_type_filter import DeviceTypeFilters
@@ -35,7 +44,14 @@ class PropertyBrowser(QDialog):
         self._filter_text = QLineEdit()
         self._filter_text.setClearButtonEnabled(True)
         self._filter_text.setPlaceholderText("Filter by device or property name...")
-        self._filter_text.textChanged.connect(self._update_filter)
+        connect_debounced(self._filter_text.textChanged, self._update_filter, self)
+
+        self._watch_checkbox = QCheckBox("Auto-refresh values")
+        self._watch_checkbox.setToolTip(
+            "Periodically re-read the values of the properties in view, e.g. to\n"
+            "monitor read-only properties that don't report their changes."
+        )
+        self._watch_checkbox.toggled.connect(self._prop_table.setWatchVisibleProperties)
 
         right = QWidget()
         right.setLayout(QVBoxLayout())
@@ -43,8 +59,9 @@ class PropertyBrowser(QDialog):
         right.layout().addWidget(self._prop_table)
 
         left = QWidget()
-        left.setLayout(QVBoxLayout())
-        left.layout().addWidget(self._device_filters)
+        left_layout = QVBoxLayout(left)
+        left_layout.addWidget(self._device_filters)
+        left_layout.addWidget(self._watch_checkbox)
 
         self.setLayout(QHBoxLayout())
         self.layout().setContentsMargins(6, 12, 12, 12)
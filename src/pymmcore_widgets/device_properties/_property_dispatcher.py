@@ -0,0 +1,104 @@
+"""Per-core routing of `propertyChanged` events to single-property subscribers."""
+
+from __future__ import annotations
+
+import itertools
+import weakref
+from functools import partial
+from inspect import ismethod
+from typing import TYPE_CHECKING, Any, ClassVar
+
+from pymmcore_plus import CMMCorePlus
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from qtpy.QtCore import QObject
+
+    PropertyCallback = Callable[[str, str, Any], Any]
+
+
+class PropertyChangeDispatcher:
+    """Routes the `propertyChanged` events of one core to per-property subscribers.
+
+    Connecting every property widget directly to `mmcore.events.propertyChanged`
+    makes each event fan out to all of them, only for each to discard it after
+    comparing device and property names. The dispatcher connects to the core once,
+    and looks up the subscribers of the changed (device, property) in a dict.
+
+    Create using the `for_core` class method, which returns a cached instance for
+    the given core.
+    """
+
+    @classmethod
+    def for_core(cls, mmcore: CMMCorePlus | None = None) -> PropertyChangeDispatcher:
+        """Get the dispatcher for the given core (or the global instance)."""
+        mmcore = mmcore or CMMCorePlus.instance()
+        key = id(mmcore)
+        if key not in cls._CACHE:
+            cls._CACHE[key] = PropertyChangeDispatcher(mmcore)
+            weakref.finalize(mmcore, cls._CACHE.pop, key, None)
+        return cls._CACHE[key]
+
+    _CACHE: ClassVar[dict[int, PropertyChangeDispatcher]] = {}
+
+    def __init__(self, mmcore: CMMCorePlus) -> None:
+        self._subscribers: dict[
+            tuple[str, str], dict[int, Callable[[], PropertyCallback | None]]
+        ] = {}
+        self._tokens = itertools.count()
+        mmcore.events.propertyChanged.connect(self._on_property_changed)
+
+    def subscribe(
+        self,
+        device: str,
+        prop: str,
+        callback: PropertyCallback,
+        owner: QObject | None = None,
+    ) -> Callable[[], None]:
+        """Call `callback(device, prop, value)` whenever `device.prop` changes.
+
+        Bound methods are only weakly referenced. If `owner` is given, the
+        subscription is also removed when it is destroyed.
+
+        Returns
+        -------
+        Callable[[], None]
+            A function that removes the subscription.
+        """
+        ref: Callable[[], PropertyCallback | None]
+        if ismethod(callback):
+            ref = weakref.WeakMethod(callback)
+        else:
+            ref = partial(_identity, callback)
+        key = (device, prop)
+        token = next(self._tokens)
+        self._subscribers.setdefault(key, {})[token] = ref
+        unsubscribe = partial(self._unsubscribe, key, token)
+        if owner is not None:
+            owner.destroyed.connect(unsubscribe)
+        return unsubscribe
+
+    def subscriberCount(self, device: str, prop: str) -> int:
+        """Return the number of subscribers of `device.prop`."""
+        return len(self._subscribers.get((device, prop), ()))
+
+    def _unsubscribe(self, key: tuple[str, str], token: int, *_: Any) -> None:
+        if (subs := self._subscribers.get(key)) is not None:
+            subs.pop(token, None)
+            if not subs:
+                del self._subscribers[key]
+
+    def _on_property_changed(self, device: str, prop: str, value: Any) -> None:
+        if not (subs := self._subscribers.get((device, prop))):
+            return
+        # copy: callbacks may (un)subscribe
+        for token, ref in list(subs.items()):
+            if (callback := ref()) is None:
+                self._unsubscribe((device, prop), token)
+            else:
+                callback(device, prop, value)
+
+
+def _identity(obj: Any) -> Any:
+    return obj
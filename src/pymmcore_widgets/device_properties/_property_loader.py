@@ -0,0 +1,211 @@
+"""Asynchronous reading of property values."""
+
+from __future__ import annotations
+
+import threading
+import time
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import TYPE_CHECKING, ClassVar
+
+from pymmcore_plus import CMMCorePlus
+from qtpy.QtCore import QObject, Signal
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable
+
+
+class _CoreReader:
+    """The single background thread that reads property values from one core.
+
+    All loaders of a core share it, so that reads are serialized per core: device
+    adapters need not be thread-safe, and a serial port is never contended by
+    several threads. The rate budget of rate-limited reads is kept here too, so
+    that it is shared by all loaders of the core.
+
+    Python threads are used rather than a QThreadPool: destroying a QThreadPool
+    waits for its (Python) runnables while holding the GIL, which they need in
+    order to finish.
+    """
+
+    _INSTANCES: ClassVar[dict[int, _CoreReader]] = {}
+
+    @classmethod
+    def for_core(cls, mmcore: CMMCorePlus) -> _CoreReader:
+        """Get the reader of the given core."""
+        key = id(mmcore)
+        if key not in cls._INSTANCES:
+            cls._INSTANCES[key] = reader = _CoreReader()
+            weakref.finalize(mmcore, cls._close, key)
+            return reader
+        return cls._INSTANCES[key]
+
+    @classmethod
+    def _close(cls, key: int) -> None:
+        if (reader := cls._INSTANCES.pop(key, None)) is not None:
+            reader._executor.shutdown(wait=False, cancel_futures=True)
+
+    def __init__(self) -> None:
+        self._executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="PropertyValueLoader"
+        )
+        # time at which the next rate-limited read may start
+        self._next_budgeted_read = 0.0
+        self._budget_lock = threading.Lock()
+
+    def submit(self, fn: Callable[[], None], delay: float = 0) -> None:
+        """Run `fn` on the reader thread, after `delay` seconds."""
+        if delay > 0:
+            timer = threading.Timer(delay, self.submit, (fn,))
+            timer.daemon = True
+            timer.start()
+        else:
+            try:
+                self._executor.submit(fn)
+            except RuntimeError:  # the core was deleted in the meantime
+                pass
+
+    def reserve_read(self, min_interval: float) -> float:
+        """Reserve a slot for a rate-limited read, return the delay until it."""
+        with self._budget_lock:
+            now = time.perf_counter()
+            start = max(now, self._next_budgeted_read)
+            self._next_budgeted_read = start + min_interval
+        return start - now
+
+
+class PropertyValueLoader(QObject):
+    """Reads property values from the core in the background.
+
+    On rigs with serial-attached controllers, each `getProperty` call can take tens
+    of milliseconds, so reading hundreds of values on the GUI thread freezes it for
+    seconds. This loader reads them in the background and emits `valueLoaded` as
+    the values arrive.
+
+    Reads are serialized per core: all loaders of a core share a single background
+    thread, and each call to `load` reads its properties in order. An optional rate
+    budget limits the number of reads per second of all rate-limited loaders of a
+    core, so that background reads never monopolize device access. A rate-limited
+    load does not hold up the reader thread while waiting for its budget.
+
+    Parameters
+    ----------
+    mmcore : CMMCorePlus | None
+        Core to read from, by default the global instance.
+    parent : QObject | None
+        Optional parent object.
+    max_rate : float | None
+        Maximum number of reads per second (shared by all rate-limited loaders of
+        the core). By default None (unlimited).
+
+    Attributes
+    ----------
+    valueLoaded : Signal
+        Emitted with (device, property, value, generation) for each property that
+        was read. Results are delivered to the receiver's thread asynchronously, so
+        receivers should drop those whose generation is not the current
+        `generation()` (i.e. that were read before the last `cancel`).
+    loadFailed : Signal
+        Emitted with (device, property, error message, generation) if a read failed.
+    """
+
+    valueLoaded = Signal(str, str, object, int)
+    loadFailed = Signal(str, str, str, int)
+
+    def __init__(
+        self,
+        mmcore: CMMCorePlus | None = None,
+        parent: QObject | None = None,
+        *,
+        max_rate: float | None = None,
+    ) -> None:
+        super().__init__(parent)
+        mmcore = mmcore or CMMCorePlus.instance()
+        self._reader = _CoreReader.for_core(mmcore)
+        # queued reads must not keep the core alive: if the reader thread dropped
+        # the last reference, the core would be destroyed outside the main thread.
+        self._mmc = weakref.ref(mmcore)
+        # reads of older generations are cancelled, the lock makes sure that
+        # nothing is emitted anymore once `cancel` returns.
+        self._generation = 0
+        self._lock = threading.Lock()
+        self._pending_loads = 0
+        self._min_interval = 1 / max_rate if max_rate else 0.0
+
+    def generation(self) -> int:
+        """Return the current generation, incremented by each `cancel`."""
+        return self._generation
+
+    def load(self, properties: Iterable[tuple[str, str]]) -> None:
+        """Start reading the values of the given (device, property) pairs."""
+        if props := list(properties):
+            with self._lock:
+                self._pending_loads += 1
+            self._reader.submit(partial(self._read, self._generation, props))
+
+    def isBusy(self) -> bool:
+        """Return True if reads are queued or in progress."""
+        return self._pending_loads > 0
+
+    def setMaxRate(self, max_rate: float | None) -> None:
+        """Set the maximum number of reads per second (None for unlimited)."""
+        self._min_interval = 1 / max_rate if max_rate else 0.0
+
+    def cancel(self) -> None:
+        """Drop all pending reads.
+
+        A read that is in progress finishes in the background, but its result is
+        discarded.
+        """
+        with self._lock:
+            self._generation += 1
+
+    def _read(self, generation: int, props: list[tuple[str, str]]) -> None:
+        """Read `props` in order (on the reader thread)."""
+        for i, (device, prop) in enumerate(props):
+            if generation != self._generation:
+                break
+            if self._min_interval and (
+                delay := self._reader.reserve_read(self._min_interval)
+            ):
+                # let other loads use the reader thread while waiting
+                self._reader.submit(
+                    partial(self._read_budgeted, generation, props[i:]), delay
+                )
+                return
+            if not self._read_one(generation, device, prop):
+                break
+        self._load_done()
+
+    def _read_budgeted(self, generation: int, props: list[tuple[str, str]]) -> None:
+        """Read the first of `props` (its budget is reserved), then the others."""
+        device, prop = props[0]
+        if generation == self._generation and self._read_one(generation, device, prop):
+            self._read(generation, props[1:])
+        else:
+            self._load_done()
+
+    def _read_one(self, generation: int, device: str, prop: str) -> bool:
+        if (mmcore := self._mmc()) is None:
+            return False
+        try:
+            value: object = mmcore.getProperty(device, prop)
+        except Exception as e:
+            value = e
+        return self._emit(generation, device, prop, value)
+
+    def _load_done(self) -> None:
+        with self._lock:
+            self._pending_loads = max(self._pending_loads - 1, 0)
+
+    def _emit(self, generation: int, device: str, prop: str, value: object) -> bool:
+        """Emit the result of a read, return False if the read was cancelled."""
+        with self._lock:
+            if generation != self._generation:
+                return False
+            if isinstance(value, Exception):
+                self.loadFailed.emit(device, prop, str(value), generation)
+            else:
+                self.valueLoaded.emit(device, prop, value, generation)
+            return True
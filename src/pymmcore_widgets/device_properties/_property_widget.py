@@ -31,6 +31,10 @@ from qtpy.QtWidgets import (
     QWidget,
 )
 
+from pymmcore_widgets._models._core_metadata import CoreMetadataCache
+
+from ._property_dispatcher import PropertyChangeDispatcher
+
 if TYPE_CHECKING:
     from collections.abc import Iterator
 
@@ -350,11 +354,13 @@ class ReadOnlyLabel(QLabel):
 
 def _get_allowed_values(mmc: CMMCorePlus, device: str, prop: str) -> tuple[str, ...]:
     """Get allowed values for a property, handling state devices specially."""
-    if allowed := mmc.getAllowedPropertyValues(device, prop):
+    cache = CoreMetadataCache.for_core(mmc)
+    allowed: tuple[str, ...] = cache.property_info(device, prop)["allowed_values"]
+    if allowed:
         return allowed
 
     # Special handling for state device Label/State properties
-    if mmc.getDeviceType(device) == DeviceType.StateDevice:
+    if cache.device_info(device)["type"] == DeviceType.StateDevice:
         if prop == LABEL:
             with contextlib.suppress(RuntimeError):
                 return mmc.getStateLabels(device)
@@ -421,11 +427,12 @@ def create_inner_property_widget(
     QWidget
         A widget appropriate for the property type.
     """
+    info = CoreMetadataCache.for_core(mmc).property_info(device, prop)
     # Read-only: just a label
-    if mmc.isPropertyReadOnly(device, prop):
+    if info["is_read_only"]:
         return cast("PPropValueWidget", ReadOnlyLabel())
 
-    ptype = mmc.getPropertyType(device, prop)
+    ptype = info["property_type"]
     allowed = _get_allowed_values(mmc, device, prop)
 
     # Boolean: checkbox for Integer with allowed = {'0', '1'}
@@ -439,10 +446,9 @@ def create_inner_property_widget(
         return cast("PPropValueWidget", wdg)
 
     # Numeric with limits: slider + spinbox
-    has_limits = mmc.hasPropertyLimits(device, prop)
-    if ptype in (PropertyType.Integer, PropertyType.Float) and has_limits:
-        lower = mmc.getPropertyLowerLimit(device, prop)
-        upper = mmc.getPropertyUpperLimit(device, prop)
+    limits = info["limits"]
+    if ptype in (PropertyType.Integer, PropertyType.Float) and limits is not None:
+        lower, upper = limits
         is_float = ptype is PropertyType.Float
         wdg = LabeledSlider(is_float=is_float)
         wdg.setRange(lower, upper)
@@ -478,6 +484,11 @@ class PropertyWidget(QWidget):
         Optional core instance. If not provided, uses the global instance.
     connect_core : bool
         If True, widget changes update the core and vice versa.
+    load_value : bool
+        If True (default), the current value is read from the core on creation.
+        If False, the value widget is shown disabled until the value is provided
+        with `setLoadedValue` (e.g. by a `PropertyValueLoader`, which reads values
+        in the background).
     """
 
     valueChanged = Signal(object)
@@ -490,6 +501,7 @@ class PropertyWidget(QWidget):
         parent: QWidget | None = None,
         mmcore: CMMCorePlus | None = None,
         connect_core: bool = True,
+        load_value: bool = True,
     ) -> None:
         super().__init__(parent)
 
@@ -514,10 +526,16 @@ class PropertyWidget(QWidget):
         )
 
         # Set initial value
-        self._try_update_from_core()
+        if load_value:
+            self._try_update_from_core()
+        else:
+            self._value_widget.setEnabled(False)
+            self._value_widget.setToolTip("Loading...")
 
         self._value_widget.valueChanged.connect(self._on_widget_changed)
-        self._mmc.events.propertyChanged.connect(self._on_core_changed)
+        PropertyChangeDispatcher.for_core(self._mmc).subscribe(
+            device_label, prop_name, self._on_core_changed, owner=self
+        )
         self._mmc.events.systemConfigurationLoaded.connect(self._on_config_loaded)
 
         # Create layout
@@ -535,6 +553,23 @@ class PropertyWidget(QWidget):
         """Set the widget value."""
         self._value_widget.setValue(value)
 
+    def setLoadedValue(self, value: Any = None) -> None:
+        """Set a value read from the core, without setting it back on the core.
+
+        Also ends the loading state of a widget created with `load_value=False`.
+        If `value` is None (e.g. if reading it failed), only the state is reset.
+        """
+        self._value_widget.setEnabled(True)
+        self._value_widget.setToolTip("")
+        if value is not None:
+            self._value_widget.blockSignals(True)
+            try:
+                self._value_widget.setValue(value)
+            finally:
+                self._value_widget.blockSignals(False)
+        if self._is_pre_init_and_initialized():
+            self.setEnabled(False)
+
     @property
     def inner_widget(self) -> QWidget:
         """Return the inner value widget (spinbox, slider, combobox, etc)."""
@@ -554,19 +589,20 @@ class PropertyWidget(QWidget):
 
     def propertyType(self) -> PropertyType:
         """Return the property type."""
-        return self._mmc.getPropertyType(self._device, self._prop)
+        return cast("PropertyType", self._info()["property_type"])
 
     def deviceType(self) -> DeviceType:
         """Return the device type."""
-        return self._mmc.getDeviceType(self._device)
+        info = CoreMetadataCache.for_core(self._mmc).device_info(self._device)
+        return cast("DeviceType", info["type"])
 
     def isReadOnly(self) -> bool:
         """Return True if the property is read-only."""
-        return self._mmc.isPropertyReadOnly(self._device, self._prop)
+        return bool(self._info()["is_read_only"])
 
     def isPreInit(self) -> bool:
         """Return True if the property is pre-initialization."""
-        return self._mmc.isPropertyPreInit(self._device, self._prop)
+        return bool(self._info()["is_pre_init"])
 
     def allowedValues(self) -> tuple[str, ...]:
         """Return allowed values if property has constraints."""
@@ -574,6 +610,11 @@ class PropertyWidget(QWidget):
 
     # Private methods ----------------------------------------------------
 
+    def _info(self) -> dict[str, Any]:
+        """Return the (cached) metadata of the property."""
+        cache = CoreMetadataCache.for_core(self._mmc)
+        return cache.property_info(self._device, self._prop)
+
     def _is_pre_init_and_initialized(self) -> bool:
         """Check if property is pre-init and device is initialized."""
         with contextlib.suppress(RuntimeError):
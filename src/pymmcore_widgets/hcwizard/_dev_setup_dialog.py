@@ -101,6 +101,8 @@ from qtpy.QtWidgets import (
 )
 from superqt.utils import exceptions_as_dialog
 
+from pymmcore_widgets._models._core_metadata import CoreMetadataCache
+
 from ._simple_prop_table import PropTable
 
 if TYPE_CHECKING:
@@ -163,6 +165,7 @@ class DeviceSetupDialog(QDialog):
             )
 
         core.loadDevice(device_label, library_name, device_name)
+        CoreMetadataCache.for_core(core).invalidate(device_label)
         return cls(
             core,
             device_label,
@@ -282,6 +285,9 @@ class DeviceSetupDialog(QDialog):
             with suppress(RuntimeError):
                 self._core.unloadDevice(old_name)
             self._core.loadDevice(new_name, self._library_name, self._device_name)
+            cache = CoreMetadataCache.for_core(self._core)
+            cache.invalidate(old_name)
+            cache.invalidate(new_name)
             self._device_label = new_name
 
     def deviceLabel(self) -> str:
@@ -302,6 +308,7 @@ class DeviceSetupDialog(QDialog):
         with suppress(RuntimeError):
             self._core.unloadDevice(self._device_label)
         self._core.loadDevice(self._device_label, self._library_name, self._device_name)
+        CoreMetadataCache.for_core(self._core).invalidate(self._device_label)
 
     def _initialize_device(self) -> bool:
         with exceptions_as_dialog(
@@ -320,6 +327,8 @@ class DeviceSetupDialog(QDialog):
         for prop_name, prop_value in self.prop_table.iterRows():
             self._core.setProperty(self._device_label, prop_name, prop_value)
         self._core.initializeDevice(self._device_label)
+        # initialization may add properties, or change their allowed values
+        CoreMetadataCache.for_core(self._core).invalidate(self._device_label)
         return True
 
     def _initialize_port(self) -> None:
@@ -331,6 +340,7 @@ class DeviceSetupDialog(QDialog):
             self._core.setProperty(port_dev_label, prop_name, prop_value)
 
         self._core.initializeDevice(port_dev_label)
+        CoreMetadataCache.for_core(self._core).invalidate(port_dev_label)
 
     def _show_help(self) -> None:  # pragma: no cover
         from webbrowser import open
@@ -343,6 +353,7 @@ class DeviceSetupDialog(QDialog):
         if not self._existing_device:
             with suppress(RuntimeError):
                 self._core.unloadDevice(self._device_label)
+            CoreMetadataCache.for_core(self._core).invalidate(self._device_label)
         super().reject()
 
 
@@ -364,6 +375,7 @@ class ComTable(PropTable):
             if not port_library_name:
                 return
             self._core.loadDevice(port_dev_name, port_library_name, port_dev_name)
+            CoreMetadataCache.for_core(self._core).invalidate(port_dev_name)
         prop_names = self._core.getDevicePropertyNames(port_dev_name)
         return super().rebuild([(port_dev_name, p) for p in prop_names])
 
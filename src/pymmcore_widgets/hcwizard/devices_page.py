@@ -26,6 +26,7 @@ from superqt.iconify import QIconifyIcon
 from superqt.utils import exceptions_as_dialog, signals_blocked
 
 from pymmcore_widgets._icons import StandardIcon
+from pymmcore_widgets._models._core_metadata import CoreMetadataCache
 
 from ._base_page import ConfigWizardPage
 from ._dev_setup_dialog import DeviceSetupDialog
@@ -192,6 +193,7 @@ class _CurrentDevicesWidget(QWidget):
             self._model.devices.remove(dev)
             with suppress(RuntimeError):
                 self._core.unloadDevice(dev.name)
+            CoreMetadataCache.for_core(self._core).invalidate(dev.name)
 
         self.rebuild_table()
 
@@ -14,6 +14,8 @@ from qtpy.QtWidgets import (
     QWidget,
 )
 
+from pymmcore_widgets._models._core_metadata import CoreMetadataCache
+
 from ._base_page import ConfigWizardPage
 
 logger = logging.getLogger(__name__)
@@ -85,6 +87,7 @@ class IntroPage(ConfigWizardPage):
             self._core.unloadAllDevices()
         except Exception as e:
             logger.exception(e)
+        CoreMetadataCache.for_core(self._core).invalidate()
 
         self.file_edit.setText(self._model.config_file)
         super().cleanupPage()
@@ -97,6 +100,7 @@ class IntroPage(ConfigWizardPage):
                 self._core.unloadAllDevices()
             except Exception as e:
                 logger.exception(e)
+            CoreMetadataCache.for_core(self._core).invalidate()
         else:
             self._model.load_config(self.file_edit.text())
         self._model.mark_clean()
@@ -2,10 +2,11 @@ from __future__ import annotations
 
 from contextlib import suppress
 from pathlib import Path
-from typing import TYPE_CHECKING, cast
+from typing import TYPE_CHECKING, Any, cast
 
 from pymmcore_plus import CMMCorePlus, Keyword
-from qtpy.QtCore import QSize, Qt, Slot
+from pymmcore_plus._logger import logger
+from qtpy.QtCore import QSize, Qt, Signal, Slot
 from qtpy.QtWidgets import (
     QBoxLayout,
     QHBoxLayout,
@@ -14,8 +15,10 @@ from qtpy.QtWidgets import (
     QWidget,
 )
 from superqt.iconify import QIconifyIcon
+from superqt.utils import create_worker
 from useq import MDASequence, Position
 
+from pymmcore_widgets._humanize import humanize_time
 from pymmcore_widgets._util import get_next_available_path
 from pymmcore_widgets.useq_widgets import MDASequenceWidget
 from pymmcore_widgets.useq_widgets._mda_sequence import (
@@ -30,9 +33,18 @@ from pymmcore_widgets.useq_widgets._z import Mode
 
 from ._core_channels import CoreConnectedChannelTable
 from ._core_grid import CoreConnectedGridPlanWidget
-from ._core_positions import AF_UNAVAILABLE, CoreConnectedPositionTable
+from ._core_positions import (
+    AF_UNAVAILABLE,
+    CoreConnectedPositionTable,
+    CoreConnectedVirtualPositionTable,
+)
 from ._core_z import CoreConnectedZPlanWidget
+from ._preflight import AcquisitionBudget, analyze_budget, image_bytes
 from ._save_widget import SaveGroupBox
+from ._sequencing import EVENT_OVERHEAD, SequencingReport, analyze_sequencing
+from ._throughput import ThroughputDashboard
+from ._timing import RunPlan, TimingProfile, TimingRecorder, plan_run, simulate
+from ._writers import create_writer
 
 if TYPE_CHECKING:
     from collections.abc import Sequence
@@ -57,16 +69,38 @@ class _CoreConnectedPositionTable(CoreConnectedPositionTable):
         ev.propertyChanged.disconnect(self._on_property_changed)
 
 
+class _CoreConnectedVirtualPositionTable(CoreConnectedVirtualPositionTable):
+    def __init__(
+        self,
+        rows: int = 0,
+        mmcore: CMMCorePlus | None = None,
+        parent: QWidget | None = None,
+    ):
+        super().__init__(rows, mmcore, parent)
+
+        # the MDAWidget handles these events (see _CoreConnectedPositionTable)
+        ev = self._mmc.events
+        ev.systemConfigurationLoaded.disconnect(self._on_sys_config_loaded)
+        ev.propertyChanged.disconnect(self._on_property_changed)
+
+
 class CoreMDATabs(MDATabs):
     def __init__(
-        self, parent: QWidget | None = None, core: CMMCorePlus | None = None
+        self,
+        parent: QWidget | None = None,
+        core: CMMCorePlus | None = None,
+        *,
+        virtual_positions: bool = False,
     ) -> None:
         self._mmc = core or CMMCorePlus.instance()
-        super().__init__(parent)
+        super().__init__(parent, virtual_positions=virtual_positions)
 
     def create_subwidgets(self) -> None:
         self.time_plan = TimePlanWidget(1)
-        self.stage_positions = _CoreConnectedPositionTable(1, self._mmc)
+        if self._virtual_positions:
+            self.stage_positions = _CoreConnectedVirtualPositionTable(1, self._mmc)
+        else:
+            self.stage_positions = _CoreConnectedPositionTable(1, self._mmc)
         self.z_plan = CoreConnectedZPlanWidget(self._mmc)
         self.grid_plan = CoreConnectedGridPlanWidget(self._mmc)
         self.channels = CoreConnectedChannelTable(1, self._mmc)
@@ -104,19 +138,53 @@ class MDAWidget(MDASequenceWidget):
         By default, None. If not specified, the widget will use the active
         (or create a new)
         [`CMMCorePlus.instance`][pymmcore_plus.core._mmcore_plus.CMMCorePlus.instance].
+    virtual_positions : bool
+        If True, positions are edited in a model-backed table suited to very long
+        position lists (e.g. all the positions of a well plate), see
+        [VirtualPositionTable](../VirtualPositionTable#). By default False.
+
+    Attributes
+    ----------
+    preflight_check : bool
+        If True (default), `run_mda` first checks on a worker thread whether the
+        acquisition fits on the disk, in memory and within the write throughput of
+        the save location (see `analyze_budget`), and asks for confirmation if not.
     """
 
+    # emitted (from a worker thread) with the result of the pre-flight check and the
+    # plan of the run
+    _preflightDone = Signal(object, object)
+    # emitted (from a worker thread) with the result of the sequencing analysis
+    _sequencingDone = Signal(object)
+    # emitted (from a worker thread) with (generation, calibrated duration)
+    _calibrated = Signal(int, float)
+
     def __init__(
-        self, *, parent: QWidget | None = None, mmcore: CMMCorePlus | None = None
+        self,
+        *,
+        parent: QWidget | None = None,
+        mmcore: CMMCorePlus | None = None,
+        virtual_positions: bool = False,
     ) -> None:
         # create a couple core-connected variants of the tab widgets
         self._mmc = mmcore or CMMCorePlus.instance()
 
-        super().__init__(parent=parent, tab_widget=CoreMDATabs(None, self._mmc))
+        tabs = CoreMDATabs(None, self._mmc, virtual_positions=virtual_positions)
+        super().__init__(parent=parent, tab_widget=tabs)
+
+        self.preflight_check = True
+        # sequence and output of the MDA waiting for the pre-flight check
+        self._pending_run: tuple[MDASequence, str | Path | None] | None = None
+        # measures the events of every run, for calibrated estimates and the ETA
+        self._timing = TimingRecorder(self._mmc, self)
+        self._calibration_generation = 0
 
         self.save_info = SaveGroupBox(parent=self)
         self.save_info.valueChanged.connect(self.valueChanged)
         self.control_btns = _MDAControlButtons(self._mmc, self)
+        # live metrics of the running acquisition, shown with the dashboard button
+        self.throughput = ThroughputDashboard(self._mmc, self)
+        self.throughput.hide()
 
         # -------- initialize -----------
 
@@ -126,6 +194,7 @@ class MDAWidget(MDASequenceWidget):
 
         layout = cast("QBoxLayout", self.layout())
         layout.insertWidget(0, self.save_info)
+        layout.addWidget(self.throughput)
         layout.addWidget(self.control_btns)
 
         # ------------ connect signals ------------
@@ -133,10 +202,17 @@ class MDAWidget(MDASequenceWidget):
         self.control_btns.run_btn.clicked.connect(self.run_mda)
         self.control_btns.pause_btn.released.connect(self._mmc.mda.toggle_pause)
         self.control_btns.cancel_btn.released.connect(self._mmc.mda.cancel)
+        self.control_btns.sequencing_btn.clicked.connect(self._show_sequencing_report)
+        self.control_btns.dashboard_btn.toggled.connect(self.throughput.setVisible)
         self._mmc.mda.events.sequenceStarted.connect(self._on_mda_started)
         self._mmc.mda.events.sequenceFinished.connect(self._on_mda_finished)
         self._mmc.events.systemConfigurationLoaded.connect(self._on_sys_config_loaded)
         self._mmc.events.propertyChanged.connect(self._on_property_changed)
+        self._preflightDone.connect(self._on_preflight_done)
+        self._sequencingDone.connect(self._on_sequencing_done)
+        self._calibrated.connect(self._on_calibrated)
+        self._timing.etaChanged.connect(self._on_eta_changed)
+        self._timing.planned.connect(self.throughput.setPlan)
 
         self.destroyed.connect(self._disconnect)
 
@@ -151,8 +227,13 @@ class MDAWidget(MDASequenceWidget):
         return cast("CoreConnectedZPlanWidget", self.tab_wdg.z_plan)
 
     @property
-    def stage_positions(self) -> CoreConnectedPositionTable:
-        return cast("CoreConnectedPositionTable", self.tab_wdg.stage_positions)
+    def stage_positions(
+        self,
+    ) -> CoreConnectedPositionTable | CoreConnectedVirtualPositionTable:
+        return cast(
+            "CoreConnectedPositionTable | CoreConnectedVirtualPositionTable",
+            self.tab_wdg.stage_positions,
+        )
 
     @property
     def grid_plan(self) -> CoreConnectedGridPlanWidget:
@@ -279,20 +360,197 @@ class MDAWidget(MDASequenceWidget):
             | Sequence[Path | str | SupportsFrameReady]
             | None
         ),
+        sequence: MDASequence | None = None,
     ) -> None:
-        """Execute the MDA experiment corresponding to the current value."""
-        sequence = self.value()
+        """Execute `sequence` (by default the current value) as an MDA experiment.
+
+        If `output` is a path, it is written with the writer options of `save_info`.
+        """
+        if sequence is None:
+            sequence = self.value()
+        if isinstance(output, (str, Path)) and self.save_info.isChecked():
+            info = self.save_info.value()
+            shape = (self._mmc.getImageHeight(), self._mmc.getImageWidth())
+            output = create_writer(
+                output, info["format"], info.get("writer_options"), shape
+            )
         # run the MDA experiment asynchronously
         self._mmc.run_mda(sequence, output=output)
 
+    def analyze_budget(
+        self, save_path: str | Path | None = None, probe_bytes: int = 0
+    ) -> AcquisitionBudget:
+        """Return the storage and memory needed to run the current sequence.
+
+        Parameters
+        ----------
+        save_path : str | Path | None
+            Where the acquisition would be saved, if anywhere.
+        probe_bytes : int
+            Size of the file written to `save_path` to measure its write throughput,
+            by default 0 (no measurement).
+        """
+        return analyze_budget(
+            self.value(), image_bytes(self._mmc), save_path, probe_bytes=probe_bytes
+        )
+
+    @property
+    def timing_profile(self) -> TimingProfile:
+        """Per-event timings measured during the runs with this configuration."""
+        return self._timing.profile
+
+    def calibrated_duration(self) -> float:
+        """Return the duration (s) of the current sequence, using `timing_profile`.
+
+        Unlike `MDASequence.estimate_duration`, this accounts for the overhead of
+        each event, stage moves, channel switches and autofocus, as measured during
+        previous runs. Without measurements, only exposures and intervals count.
+        """
+        finish, _ = simulate(
+            self.value(), self.timing_profile.rates(), self._mmc.getExposure()
+        )
+        return float(finish[-1]) if len(finish) else 0
+
+    def analyze_sequencing(self, overhead: float = EVENT_OVERHEAD) -> SequencingReport:
+        """Return which parts of the current sequence can be hardware-sequenced.
+
+        The report lists the axes whose changes can run as hardware-triggered
+        sequences on the loaded devices (based on the sequenceability and
+        `sequence_max_length` of their properties, stages and camera), where and why
+        sequences break, and the estimated frame rate gain.
+
+        Parameters
+        ----------
+        overhead : float
+            Time in seconds spent on each software-triggered event (and at the start
+            of each hardware sequence) on top of the exposure, by default 25 ms.
+        """
+        return analyze_sequencing(self._mmc, self.value(), overhead=overhead)
+
     def run_mda(self) -> None:
         save_path = self.prepare_mda()
         if isinstance(save_path, bool):
             return
-        self.execute_mda(save_path)
+        if not self.preflight_check:
+            self.execute_mda(save_path)
+            return
+
+        # analyze the sequence on a worker thread, then run it in _on_preflight_done
+        # (the checked sequence is run, even if the widget is edited in the meantime)
+        seq = self.value()
+        self._pending_run = (seq, save_path)
+        self.control_btns.run_btn.setEnabled(False)
+        frame = image_bytes(self._mmc)
+        rates = self.timing_profile.rates()
+        exposure = self._mmc.getExposure()
+        args = (seq, frame, save_path, rates, exposure)
+        create_worker(self._preflight, *args, _start_thread=True)
 
     # ------------------- private Methods ----------------------
 
+    def _preflight(
+        self,
+        sequence: MDASequence,
+        frame: int,
+        save_path: str | Path | None,
+        rates: dict[str, float],
+        exposure: float,
+    ) -> None:
+        # the sequence is only iterated once: its plan is used for the budget, and
+        # then by the timing recorder and the dashboard during the run
+        plan: RunPlan | None = None
+        try:
+            plan = plan_run(sequence, rates, exposure)
+            result: AcquisitionBudget | Exception = analyze_budget(
+                sequence, frame, save_path, n_frames=plan.n_events
+            )
+        except Exception as e:  # pragma: no cover
+            result = e
+        with suppress(RuntimeError):  # the widget was deleted in the meantime
+            self._preflightDone.emit(result, plan)
+
+    def _on_preflight_done(
+        self, budget: AcquisitionBudget | Exception, plan: RunPlan | None
+    ) -> None:
+        self.control_btns.run_btn.setEnabled(True)
+        pending, self._pending_run = self._pending_run, None
+        if pending is None:  # pragma: no cover
+            return
+        sequence, output = pending
+        if isinstance(budget, Exception):  # pragma: no cover
+            # don't prevent the acquisition if the check itself failed
+            logger.warning("Pre-flight check of the MDA failed: %s", budget)
+        elif (problems := budget.problems()) and not self._confirm_budget(problems):
+            return
+        if plan is not None:
+            self._timing.setPlan(plan)
+        self.execute_mda(output, sequence)
+
+    def _show_sequencing_report(self) -> None:
+        # iterating the events of a long sequence takes a while: use a worker thread
+        self.control_btns.sequencing_btn.setEnabled(False)
+        create_worker(self._analyze_sequencing, self.value(), _start_thread=True)
+
+    def _analyze_sequencing(self, sequence: MDASequence) -> None:
+        try:
+            result: SequencingReport | Exception = analyze_sequencing(
+                self._mmc, sequence
+            )
+        except Exception as e:  # pragma: no cover
+            result = e
+        with suppress(RuntimeError):  # the widget was deleted in the meantime
+            self._sequencingDone.emit(result)
+
+    def _on_sequencing_done(self, report: SequencingReport | Exception) -> None:
+        self.control_btns.sequencing_btn.setEnabled(True)
+        if isinstance(report, Exception):  # pragma: no cover
+            logger.warning("Sequencing analysis of the MDA failed: %s", report)
+            return
+        QMessageBox.information(self, "Hardware Sequencing", report.summary())
+
+    def _confirm_budget(self, problems: list[str]) -> bool:
+        msg = "\n\n".join([*problems, "Run anyway?"])
+        response = QMessageBox.warning(
+            self,
+            "Confirm Acquisition",
+            msg,
+            QMessageBox.StandardButton.Ok | QMessageBox.StandardButton.Cancel,
+            QMessageBox.StandardButton.Cancel,
+        )
+        return bool(response == QMessageBox.StandardButton.Ok)
+
+    def _on_time_estimated(self, estimate: Any) -> None:
+        super()._on_time_estimated(estimate)
+        # then compute the calibrated estimate off-thread, if we have measurements
+        self._calibration_generation += 1
+        if len(self.timing_profile) and not isinstance(estimate, Exception):
+            args = (self.value(), self.timing_profile.rates(), self._mmc.getExposure())
+            gen = self._calibration_generation
+            create_worker(self._calibrate, gen, *args, _start_thread=True)
+
+    def _calibrate(
+        self, generation: int, seq: MDASequence, rates: dict, exposure: float
+    ) -> None:
+        with suppress(Exception):  # the widget may have been deleted
+            finish, _ = simulate(seq, rates, exposure)
+            self._calibrated.emit(generation, float(finish[-1]) if len(finish) else 0)
+
+    def _on_calibrated(self, generation: int, duration: float) -> None:
+        if generation != self._calibration_generation or self._mmc.mda.is_running():
+            return
+        if text := self._duration_label.text():
+            text += "\n"
+        self._duration_label.setText(
+            f"{text}Calibrated estimate: {humanize_time(duration)}"
+        )
+
+    def _on_eta_changed(self, elapsed: float, remaining: float) -> None:
+        text = f"Elapsed: {humanize_time(elapsed) or '0 s'}"
+        if remaining >= 0:
+            text += f", remaining: ~{humanize_time(remaining) or '0 s'}"
+            self.throughput.setEstimate(elapsed + remaining)
+        self._duration_label.setText(text)
+
     @Slot()
     def _on_sys_config_loaded(self) -> None:
         self.stage_positions._update_xy_enablement()
@@ -300,6 +558,10 @@ class MDAWidget(MDASequenceWidget):
         self._update_autofocus_enablement()
         # TODO: connect objective change event to update suggested step
         self.z_plan.setSuggestedStep(_guess_NA(self._mmc) or 0.5)
+        # benchmark the writers with frames like those of the camera
+        options = self.save_info.writer_options
+        options.frame_shape = (self._mmc.getImageHeight(), self._mmc.getImageWidth())
+        options.frame_dtype = f"uint{8 * max(self._mmc.getBytesPerPixel(), 1)}"
 
     @Slot(str, str, object)
     def _on_property_changed(self, device: str, prop: str, _val: str = "") -> None:
@@ -440,6 +702,7 @@ class MDAWidget(MDASequenceWidget):
     @Slot(object)
     def _on_mda_finished(self, sequence: MDASequence) -> None:
         self._enable_widgets(True)
+        self._update_time_estimate()  # replace the ETA with the estimate
         # update the save name in the gui with the next available path
         # FIXME: this is actually a bit error prone in the case of super fast
         # experiments and delayed writers that haven't yet written anything to disk
@@ -460,6 +723,7 @@ class MDAWidget(MDASequenceWidget):
             self._on_sys_config_loaded
         )
         self._mmc.events.propertyChanged.disconnect(self._on_property_changed)
+        self._timing.disconnect_core()
 
     def _enable_af(self, state: bool) -> None:
         """Override the autofocus enablement to account for the autofocus device."""
@@ -498,8 +762,25 @@ class _MDAControlButtons(QWidget):
         self.cancel_btn.setIconSize(icon_size)
         self.cancel_btn.hide()
 
+        self.sequencing_btn = QPushButton()
+        self.sequencing_btn.setFocusPolicy(Qt.FocusPolicy.NoFocus)
+        self.sequencing_btn.setIcon(QIconifyIcon("mdi:lightning-bolt-outline"))
+        self.sequencing_btn.setIconSize(icon_size)
+        self.sequencing_btn.setToolTip(
+            "Show which parts of the sequence can run as hardware sequences."
+        )
+
+        self.dashboard_btn = QPushButton()
+        self.dashboard_btn.setCheckable(True)
+        self.dashboard_btn.setFocusPolicy(Qt.FocusPolicy.NoFocus)
+        self.dashboard_btn.setIcon(QIconifyIcon("mdi:speedometer"))
+        self.dashboard_btn.setIconSize(icon_size)
+        self.dashboard_btn.setToolTip("Show the live throughput of the acquisition.")
+
         layout = QHBoxLayout(self)
         layout.setContentsMargins(0, 0, 0, 0)
+        layout.addWidget(self.sequencing_btn)
+        layout.addWidget(self.dashboard_btn)
         layout.addStretch()
         layout.addWidget(self.run_btn)
         layout.addWidget(self.pause_btn)
@@ -19,11 +19,12 @@ from superqt.utils import signals_blocked
 from useq import MDASequence, WellPlatePlan
 
 from pymmcore_widgets import HCSWizard
-from pymmcore_widgets.useq_widgets import PositionTable
+from pymmcore_widgets.useq_widgets import PositionTable, VirtualPositionTable
 from pymmcore_widgets.useq_widgets._column_info import (
     ButtonColumn,
 )
 from pymmcore_widgets.useq_widgets._positions import AF_PER_POS_TOOLTIP
+from pymmcore_widgets.useq_widgets._virtual_positions import AF, X, Y, Z
 
 if TYPE_CHECKING:
     from collections.abc import Sequence
@@ -184,18 +185,8 @@ class CoreConnectedPositionTable(PositionTable):
         self._plate_plan = self._hcs.value()
         if self._plate_plan is not None:
             # show a ovwerwrite warning dialog if the table is not empty
-            if self.table().rowCount() > 0:
-                dialog = QMessageBox(
-                    QMessageBox.Icon.Warning,
-                    "Overwrite Positions",
-                    "This will replace the positions currently stored in the table."
-                    "\nWould you like to proceed?",
-                    QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No,
-                    self,
-                )
-                dialog.setDefaultButton(QMessageBox.StandardButton.Yes)
-                if dialog.exec() != QMessageBox.StandardButton.Yes:
-                    return
+            if self.table().rowCount() > 0 and not _confirm_overwrite(self):
+                return
             self._update_table_positions(self._plate_plan)
 
     def _update_table_positions(self, plan: WellPlatePlan) -> None:
@@ -514,3 +505,153 @@ class CoreConnectedPositionTable(PositionTable):
             new_pos_list.append(new_pos)
         # update the table
         self.setValue(new_pos_list)
+
+
+class CoreConnectedVirtualPositionTable(VirtualPositionTable):
+    """[VirtualPositionTable](../VirtualPositionTable#) connected to a core instance.
+
+    A lighter alternative to `CoreConnectedPositionTable` for very long position
+    lists, such as the positions of a well plate from the HCS wizard: new rows are
+    set to the current stage position, the X/Y and Z columns follow the available
+    stage devices, and the "Well Plate..." button fills the table from the HCS
+    wizard. Unlike `CoreConnectedPositionTable`, there are no per-row buttons to
+    read the current position, and the stage doesn't follow the selection.
+
+    Parameters
+    ----------
+    rows : int
+        Number of rows to initialize the table with, by default 0.
+    mmcore : CMMCorePlus | None
+        Optional [`CMMCorePlus`][pymmcore_plus.CMMCorePlus] micromanager core.
+        By default, None. If not specified, the widget will use the active
+        (or create a new)
+        [`CMMCorePlus.instance`][pymmcore_plus.core._mmcore_plus.CMMCorePlus.instance].
+    parent : QWidget | None
+        Optional parent widget, by default None.
+    """
+
+    def __init__(
+        self,
+        rows: int = 0,
+        mmcore: CMMCorePlus | None = None,
+        parent: QWidget | None = None,
+    ):
+        super().__init__(rows, parent)
+        self._mmc = mmcore or CMMCorePlus.instance()
+
+        self._hcs_wizard: HCSWizard | None = None
+        self._hcs_button = QPushButton("Well Plate...")
+        self._hcs_button.setFocusPolicy(Qt.FocusPolicy.NoFocus)
+        self._hcs_button.setToolTip("Open the HCS wizard.")
+        self._hcs_button.clicked.connect(self._show_hcs)
+        self._btn_row.insertWidget(3, self._hcs_button)
+
+        self._mmc.events.systemConfigurationLoaded.connect(self._on_sys_config_loaded)
+        self._mmc.events.propertyChanged.connect(self._on_property_changed)
+        self.destroyed.connect(self._disconnect)
+
+        self._on_sys_config_loaded()
+
+    # ----------------------- private methods -----------------------
+
+    def _show_hcs(self) -> None:
+        """Show or raise the HCS wizard."""
+        self._hcs.raise_() if self._hcs.isVisible() else self._hcs.show()
+
+    @property
+    def _hcs(self) -> HCSWizard:
+        """Get the HCS wizard, initializing it if it doesn't exist."""
+        if self._hcs_wizard is None:
+            self._hcs_wizard = HCSWizard(self)
+            self._hcs_wizard.points_plan_page.setButtonText(
+                QWizard.WizardButton.FinishButton, ADD_POSITIONS
+            )
+            self._hcs_wizard.accepted.connect(self._on_hcs_accepted)
+        return self._hcs_wizard
+
+    @Slot()
+    def _on_hcs_accepted(self) -> None:
+        """Replace the positions with those of the well plate plan."""
+        if (plan := self._hcs.value()) is None:
+            return
+        if self._model.rowCount() > 0 and not _confirm_overwrite(self):
+            return
+        self.setValue(plan)
+
+    @Slot()
+    def _on_sys_config_loaded(self) -> None:
+        self._update_xy_enablement()
+        self._update_z_enablement()
+        self._update_autofocus_enablement()
+
+    @Slot(str, str, object)
+    def _on_property_changed(self, device: str, prop: str, _val: str = "") -> None:
+        if device == "Core":
+            if prop == "XYStage":
+                self._update_xy_enablement()
+            elif prop == "Focus":
+                self._update_z_enablement()
+            elif prop == "AutoFocus":
+                self._update_autofocus_enablement()
+
+    def _update_xy_enablement(self) -> None:
+        """Show the X/Y columns only if there is an XY stage."""
+        xy_device = bool(self._mmc.getXYStageDevice())
+        self._view.setColumnHidden(X, not xy_device)
+        self._view.setColumnHidden(Y, not xy_device)
+
+    def _update_z_enablement(self) -> None:
+        """Enable the Z checkbox only if there is a focus device."""
+        z_device = bool(self._mmc.getFocusDevice())
+        self.include_z.setEnabled(z_device)
+        if not z_device:
+            self.include_z.setChecked(False)
+        self.include_z.setToolTip("" if z_device else "Focus device unavailable.")
+
+    def _update_autofocus_enablement(self) -> None:
+        """Update the autofocus per position checkbox state and tooltip."""
+        af_device = self._mmc.getAutoFocusDevice()
+        self.af_per_position.setEnabled(bool(af_device))
+        self._view.setColumnHidden(
+            AF, not (af_device and self.af_per_position.isChecked())
+        )
+        self.af_per_position.setToolTip(
+            AF_PER_POS_TOOLTIP if af_device else AF_UNAVAILABLE
+        )
+
+    def _add_row(self) -> None:
+        """Add a row at the end of the table, at the current stage position."""
+        model = self._model
+        row = model.rowCount()
+        mmc = self._mmc
+        # emit valueChanged once, with the position set
+        with signals_blocked(self):
+            model.insertRows(row, 1)
+            if mmc.getXYStageDevice():
+                model.setData(model.index(row, X), mmc.getXPosition())
+                model.setData(model.index(row, Y), mmc.getYPosition())
+            if mmc.getFocusDevice():
+                model.setData(model.index(row, Z), mmc.getZPosition())
+            if mmc.getAutoFocusDevice() and mmc.isContinuousFocusLocked():
+                model.setData(model.index(row, AF), mmc.getAutoFocusOffset())
+        self.valueChanged.emit()
+
+    def _disconnect(self) -> None:
+        self._mmc.events.systemConfigurationLoaded.disconnect(
+            self._on_sys_config_loaded
+        )
+        self._mmc.events.propertyChanged.disconnect(self._on_property_changed)
+
+
+def _confirm_overwrite(parent: QWidget) -> bool:
+    """Ask whether to replace the positions currently in a table."""
+    dialog = QMessageBox(
+        QMessageBox.Icon.Warning,
+        "Overwrite Positions",
+        "This will replace the positions currently stored in the table."
+        "\nWould you like to proceed?",
+        QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No,
+        parent,
+    )
+    dialog.setDefaultButton(QMessageBox.StandardButton.Yes)
+    return dialog.exec() == QMessageBox.StandardButton.Yes
@@ -0,0 +1,220 @@
+"""Pre-flight estimate of the storage and memory needed by an acquisition."""
+
+from __future__ import annotations
+
+import os
+import shutil
+import tempfile
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from useq import HardwareAutofocus
+
+if TYPE_CHECKING:
+    from pymmcore_plus import CMMCorePlus
+    from useq import MDASequence
+
+# size of the file written to measure the write throughput of the save location
+PROBE_BYTES = 16 * 1024**2
+_CHUNK = 1024**2
+# keep some room on the disk for the metadata and anything else writing to it
+DISK_MARGIN = 0.95
+# write throughput measured per folder, the probe is only written once per folder
+_THROUGHPUT_CACHE: dict[Path, float] = {}
+
+
+@dataclass(frozen=True)
+class AcquisitionBudget:
+    """Storage and memory needed by an acquisition, and what is available.
+
+    Attributes
+    ----------
+    n_frames : int
+        Number of images acquired by the sequence.
+    frame_bytes : int
+        Size of one image (all camera channels), in bytes.
+    duration : float
+        Estimated duration of the acquisition in seconds (0 if unknown).
+    free_disk : int | None
+        Free space at the save location in bytes, None if not saving.
+    write_throughput : float | None
+        Measured write throughput of the save location in bytes per second, None if
+        not saving or if it could not be measured.
+    free_memory : int | None
+        Available physical memory in bytes. None if unknown, or if the acquisition
+        is saved (images are then not expected to be kept in memory).
+    """
+
+    n_frames: int
+    frame_bytes: int
+    duration: float = 0
+    free_disk: int | None = None
+    write_throughput: float | None = None
+    free_memory: int | None = None
+
+    @property
+    def total_bytes(self) -> int:
+        """Size of all images of the acquisition, in bytes."""
+        return self.n_frames * self.frame_bytes
+
+    @property
+    def peak_memory(self) -> int:
+        """Memory needed by viewers that keep every image in memory, in bytes."""
+        return self.total_bytes
+
+    @property
+    def write_bandwidth(self) -> float | None:
+        """Sustained write bandwidth needed to keep up with the acquisition."""
+        return self.total_bytes / self.duration if self.duration > 0 else None
+
+    def problems(self) -> list[str]:
+        """Return a description of every resource the acquisition would exceed."""
+        out: list[str] = []
+        if self.free_disk is not None and self.total_bytes > (
+            self.free_disk * DISK_MARGIN
+        ):
+            out.append(
+                f"The acquisition will write {_fmt_bytes(self.total_bytes)}, but only "
+                f"{_fmt_bytes(self.free_disk)} are free at the save location."
+            )
+        if (
+            (needed := self.write_bandwidth) is not None
+            and self.write_throughput is not None
+            and needed > self.write_throughput
+        ):
+            out.append(
+                f"The acquisition needs to write {_fmt_bytes(needed)}/s, but the save "
+                f"location was measured at {_fmt_bytes(self.write_throughput)}/s."
+            )
+        if self.free_memory is not None and self.peak_memory > self.free_memory:
+            out.append(
+                "Viewers keeping all images in memory would need "
+                f"{_fmt_bytes(self.peak_memory)}, but only "
+                f"{_fmt_bytes(self.free_memory)} are available."
+            )
+        return out
+
+
+def image_bytes(core: CMMCorePlus) -> int:
+    """Return the size in bytes of one image of the current camera(s)."""
+    return (
+        core.getImageWidth()
+        * core.getImageHeight()
+        * core.getBytesPerPixel()
+        * core.getNumberOfCameraChannels()
+    )
+
+
+def analyze_budget(
+    sequence: MDASequence,
+    frame_bytes: int,
+    save_path: str | Path | None = None,
+    *,
+    probe_bytes: int = PROBE_BYTES,
+    n_frames: int | None = None,
+) -> AcquisitionBudget:
+    """Compute the storage and memory needed to run `sequence`.
+
+    Unless `n_frames` is given, the events of the sequence are iterated (but not
+    executed) to count the frames, so this may take a while for long sequences and
+    is meant to be called from a worker thread. It does not use the core.
+
+    Parameters
+    ----------
+    sequence : MDASequence
+        The sequence to analyze.
+    frame_bytes : int
+        Size of one image in bytes (see `image_bytes`).
+    save_path : str | Path | None
+        Where the acquisition will be saved, if any. The free space there is
+        checked, and its write throughput measured by writing `probe_bytes` (once
+        per folder, the result is cached). If None, the available memory is
+        checked instead.
+    probe_bytes : int
+        Size of the file written to measure the write throughput (0 to skip the
+        measurement), by default 16 MiB.
+    n_frames : int | None
+        Number of images acquired by the sequence, if already known (e.g. from the
+        plan of the run).
+    """
+    if n_frames is None:
+        events = sequence.iter_events()
+        n_frames = sum(1 for e in events if not isinstance(e.action, HardwareAutofocus))
+    try:
+        duration = sequence.estimate_duration().total_duration
+    except Exception:
+        duration = 0
+
+    free_disk = throughput = free_memory = None
+    if save_path is None:
+        free_memory = _available_memory()
+    elif folder := _existing_parent(Path(save_path)):
+        free_disk = shutil.disk_usage(folder).free
+        if probe_bytes > 0:
+            throughput = _cached_write_throughput(folder, probe_bytes)
+
+    return AcquisitionBudget(
+        n_frames=n_frames,
+        frame_bytes=frame_bytes,
+        duration=duration,
+        free_disk=free_disk,
+        write_throughput=throughput,
+        free_memory=free_memory,
+    )
+
+
+def measure_write_throughput(folder: str | Path, n_bytes: int) -> float | None:
+    """Return the throughput (bytes/s) of writing `n_bytes` to a file in `folder`.
+
+    The data is flushed to disk before the clock stops, and the file is removed.
+    Returns None if the folder is not writable.
+    """
+    chunk = os.urandom(min(n_bytes, _CHUNK))  # random data can't be compressed
+    try:
+        with tempfile.NamedTemporaryFile(dir=folder, prefix=".pmmw-probe") as f:
+            start = time.perf_counter()
+            written = 0
+            while written < n_bytes:
+                written += f.write(chunk[: n_bytes - written])
+            f.flush()
+            os.fsync(f.fileno())
+            elapsed = time.perf_counter() - start
+    except OSError:
+        return None
+    return written / elapsed if elapsed > 0 else None
+
+
+def _cached_write_throughput(folder: Path, n_bytes: int) -> float | None:
+    """Return the write throughput of `folder`, measuring it the first time."""
+    if (throughput := _THROUGHPUT_CACHE.get(folder)) is None:
+        throughput = measure_write_throughput(folder, n_bytes)
+        if throughput is not None:
+            _THROUGHPUT_CACHE[folder] = throughput
+    return throughput
+
+
+def _existing_parent(path: Path) -> Path | None:
+    """Return `path` or its closest parent that exists."""
+    path = path.expanduser().absolute()
+    for candidate in (path, *path.parents):
+        if candidate.is_dir():
+            return candidate
+    return None  # pragma: no cover
+
+
+def _available_memory() -> int | None:
+    """Return the available physical memory in bytes, if the OS reports it."""
+    try:
+        return os.sysconf("SC_AVPHYS_PAGES") * os.sysconf("SC_PAGE_SIZE")
+    except (AttributeError, ValueError, OSError):
+        return None
+
+
+def _fmt_bytes(n: float) -> str:
+    for unit in ("B", "KB", "MB", "GB"):
+        if abs(n) < 1000:
+            return f"{n:.3g} {unit}"
+        n /= 1000
+    return f"{n:.3g} TB"
@@ -1,31 +1,48 @@
 from __future__ import annotations
 
+import tempfile
+from contextlib import suppress
 from pathlib import Path
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any
 from warnings import warn
 
-from qtpy.QtCore import Qt, Signal
+from qtpy.QtCore import QSize, Qt, Signal
 from qtpy.QtWidgets import (
     QComboBox,
     QFileDialog,
+    QFormLayout,
     QGridLayout,
     QGroupBox,
+    QHBoxLayout,
     QLabel,
     QLineEdit,
     QPushButton,
+    QSpinBox,
     QWidget,
 )
+from superqt.iconify import QIconifyIcon
+from superqt.utils import create_worker
 
 if TYPE_CHECKING:
+    from collections.abc import Mapping
     from typing import TypedDict
 
     from qtpy.QtGui import QFocusEvent
+    from typing_extensions import NotRequired
+
+    class WriterOptions(TypedDict):
+        chunk_frames: int
+        shard_frames: int
+        compression: str
+        compression_level: int
+        write_workers: int
 
     class SaveInfo(TypedDict):
         save_dir: str
         save_name: str
         format: str
         should_save: bool
+        writer_options: NotRequired[WriterOptions]
 
 
 OME_ZARR = "ome-zarr"
@@ -46,6 +63,21 @@ DIRECTORY_WRITERS = {TIFF_SEQ}  # technically could be zarr too
 FILE_NAME = "Filename:"
 SUBFOLDER = "Subfolder:"
 
+COMPRESSIONS = ("none", "zstd", "lz4", "zlib")
+DEFAULT_WRITER_OPTIONS: WriterOptions = {
+    "chunk_frames": 1,  # frames per chunk
+    "shard_frames": 0,  # frames per shard (0 for no sharding)
+    "compression": "none",
+    "compression_level": 5,
+    "write_workers": 0,  # 0 writes synchronously, I/O threads of sharded stores
+}
+# writer options (other than the defaults) that each writer can use
+WRITER_OPTIONS: dict[str, set[str]] = {
+    OME_ZARR: set(DEFAULT_WRITER_OPTIONS),
+    OME_TIFF: set(),
+    TIFF_SEQ: {"compression", "compression_level", "write_workers"},
+}
+
 
 def _known_extension(name: str) -> str | None:
     """Return a known extension if the name ends with one.
@@ -76,6 +108,163 @@ class _FocusOutLineEdit(QLineEdit):
         self.editingFinished.emit()
 
 
+class WriterOptionsWidget(QWidget):
+    """Performance options of the writers: chunks, shards, compression, threads.
+
+    Options that the current writer (see `setWriter`) can't use are disabled. The
+    benchmark button measures the throughput of the chosen writer and options in
+    the current save directory (see `benchmark_writer`).
+    """
+
+    valueChanged = Signal()
+    # emitted (from a worker thread) with the throughput in bytes/s, or an exception
+    _benchmarked = Signal(object)
+
+    def __init__(self, parent: QWidget | None = None) -> None:
+        super().__init__(parent)
+        self._writer = OME_ZARR
+        self._save_dir = ""
+        #: (height, width) and dtype of the frames written by the benchmark
+        self.frame_shape: tuple[int, int] = (512, 512)
+        self.frame_dtype = "uint16"
+
+        self.chunk_frames = QSpinBox()
+        self.chunk_frames.setRange(1, 4096)
+        self.chunk_frames.setToolTip(
+            "Number of frames per chunk, along the innermost non-XY axis."
+        )
+        self.shard_frames = QSpinBox()
+        self.shard_frames.setRange(0, 65536)
+        self.shard_frames.setSpecialValueText("none")
+        self.shard_frames.setToolTip(
+            "Number of frames per shard file (zarr v3, requires tensorstore)."
+        )
+        self.compression = QComboBox()
+        self.compression.addItems(COMPRESSIONS)
+        self.compression_level = QSpinBox()
+        self.compression_level.setRange(1, 9)
+        self.write_workers = QSpinBox()
+        self.write_workers.setRange(0, 64)
+        self.write_workers.setSpecialValueText("sync")
+        self.write_workers.setToolTip(
+            "Write the frames on a background thread (sync: write them on the "
+            "acquisition thread). Frames are written in order by one thread, only "
+            "sharded stores use several I/O threads."
+        )
+
+        self.benchmark_btn = QPushButton("Benchmark")
+        self.benchmark_btn.setToolTip(
+            "Measure the write throughput of these settings in the save directory."
+        )
+        self.benchmark_btn.clicked.connect(self.benchmark)
+        self._benchmark_result = QLabel()
+
+        compression = QHBoxLayout()
+        compression.setContentsMargins(0, 0, 0, 0)
+        compression.addWidget(self.compression)
+        compression.addWidget(QLabel("level:"))
+        compression.addWidget(self.compression_level)
+        benchmark = QHBoxLayout()
+        benchmark.setContentsMargins(0, 0, 0, 0)
+        benchmark.addWidget(self.benchmark_btn)
+        benchmark.addWidget(self._benchmark_result, 1)
+
+        form = QFormLayout(self)
+        form.setContentsMargins(0, 0, 0, 0)
+        form.addRow("Frames per chunk:", self.chunk_frames)
+        form.addRow("Frames per shard:", self.shard_frames)
+        form.addRow("Compression:", compression)
+        form.addRow("Write threads:", self.write_workers)
+        form.addRow(benchmark)
+
+        self.setValue(DEFAULT_WRITER_OPTIONS)
+
+        for spin in (
+            self.chunk_frames,
+            self.shard_frames,
+            self.compression_level,
+            self.write_workers,
+        ):
+            spin.valueChanged.connect(self.valueChanged)
+        self.compression.currentTextChanged.connect(self.valueChanged)
+        self.compression.currentTextChanged.connect(self._update_enabled)
+        self._benchmarked.connect(self._on_benchmarked)
+
+    def value(self) -> WriterOptions:
+        """Return the current options."""
+        return {
+            "chunk_frames": self.chunk_frames.value(),
+            "shard_frames": self.shard_frames.value(),
+            "compression": self.compression.currentText(),
+            "compression_level": self.compression_level.value(),
+            "write_workers": self.write_workers.value(),
+        }
+
+    def setValue(self, value: Mapping[str, Any]) -> None:
+        """Set the options, missing keys are set to their default value."""
+        opts = {**DEFAULT_WRITER_OPTIONS, **value}
+        if (codec := opts["compression"]) not in COMPRESSIONS:  # pragma: no cover
+            raise ValueError(
+                f"Invalid compression {codec!r}. Must be one of {COMPRESSIONS}"
+            )
+        self.chunk_frames.setValue(int(opts["chunk_frames"]))
+        self.shard_frames.setValue(int(opts["shard_frames"]))
+        self.compression.setCurrentText(str(codec))
+        self.compression_level.setValue(int(opts["compression_level"]))
+        self.write_workers.setValue(int(opts["write_workers"]))
+
+    def setWriter(self, writer: str, save_dir: str = "") -> None:
+        """Enable the options supported by `writer`, saving to `save_dir`."""
+        self._writer = writer
+        self._save_dir = save_dir
+        self._update_enabled()
+
+    def benchmark(self) -> None:
+        """Measure the write throughput of the current options, off-thread."""
+        from ._writers import benchmark_writer
+
+        self.benchmark_btn.setEnabled(False)
+        self._benchmark_result.setText("Running...")
+        args = (
+            self._save_dir or tempfile.gettempdir(),
+            self._writer,
+            self.value(),
+            self.frame_shape,
+            self.frame_dtype,
+        )
+
+        def _run() -> None:
+            result: Any
+            try:
+                result = benchmark_writer(*args)
+            except Exception as e:
+                result = e
+            with suppress(RuntimeError):  # the widget was deleted in the meantime
+                self._benchmarked.emit(result)
+
+        create_worker(_run, _start_thread=True)
+
+    def _on_benchmarked(self, result: float | Exception) -> None:
+        self.benchmark_btn.setEnabled(True)
+        if isinstance(result, Exception):
+            self._benchmark_result.setText(f"Failed: {result}")
+        else:
+            self._benchmark_result.setText(f"{result / 1e6:.0f} MB/s")
+
+    def _update_enabled(self) -> None:
+        from ._writers import has_sharding
+
+        supported = WRITER_OPTIONS.get(self._writer, set())
+        self.chunk_frames.setEnabled("chunk_frames" in supported)
+        self.shard_frames.setEnabled("shard_frames" in supported and has_sharding())
+        self.compression.setEnabled("compression" in supported)
+        self.compression_level.setEnabled(
+            "compression_level" in supported
+            and self.compression.currentText() != "none"
+        )
+        self.write_workers.setEnabled("write_workers" in supported)
+
+
 class SaveGroupBox(QGroupBox):
     """A Widget to gather information about MDA file saving."""
 
@@ -104,13 +293,25 @@ class SaveGroupBox(QGroupBox):
         browse_btn.setFocusPolicy(Qt.FocusPolicy.NoFocus)
         browse_btn.clicked.connect(self._on_browse_clicked)
 
+        self.writer_options = WriterOptionsWidget()
+        self.writer_options.setVisible(False)
+        self._options_btn = QPushButton()
+        self._options_btn.setIcon(QIconifyIcon("mdi:tune"))
+        self._options_btn.setIconSize(QSize(16, 16))
+        self._options_btn.setCheckable(True)
+        self._options_btn.setFocusPolicy(Qt.FocusPolicy.NoFocus)
+        self._options_btn.setToolTip("Writer performance options.")
+        self._options_btn.toggled.connect(self._on_options_toggled)
+
         grid = QGridLayout(self)
         grid.addWidget(QLabel("Directory:"), 0, 0)
         grid.addWidget(self.save_dir, 0, 1, 1, 2)
-        grid.addWidget(browse_btn, 0, 3)
+        grid.addWidget(browse_btn, 0, 3, 1, 2)
         grid.addWidget(self.name_label, 1, 0)
         grid.addWidget(self.save_name, 1, 1)
         grid.addWidget(self._writer_combo, 1, 2, 1, 2)
+        grid.addWidget(self._options_btn, 1, 4)
+        grid.addWidget(self.writer_options, 2, 0, 1, 5)
 
         # prevent jiggling when toggling the checkbox
         width = self.fontMetrics().horizontalAdvance(SUBFOLDER)
@@ -120,7 +321,10 @@ class SaveGroupBox(QGroupBox):
         # connect
         self.toggled.connect(self.valueChanged)
         self.save_dir.textChanged.connect(self.valueChanged)
+        self.save_dir.textChanged.connect(self._update_writer_options)
         self.save_name.textChanged.connect(self.valueChanged)
+        self.writer_options.valueChanged.connect(self.valueChanged)
+        self._update_writer_options()
 
     def currentPath(self) -> Path:
         """Return the current save destination as a Path object."""
@@ -134,13 +338,19 @@ class SaveGroupBox(QGroupBox):
         self._update_writer_from_name(allow_name_change=False)
 
     def value(self) -> SaveInfo:
-        """Return current state of the save widget."""
-        return {
+        """Return current state of the save widget.
+
+        "writer_options" is only included if they differ from the defaults.
+        """
+        value: SaveInfo = {
             "save_dir": self.save_dir.text(),
             "save_name": self.save_name.text(),
             "format": self._writer_combo.currentText(),
             "should_save": self.isChecked(),
         }
+        if (options := self.writer_options.value()) != DEFAULT_WRITER_OPTIONS:
+            value["writer_options"] = options
+        return value
 
     def setValue(self, value: dict | str | Path) -> None:
         """Set the current state of the save widget.
@@ -150,6 +360,8 @@ class SaveGroupBox(QGroupBox):
         - save_name: str - Set the save name.
         - format: str - Set the combo box to the writer with this name.
         - should_save: bool - Set the checked state of the checkbox.
+        - writer_options: dict - Set the writer performance options (see
+          `WriterOptionsWidget`), missing options are set to their default.
         """
         if isinstance(value, (str, Path)):
             self.setCurrentPath(value)
@@ -162,6 +374,7 @@ class SaveGroupBox(QGroupBox):
         self.save_dir.setText(value.get("save_dir", ""))
         self.save_name.setText(str(value.get("save_name", "")))
         self.setChecked(value.get("should_save", False))
+        self.writer_options.setValue(value.get("writer_options", {}))
 
         if fmt:
             self._writer_combo.setCurrentText(str(fmt))
@@ -204,6 +417,15 @@ class SaveGroupBox(QGroupBox):
         ):
             self.save_dir.setText(save_dir)
 
+    def _on_options_toggled(self, checked: bool) -> None:
+        self.writer_options.setVisible(checked)
+        self.setFixedHeight(self.minimumSizeHint().height())
+
+    def _update_writer_options(self) -> None:
+        self.writer_options.setWriter(
+            self._writer_combo.currentText(), self.save_dir.text()
+        )
+
     def _on_writer_combo_changed(self, writer: str) -> None:
         """Called when the writer format combo box is changed.
 
@@ -212,6 +434,7 @@ class SaveGroupBox(QGroupBox):
         """
         # update the label
         self.name_label.setText(SUBFOLDER if writer in DIRECTORY_WRITERS else FILE_NAME)
+        self._update_writer_options()
 
         # if the name currently end with a known extension from the selected
         # writer, then we're done
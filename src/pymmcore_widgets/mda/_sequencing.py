@@ -0,0 +1,328 @@
+"""Analysis of the parts of an MDA sequence that can run as hardware sequences."""
+
+from __future__ import annotations
+
+from contextlib import suppress
+from dataclasses import dataclass, field
+from itertools import pairwise
+from typing import TYPE_CHECKING
+
+from pymmcore_plus import DeviceType, Keyword
+from pymmcore_plus.core import SequencedEvent, iter_sequenced_events
+from useq import AcquireImage
+
+from pymmcore_widgets._models._core_metadata import CoreMetadataCache
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable, Sequence
+
+    from pymmcore_plus import CMMCorePlus
+    from useq import MDAEvent, MDASequence
+
+# time spent by a software-triggered event (or the start of a hardware sequence)
+# on top of the exposure: device moves, snap/readout and python overhead
+EVENT_OVERHEAD = 0.025
+_NOT_SEQUENCEABLE = 0  # max length of a device (property) that can't be sequenced
+
+
+@dataclass(frozen=True)
+class SequenceBreak:
+    """A point where a hardware sequence must stop.
+
+    Attributes
+    ----------
+    index : int
+        Position (in `sequence.iter_events()`) of the first event of the next
+        sequence.
+    axes : tuple[str, ...]
+        The axes whose index changes between the two events.
+    reason : str
+        Why the two events can't be part of the same hardware sequence.
+    """
+
+    index: int
+    axes: tuple[str, ...]
+    reason: str
+
+
+@dataclass(frozen=True)
+class SequencingReport:
+    """How an MDA sequence would be split into hardware-triggered sequences.
+
+    Attributes
+    ----------
+    sequence_lengths : tuple[int, ...]
+        Number of events in each (hardware or single event) sequence, in order.
+    breaks : tuple[SequenceBreak, ...]
+        Every point where a sequence must stop, in order.
+    axes : dict[str, str | None]
+        For every axis that changes during the acquisition, None if all its changes
+        can be hardware-sequenced, otherwise the first reason they can't.
+    software_time : float
+        Estimated time (s) to acquire all events with software triggering.
+    hardware_time : float
+        Estimated time (s) to acquire all events with hardware sequencing.
+    engine_enabled : bool
+        Whether hardware sequencing is enabled in the MDA engine of the core.
+    """
+
+    sequence_lengths: tuple[int, ...]
+    breaks: tuple[SequenceBreak, ...]
+    axes: dict[str, str | None] = field(default_factory=dict)
+    software_time: float = 0
+    hardware_time: float = 0
+    engine_enabled: bool = True
+
+    @property
+    def n_events(self) -> int:
+        """Total number of events."""
+        return sum(self.sequence_lengths)
+
+    @property
+    def software_fps(self) -> float:
+        """Estimated frame rate with software triggering."""
+        return self.n_events / self.software_time if self.software_time else 0
+
+    @property
+    def hardware_fps(self) -> float:
+        """Estimated frame rate with hardware sequencing."""
+        return self.n_events / self.hardware_time if self.hardware_time else 0
+
+    @property
+    def speedup(self) -> float:
+        """Estimated frame rate gain of hardware sequencing (1 if none)."""
+        return self.software_time / self.hardware_time if self.hardware_time else 1
+
+    def summary(self) -> str:
+        """Return a human-readable description of the report."""
+        n_seq = sum(1 for n in self.sequence_lengths if n > 1)
+        lines = [
+            f"{self.n_events} events in {len(self.sequence_lengths)} acquisitions, "
+            f"{n_seq} of which are hardware sequences."
+        ]
+        for axis, reason in self.axes.items():
+            status = "hardware-sequenced" if reason is None else f"breaks: {reason}"
+            lines.append(f"  {axis}: {status}")
+        lines.append(
+            f"Estimated frame rate: {self.software_fps:.3g} fps (software), "
+            f"{self.hardware_fps:.3g} fps (hardware), x{self.speedup:.3g}."
+        )
+        if not self.engine_enabled:
+            lines.append("Hardware sequencing is disabled in the MDA engine.")
+        return "\n".join(lines)
+
+
+class _DeviceLimits:
+    """Maximum sequence lengths of the devices of a core, queried once each."""
+
+    def __init__(self, core: CMMCorePlus) -> None:
+        self._core = core
+        self._meta = CoreMetadataCache.for_core(core)
+        self._devices: dict[str, int] = {}
+        self._channels: dict[tuple[str, str], dict[tuple[str, str], str]] = {}
+
+    def property(self, device: str, prop: str) -> int:
+        try:
+            info = self._meta.property_info(device, prop)
+        except RuntimeError:  # unknown property, the engine can't sequence it either
+            return _NOT_SEQUENCEABLE
+        return int(info["sequence_max_length"])
+
+    def channel_properties(self, event: MDAEvent) -> dict[tuple[str, str], str]:
+        """Return the properties set by the event's channel preset and properties."""
+        props: dict[tuple[str, str], str] = {}
+        if (ch := event.channel) is not None:
+            if (key := (ch.group, ch.config)) not in self._channels:
+                data = self._core.getConfigData(*key)
+                self._channels[key] = {(d, p): v for d, p, v in data}
+            props.update(self._channels[key])
+        for device, prop, value in event.properties or ():
+            props[(device, prop)] = value
+        return props
+
+    def is_stage(self, device: str) -> bool:
+        return self._core.getDeviceType(device) in (
+            DeviceType.Stage,
+            DeviceType.XYStage,
+        )
+
+    def focus(self) -> tuple[int, str]:
+        core = self._core
+        dev = core.getFocusDevice()
+        return self._cached(
+            dev, "focus", core.isStageSequenceable, core.getStageSequenceMaxLength
+        )
+
+    def xy(self) -> tuple[int, str]:
+        core = self._core
+        dev = core.getXYStageDevice()
+        return self._cached(
+            dev, "XY", core.isXYStageSequenceable, core.getXYStageSequenceMaxLength
+        )
+
+    def exposure(self) -> tuple[int, str]:
+        core = self._core
+        dev = core.getCameraDevice()
+        return self._cached(
+            dev,
+            "exposure",
+            core.isExposureSequenceable,
+            core.getExposureSequenceMaxLength,
+        )
+
+    def slm(self) -> tuple[int, str]:
+        core = self._core
+        dev = core.getSLMDevice()
+        # there is no isSLMSequenceable method
+        return self._cached(dev, "SLM", lambda _: True, core.getSLMSequenceMaxLength)
+
+    def _cached(
+        self,
+        device: str,
+        kind: str,
+        is_sequenceable: Callable[[str], bool],
+        max_length: Callable[[str], int],
+    ) -> tuple[int, str]:
+        if not device:
+            return _NOT_SEQUENCEABLE, f"(no {kind} device)"
+        if device not in self._devices:
+            n = _NOT_SEQUENCEABLE
+            with suppress(RuntimeError):
+                if is_sequenceable(device):
+                    n = max_length(device)
+            self._devices[device] = n
+        return self._devices[device], f"{device} ({kind})"
+
+
+def _is_timed_pause(first: MDAEvent, event: MDAEvent) -> bool:
+    """Return True if `event` starts a new timepoint at another time than `first`."""
+    return (
+        event.index.get("t") != first.index.get("t")
+        and event.min_start_time != first.min_start_time
+    )
+
+
+def _break_reason(
+    limits: _DeviceLimits, batch: Sequence[MDAEvent], event: MDAEvent
+) -> str:
+    """Return why `event` can't extend the hardware sequence `batch`.
+
+    The checks follow those of `pymmcore_plus.core.EventCombiner.can_extend`: every
+    change is relative to the first event of the sequence.
+    """
+    first = batch[0]
+    for e in (first, event):
+        if e.action is not None and not isinstance(e.action, AcquireImage):
+            return f"{type(e.action).__name__} events can't be sequenced"
+    if _is_timed_pause(first, event):
+        t0, t1 = first.min_start_time or 0, event.min_start_time or 0
+        return f"waits {t1 - t0:.3g} s for the time plan"
+
+    new_length = len(batch) + 1
+
+    def _exceeded(n: int, what: str) -> str | None:
+        if new_length <= n:
+            return None
+        if n == _NOT_SEQUENCEABLE:
+            return f"{what} is not sequenceable"
+        return f"{what} sequences are limited to {n} steps"
+
+    checks: list[tuple[bool, Callable[[], tuple[int, str]]]] = [
+        (event.exposure != first.exposure, limits.exposure),
+        ((event.x_pos, event.y_pos) != (first.x_pos, first.y_pos), limits.xy),
+        (event.z_pos != first.z_pos, limits.focus),
+    ]
+    for changed, limit in checks:
+        if changed and (reason := _exceeded(*limit())):
+            return reason
+    if event.roi != first.roi:
+        return "the ROI changes"
+    if event.slm_image != first.slm_image and (reason := _exceeded(*limits.slm())):
+        return reason
+
+    first_props = limits.channel_properties(first)
+    for (device, prop), value in limits.channel_properties(event).items():
+        if value == first_props.get((device, prop)):
+            continue
+        if prop == Keyword.Position and limits.is_stage(device):
+            # stages are moved with setPosition/setXYPosition, not sequenced
+            return f"{device}-{prop} is a stage position"
+        if reason := _exceeded(limits.property(device, prop), f"{device}-{prop}"):
+            return reason
+    return "the MDA engine can't extend the sequence"
+
+
+def analyze_sequencing(
+    core: CMMCorePlus,
+    sequence: MDASequence | Iterable[MDAEvent],
+    *,
+    overhead: float = EVENT_OVERHEAD,
+) -> SequencingReport:
+    """Find out which parts of `sequence` can run as hardware-triggered sequences.
+
+    The events are grouped by `pymmcore_plus.core.iter_sequenced_events`, exactly as
+    the MDA engine groups them when hardware sequencing is enabled. For every point
+    where a sequence stops, the report tells why: a timed pause, a non-acquisition
+    action (e.g. autofocus), an ROI change, or a change of something (channel preset
+    properties, exposure, stages, SLM image, event properties) that isn't
+    sequenceable on the loaded devices, or whose `sequence_max_length` is reached.
+
+    The events are iterated, so this may take a while for long sequences.
+
+    Parameters
+    ----------
+    core : CMMCorePlus
+        The core with the devices the sequence will run on.
+    sequence : MDASequence | Iterable[MDAEvent]
+        The sequence (or its events) to analyze.
+    overhead : float
+        Time in seconds spent on each software-triggered event, and at the start of
+        each hardware sequence, in addition to the exposure. By default 25 ms.
+    """
+    events = sequence.iter_events() if hasattr(sequence, "iter_events") else sequence
+    limits = _DeviceLimits(core)
+    default_exposure = core.getExposure()
+
+    lengths: list[int] = []
+    breaks: list[SequenceBreak] = []
+    axes: dict[str, str | None] = {}
+    software = hardware = 0.0
+    batch: Sequence[MDAEvent] = ()
+    n_events = 0
+    for item in iter_sequenced_events(core, events):
+        prev_batch = batch
+        batch = item.events if isinstance(item, SequencedEvent) else (item,)
+        if prev_batch:
+            prev, first = prev_batch[-1], batch[0]
+            changed = tuple(
+                k for k in first.index if first.index.get(k) != prev.index.get(k)
+            )
+            reason = _break_reason(limits, prev_batch, first)
+            breaks.append(SequenceBreak(n_events, changed, reason))
+            # a timed pause is due to the time plan, not to the other axes changing
+            timed = _is_timed_pause(prev_batch[0], first)
+            for axis in ("t",) if timed and "t" in changed else changed:
+                if axes.get(axis) is None:
+                    axes[axis] = reason
+            for axis in changed:
+                axes.setdefault(axis, None)
+        for prev, event in pairwise(batch):
+            for axis in event.index:
+                if event.index.get(axis) != prev.index.get(axis):
+                    axes.setdefault(axis, None)
+
+        exposure = sum((e.exposure or default_exposure) / 1000 for e in batch)
+        software += len(batch) * overhead + exposure
+        hardware += overhead + exposure
+        lengths.append(len(batch))
+        n_events += len(batch)
+
+    engine = core.mda.engine
+    return SequencingReport(
+        sequence_lengths=tuple(lengths),
+        breaks=tuple(breaks),
+        axes=axes,
+        software_time=software,
+        hardware_time=hardware,
+        engine_enabled=bool(getattr(engine, "use_hardware_sequencing", True)),
+    )
@@ -0,0 +1,284 @@
+"""Live instrumentation of a running MDA: frame rate, gaps, lag and drops."""
+
+from __future__ import annotations
+
+import time
+from contextlib import suppress
+from typing import TYPE_CHECKING, Any
+
+import numpy as np
+from pymmcore_plus import CMMCorePlus
+from qtpy.QtCore import QTimer
+from qtpy.QtWidgets import QFormLayout, QLabel, QWidget
+
+from pymmcore_widgets._humanize import humanize_time
+
+if TYPE_CHECKING:
+    from useq import MDAEvent, MDASequence
+
+    from pymmcore_widgets._humanize import Unit
+
+    from ._timing import RunPlan
+
+# number of (most recent) samples kept for each distribution
+RING_SIZE = 4096
+# number of frames used for the instantaneous frame rate
+INSTANT_FRAMES = 10
+REFRESH_MS = 250
+
+
+class RingBuffer:
+    """Fixed-size buffer of the `capacity` most recent float samples.
+
+    Appending is O(1) and the memory used doesn't grow with the number of samples,
+    so it can record an acquisition running for days.
+    """
+
+    def __init__(self, capacity: int = RING_SIZE) -> None:
+        self._data = np.zeros(capacity, dtype=float)
+        self._next = 0  # total number of samples appended
+        self.capacity = capacity
+
+    def __len__(self) -> int:
+        return min(self._next, self.capacity)
+
+    def append(self, value: float) -> None:
+        self._data[self._next % self.capacity] = value
+        self._next += 1
+
+    def clear(self) -> None:
+        self._next = 0
+
+    def last(self, n: int) -> np.ndarray:
+        """Return (a copy of) the `n` most recent samples, oldest first."""
+        n = min(n, len(self))
+        idx = np.arange(self._next - n, self._next) % self.capacity
+        return self._data[idx]
+
+    def values(self) -> np.ndarray:
+        """Return a view of the samples, in no particular order."""
+        return self._data[: len(self)]
+
+
+class ThroughputDashboard(QWidget):
+    """Panel showing live performance metrics of the MDA runs of a core.
+
+    The metrics are read from `mda.events` and the frame metadata. Each frame only
+    appends to fixed-size ring buffers (see `RingBuffer`); the labels are refreshed
+    every `REFRESH_MS` milliseconds while an acquisition runs:
+
+    - number of frames, and the number expected for the sequence (see `setPlan`)
+    - instantaneous (last `INSTANT_FRAMES` frames) and average frame rate
+    - percentiles of the gap between consecutive frames
+    - delivery lag: time from the start of the event of a frame to the delivery of
+      the frame to the GUI thread, both measured on the clock of the MDA runner
+      (`runner_time_ms` and `mda.seconds_elapsed()`)
+    - images waiting in the camera buffer
+    - dropped frames (expected frames that never arrived, once the run is over)
+    - elapsed versus estimated time (see `setPlan` and `setEstimate`)
+
+    Parameters
+    ----------
+    mmcore : CMMCorePlus | None
+        Optional [`CMMCorePlus`][pymmcore_plus.CMMCorePlus] micromanager core.
+        By default, None. If not specified, the widget will use the active
+        (or create a new)
+        [`CMMCorePlus.instance`][pymmcore_plus.core._mmcore_plus.CMMCorePlus.instance].
+    parent : QWidget | None
+        Optional parent widget, by default None.
+    """
+
+    def __init__(
+        self, mmcore: CMMCorePlus | None = None, parent: QWidget | None = None
+    ) -> None:
+        super().__init__(parent)
+        self._mmc = mmcore or CMMCorePlus.instance()
+
+        self._gaps = RingBuffer()
+        self._lags = RingBuffer()
+        # plan of the current (or next) run, see `setPlan`
+        self._plan: RunPlan | None = None
+        self._estimate: float | None = None
+        self._reset()
+
+        self._labels: dict[str, QLabel] = {}
+        layout = QFormLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        for name in (
+            "Frames",
+            "Frame rate",
+            "Frame interval",
+            "Delivery lag",
+            "Camera buffer",
+            "Dropped frames",
+            "Time",
+        ):
+            self._labels[name] = label = QLabel("-")
+            layout.addRow(f"{name}:", label)
+
+        self._timer = QTimer(self)
+        self._timer.setInterval(REFRESH_MS)
+        self._timer.timeout.connect(self._refresh)
+
+        ev = self._mmc.mda.events
+        ev.sequenceStarted.connect(self._on_sequence_started)
+        ev.frameReady.connect(self._on_frame_ready)
+        ev.sequenceFinished.connect(self._on_sequence_finished)
+        ev.sequenceCanceled.connect(self._on_sequence_canceled)
+        self.destroyed.connect(self._disconnect)
+
+    # ------------------- public Methods ----------------------
+
+    def setPlan(self, plan: RunPlan) -> None:
+        """Set the expected frames and duration of the run of `plan.sequence`."""
+        self._plan = plan
+        if self._end is not None:  # the run was faster than its plan
+            self._update_dropped()
+            self._refresh()
+
+    def setEstimate(self, seconds: float) -> None:
+        """Set the estimated total duration of the current run.
+
+        This overrides the duration of the plan, e.g. with a live estimate.
+        """
+        self._estimate = seconds
+
+    def metrics(self) -> dict[str, Any]:
+        """Return the current metrics (times in seconds, None if unknown)."""
+        elapsed = self._elapsed()
+        gaps = self._gaps.values()
+        last = self._gaps.last(INSTANT_FRAMES)
+        lags = self._lags.values()
+        plan = self._current_plan()
+        estimate = self._estimate
+        if estimate is None and plan is not None:
+            estimate = plan.duration
+        return {
+            "frames": self._n_frames,
+            "expected_frames": self._expected_frames(),
+            "fps": 1 / float(last.mean()) if len(last) and last.mean() > 0 else None,
+            "mean_fps": self._n_frames / elapsed if elapsed > 0 else None,
+            "gap_percentiles": (
+                dict(zip((50, 90, 99), np.percentile(gaps, (50, 90, 99)), strict=True))
+                if len(gaps)
+                else {}
+            ),
+            "max_gap": self._max_gap if self._n_frames > 1 else None,
+            "mean_lag": float(lags.mean()) if len(lags) else None,
+            "max_lag": float(lags.max()) if len(lags) else None,
+            "buffer_depth": self._buffer_depth,
+            "dropped_frames": self._dropped,
+            "elapsed": elapsed,
+            "estimate": estimate,
+        }
+
+    # ------------------- private Methods ----------------------
+
+    def _reset(self) -> None:
+        self._gaps.clear()
+        self._lags.clear()
+        self._sequence: MDASequence | None = None
+        self._start = 0.0
+        self._end: float | None = None
+        self._n_frames = 0
+        self._last_frame: float | None = None
+        self._max_gap = 0.0
+        self._buffer_depth: int | None = None
+        self._n_cameras = 1
+        self._dropped: int | None = None
+        self._canceled = False
+        self._estimate = None
+
+    def _current_plan(self) -> RunPlan | None:
+        if (plan := self._plan) is not None and plan.sequence is self._sequence:
+            return plan
+        return None
+
+    def _expected_frames(self) -> int | None:
+        if (plan := self._current_plan()) is None:
+            return None
+        return plan.n_events * self._n_cameras
+
+    def _elapsed(self) -> float:
+        if self._sequence is None:
+            return 0
+        return (self._end or time.perf_counter()) - self._start
+
+    def _on_sequence_started(self, sequence: MDASequence, *_: Any) -> None:
+        self._reset()
+        self._sequence = sequence
+        self._start = time.perf_counter()
+        self._n_cameras = self._mmc.getNumberOfCameraChannels()
+        self._timer.start()
+
+    def _on_frame_ready(self, _img: Any, _event: MDAEvent, meta: dict) -> None:
+        if self._sequence is None or self._end is not None:
+            return
+        now = time.perf_counter()
+        self._n_frames += 1
+        if self._last_frame is not None:
+            gap = now - self._last_frame
+            self._gaps.append(gap)
+            self._max_gap = max(self._max_gap, gap)
+        self._last_frame = now
+        if (runner_ms := meta.get("runner_time_ms")) is not None:
+            # on the runner's clock: the GUI received the sequenceStarted signal at
+            # some arbitrary time after the runner started
+            self._lags.append(self._mmc.mda.seconds_elapsed() - runner_ms / 1000)
+        if (remaining := meta.get("images_remaining_in_buffer")) is not None:
+            self._buffer_depth = int(remaining)
+
+    def _on_sequence_finished(self, *_: Any) -> None:
+        self._timer.stop()
+        self._end = time.perf_counter()
+        self._update_dropped()
+        self._refresh()
+
+    def _update_dropped(self) -> None:
+        # frames can only be missing from runs that went through all their events
+        if (expected := self._expected_frames()) is not None and not self._canceled:
+            self._dropped = max(expected - self._n_frames, 0)
+
+    def _on_sequence_canceled(self, *_: Any) -> None:
+        self._canceled = True
+
+    def _refresh(self) -> None:
+        m = self.metrics()
+
+        def _t(seconds: float | None, unit: Unit = "milliseconds") -> str:
+            return "-" if seconds is None else humanize_time(seconds, unit)
+
+        def _fps(value: float | None) -> str:
+            return "-" if value is None else f"{value:.3g}"
+
+        frames = str(m["frames"])
+        if m["expected_frames"] is not None:
+            frames += f" / {m['expected_frames']}"
+        self._labels["Frames"].setText(frames)
+        self._labels["Frame rate"].setText(
+            f"{_fps(m['fps'])} fps (mean {_fps(m['mean_fps'])} fps)"
+        )
+        if pct := m["gap_percentiles"]:
+            gaps = [f"p{p} {_t(v)}" for p, v in pct.items()]
+            self._labels["Frame interval"].setText(
+                ", ".join([*gaps, f"max {_t(m['max_gap'])}"])
+            )
+        self._labels["Delivery lag"].setText(
+            f"{_t(m['mean_lag'])} (max {_t(m['max_lag'])})"
+        )
+        depth = m["buffer_depth"]
+        self._labels["Camera buffer"].setText("-" if depth is None else str(depth))
+        dropped = m["dropped_frames"]
+        self._labels["Dropped frames"].setText("-" if dropped is None else str(dropped))
+        time_text = _t(m["elapsed"], "seconds")
+        if m["estimate"] is not None:
+            time_text += f" / {_t(m['estimate'], 'seconds')} estimated"
+        self._labels["Time"].setText(time_text)
+
+    def _disconnect(self) -> None:
+        ev = self._mmc.mda.events
+        with suppress(Exception):
+            ev.sequenceStarted.disconnect(self._on_sequence_started)
+            ev.frameReady.disconnect(self._on_frame_ready)
+            ev.sequenceFinished.disconnect(self._on_sequence_finished)
+            ev.sequenceCanceled.disconnect(self._on_sequence_canceled)
@@ -0,0 +1,416 @@
+"""Per-event timing profile of a microscope, measured during acquisitions."""
+
+from __future__ import annotations
+
+import json
+import math
+import statistics
+import time
+from collections import deque
+from contextlib import suppress
+from dataclasses import dataclass
+from itertools import combinations
+from typing import TYPE_CHECKING, Any
+
+import numpy as np
+from qtpy.QtCore import QObject, QSettings, Signal
+from superqt.utils import create_worker
+from useq import HardwareAutofocus
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    from pymmcore_plus import CMMCorePlus
+    from useq import MDAEvent, MDASequence
+
+# number of samples kept (per kind of overhead) in the rolling profile
+ROLLING_SAMPLES = 50
+# minimum delay between two `etaChanged` emissions, in seconds
+ETA_INTERVAL = 0.5
+
+EVENT = "event"
+XY = "xy"
+Z = "z"
+AUTOFOCUS = "autofocus"
+# fixed time of a stage move (settling...), on top of the time per µm travelled
+XY_MOVE = "xy_move"
+Z_MOVE = "z_move"
+_MOVES = {XY: XY_MOVE, Z: Z_MOVE}
+_CHANNEL = "channel:"
+
+
+def _settings() -> QSettings:
+    return QSettings("pymmcore_widgets", "MDATimingProfile")
+
+
+class TimingProfile:
+    """Rolling profile of the time the events of an acquisition take.
+
+    The time between two frames, minus the exposure, is attributed to what changed
+    between their events: a fixed per-event overhead, XY and Z stage moves (a fixed
+    time per move plus seconds per µm travelled), channel (state device) switches
+    per config group, and hardware autofocus. Only transitions with a single
+    unknown component are used as samples, and the profile keeps the
+    `ROLLING_SAMPLES` latest samples of each kind. Rates are medians (for stage
+    moves, of a Theil-Sen fit of the time against the distance), so outliers have
+    little effect.
+
+    Z moves that happen together with XY moves are attributed to the XY stage.
+    """
+
+    def __init__(self, samples: dict[str, list[list[float]]] | None = None) -> None:
+        # (amount, seconds) samples, by kind
+        self._samples: dict[str, deque[tuple[float, float]]] = {
+            k: deque(((n, t) for n, t in v), maxlen=ROLLING_SAMPLES)
+            for k, v in (samples or {}).items()
+        }
+
+    def __len__(self) -> int:
+        return sum(len(v) for v in self._samples.values())
+
+    def rates(self) -> dict[str, float]:
+        """Return the current rate of each kind of overhead (see `cost`).
+
+        Stage moves have two rates: `XY`/`Z` in seconds per µm, and `XY_MOVE`/
+        `Z_MOVE` in seconds per move.
+        """
+        out: dict[str, float] = {}
+        for kind, samples in self._samples.items():
+            if not samples:
+                continue
+            if kind in _MOVES:
+                out[_MOVES[kind]], out[kind] = _fit_move(samples)
+            else:
+                out[kind] = statistics.median(t / n for n, t in samples)
+        return out
+
+    def add_sample(self, kind: str, seconds: float, amount: float = 1) -> None:
+        """Add a sample of `kind` (e.g. `EVENT`, `XY`) to the profile.
+
+        `amount` is the number of steps (e.g. the µm travelled by a stage) that
+        took `seconds`.
+        """
+        samples = self._samples.setdefault(kind, deque(maxlen=ROLLING_SAMPLES))
+        samples.append((amount, seconds))
+
+    def record(
+        self,
+        prev: MDAEvent,
+        event: MDAEvent,
+        elapsed: float,
+        *,
+        autofocus: bool = False,
+        default_exposure: float = 0,
+    ) -> None:
+        """Record that `event` took `elapsed` seconds after the frame of `prev`.
+
+        The transition is ignored if the acquisition waited for the time plan.
+        `default_exposure` (ms) is used for events without an exposure.
+        """
+        if (event.min_start_time or 0) > (prev.min_start_time or 0):
+            return
+        exposure = (event.exposure or default_exposure) / 1000
+        residual = max(elapsed - exposure, 0)
+        parts = _components(prev, event, autofocus)
+        if not parts:
+            self.add_sample(EVENT, residual)
+        elif len(parts) == 1:
+            ((kind, amount),) = parts.items()
+            base = self.rates().get(EVENT, 0)
+            self.add_sample(kind, max(residual - base, 0), amount)
+
+    def to_dict(self) -> dict[str, list[list[float]]]:
+        """Return the (amount, seconds) samples of the profile, by kind."""
+        return {k: [list(s) for s in v] for k, v in self._samples.items()}
+
+    @classmethod
+    def load(cls, key: str, settings: QSettings | None = None) -> TimingProfile:
+        """Load the profile stored for `key` (e.g. a config file), if any."""
+        value = (settings or _settings()).value(key)
+        with suppress(TypeError, ValueError):
+            return cls(json.loads(value))
+        return cls()
+
+    def save(self, key: str, settings: QSettings | None = None) -> None:
+        """Store the profile for `key` (see `load`)."""
+        (settings or _settings()).setValue(key, json.dumps(self.to_dict()))
+
+
+def _fit_move(samples: Iterable[tuple[float, float]]) -> tuple[float, float]:
+    """Fit seconds = per_move + per_um * distance, return (per_move, per_um).
+
+    The Theil-Sen estimator is used (median of the pairwise slopes), and both
+    terms are kept positive. If all moves had the same length, the time is
+    attributed to the move rather than to the distance.
+    """
+    samples = list(samples)
+    slopes = [
+        (t1 - t0) / (d1 - d0)
+        for (d0, t0), (d1, t1) in combinations(samples, 2)
+        if d1 != d0
+    ]
+    per_um = max(statistics.median(slopes), 0) if slopes else 0
+    per_move = max(statistics.median(t - per_um * d for d, t in samples), 0)
+    return per_move, per_um
+
+
+def _components(prev: MDAEvent, event: MDAEvent, autofocus: bool) -> dict[str, float]:
+    """Return {kind: amount} of what changed between two events (but the base)."""
+    out: dict[str, float] = {}
+    if autofocus:
+        out[AUTOFOCUS] = 1
+    x0, y0, z0 = prev.x_pos, prev.y_pos, prev.z_pos
+    x1, y1, z1 = event.x_pos, event.y_pos, event.z_pos
+    if x0 is not None and y0 is not None and x1 is not None and y1 is not None:
+        if dxy := math.hypot(x1 - x0, y1 - y0):
+            out[XY] = dxy
+    if XY not in out and z0 is not None and z1 is not None:
+        if dz := abs(z1 - z0):
+            out[Z] = dz
+    if event.channel is not None and event.channel != prev.channel:
+        out[_CHANNEL + event.channel.group] = 1
+    return out
+
+
+def cost(
+    rates: dict[str, float],
+    prev: MDAEvent | None,
+    event: MDAEvent,
+    autofocus: bool = False,
+) -> float:
+    """Return the overhead (s) of `event` after `prev`, on top of its exposure."""
+    total = rates.get(EVENT, 0)
+    if prev is not None:
+        parts = _components(prev, event, autofocus)
+    else:
+        parts = {AUTOFOCUS: 1} if autofocus else {}
+    for kind, amount in parts.items():
+        total += rates.get(kind, 0) * amount
+        if kind in _MOVES:
+            total += rates.get(_MOVES[kind], 0)
+    return total
+
+
+def simulate(
+    sequence: MDASequence,
+    rates: dict[str, float],
+    default_exposure: float = 0,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Simulate a run of `sequence` with a profile's `rates`.
+
+    Returns the time (s) at which the frame of each acquisition event is expected,
+    and whether a hardware autofocus precedes it.
+    """
+    finish: list[float] = []
+    autofocus: list[bool] = []
+    t = offset = 0.0
+    prev: MDAEvent | None = None
+    af = False
+    for event in sequence.iter_events():
+        if isinstance(event.action, HardwareAutofocus):
+            af = True
+            continue
+        if event.reset_event_timer:
+            offset = t
+        t = max(t, offset + (event.min_start_time or 0))
+        t += cost(rates, prev, event, af)
+        t += (event.exposure or default_exposure) / 1000
+        finish.append(t)
+        autofocus.append(af)
+        prev, af = event, False
+    return np.asarray(finish, dtype=float), np.asarray(autofocus, dtype=bool)
+
+
+@dataclass(frozen=True, eq=False)
+class RunPlan:
+    """Expected timeline of a run of `sequence` (see `plan_run`).
+
+    Attributes
+    ----------
+    sequence : MDASequence
+        The planned sequence.
+    finish : np.ndarray
+        Time (s) at which the frame of each acquisition event is expected.
+    autofocus : np.ndarray
+        Whether a hardware autofocus precedes each acquisition event.
+    """
+
+    sequence: MDASequence
+    finish: np.ndarray
+    autofocus: np.ndarray
+
+    @property
+    def n_events(self) -> int:
+        """Number of acquisition events (autofocus events are not counted)."""
+        return len(self.finish)
+
+    @property
+    def duration(self) -> float:
+        """Expected duration (s) of the run."""
+        return float(self.finish[-1]) if len(self.finish) else 0
+
+
+def plan_run(
+    sequence: MDASequence, rates: dict[str, float], default_exposure: float = 0
+) -> RunPlan:
+    """Return the expected timeline of a run of `sequence` (see `simulate`).
+
+    The events of the sequence are iterated, so this is meant to be called from a
+    worker thread, once per run.
+    """
+    return RunPlan(sequence, *simulate(sequence, rates, default_exposure))
+
+
+class TimingRecorder(QObject):
+    """Records the timing of MDA runs of a core into a `TimingProfile`.
+
+    The profile is stored per system configuration file (by default in the Qt
+    settings of pymmcore_widgets) at the end of every run, and loaded again with the
+    configuration. During a run, `etaChanged` is emitted (at most every
+    `ETA_INTERVAL` seconds) with the elapsed and the expected remaining time.
+
+    Parameters
+    ----------
+    mmcore : CMMCorePlus
+        The core whose MDA runs are recorded.
+    parent : QObject | None
+        Optional parent object.
+    settings : QSettings | None
+        Where the profiles are stored, by default
+        `QSettings("pymmcore_widgets", "MDATimingProfile")`.
+
+    Attributes
+    ----------
+    etaChanged : Signal
+        Emitted with (elapsed, remaining) seconds during a run. `remaining` is -1
+        until the expected timeline of the run has been computed.
+    planned : Signal
+        Emitted with the `RunPlan` of the current run, once it is known.
+    """
+
+    etaChanged = Signal(float, float)
+    planned = Signal(object)
+    # emitted (from a worker thread) with the RunPlan of a run
+    _planned = Signal(object)
+
+    def __init__(
+        self,
+        mmcore: CMMCorePlus,
+        parent: QObject | None = None,
+        *,
+        settings: QSettings | None = None,
+    ) -> None:
+        super().__init__(parent)
+        self._mmc = mmcore
+        self._settings = settings or _settings()
+        self.profile = TimingProfile.load(self._key(), self._settings)
+        # plan computed beforehand for the next run (see `setPlan`)
+        self._next_plan: RunPlan | None = None
+        self._reset()
+
+        ev = mmcore.mda.events
+        ev.sequenceStarted.connect(self._on_sequence_started)
+        ev.frameReady.connect(self._on_frame_ready)
+        ev.sequenceFinished.connect(self._on_sequence_finished)
+        mmcore.events.systemConfigurationLoaded.connect(self._on_config_loaded)
+        self._planned.connect(self._on_planned)
+
+    def setPlan(self, plan: RunPlan) -> None:
+        """Use `plan` (see `plan_run`) for the next run of `plan.sequence`.
+
+        This avoids iterating the sequence again if its plan was already computed,
+        e.g. by a pre-flight check. Other runs are planned by the recorder.
+        """
+        self._next_plan = plan
+
+    def _key(self) -> str:
+        return self._mmc.systemConfigurationFile() or "<no configuration>"
+
+    def _reset(self) -> None:
+        self._sequence: MDASequence | None = None
+        self._start = 0.0
+        self._prev: tuple[MDAEvent, float] | None = None
+        self._n_events = 0
+        self._finish: np.ndarray | None = None
+        self._autofocus: np.ndarray | None = None
+        self._last_eta = 0.0
+        self._exposure = 0.0
+
+    def _on_config_loaded(self) -> None:
+        self.profile = TimingProfile.load(self._key(), self._settings)
+
+    def _on_sequence_started(self, sequence: MDASequence, *_: Any) -> None:
+        self._reset()
+        self._sequence = sequence
+        self._start = time.perf_counter()
+        self._exposure = self._mmc.getExposure()
+        plan, self._next_plan = self._next_plan, None
+        if plan is not None and plan.sequence is sequence:
+            self._on_planned(plan)
+        else:
+            rates = self.profile.rates()
+            args = (sequence, rates, self._exposure)
+            create_worker(self._plan, *args, _start_thread=True)
+
+    def _plan(
+        self, sequence: MDASequence, rates: dict[str, float], exposure: float
+    ) -> None:
+        plan = plan_run(sequence, rates, exposure)
+        with suppress(RuntimeError):  # the recorder was deleted in the meantime
+            self._planned.emit(plan)
+
+    def _on_planned(self, plan: RunPlan) -> None:
+        if plan.sequence is self._sequence:
+            self._finish, self._autofocus = plan.finish, plan.autofocus
+            self.planned.emit(plan)
+
+    def _on_frame_ready(self, _img: Any, event: MDAEvent, meta: dict) -> None:
+        if self._sequence is None:
+            return
+        if self._prev is not None and event == self._prev[0]:
+            return  # another camera channel of the same event
+        if (now := meta.get("runner_time_ms")) is not None:
+            now /= 1000
+        else:
+            now = time.perf_counter() - self._start
+        if self._prev is not None:
+            idx = self._n_events
+            flags = self._autofocus
+            af = flags is not None and idx < len(flags) and bool(flags[idx])
+            self.profile.record(
+                self._prev[0],
+                event,
+                now - self._prev[1],
+                autofocus=af,
+                default_exposure=self._exposure,
+            )
+        self._prev = (event, now)
+        self._n_events += 1
+
+        if time.perf_counter() - self._last_eta >= ETA_INTERVAL:
+            self._last_eta = time.perf_counter()
+            self.etaChanged.emit(now, self.remaining(now))
+
+    def remaining(self, elapsed: float) -> float:
+        """Return the expected remaining time (s) of the current run, or -1."""
+        if (finish := self._finish) is None or not len(finish):
+            return -1
+        if (done := min(self._n_events, len(finish))) == 0:
+            return max(float(finish[-1]) - elapsed, 0)
+        return float(finish[-1] - finish[done - 1])
+
+    def _on_sequence_finished(self, *_: Any) -> None:
+        if self._sequence is not None and len(self.profile):
+            self.profile.save(self._key(), self._settings)
+        self._reset()
+
+    def disconnect_core(self) -> None:
+        """Stop listening to the core."""
+        ev = self._mmc.mda.events
+        with suppress(Exception):
+            ev.sequenceStarted.disconnect(self._on_sequence_started)
+            ev.frameReady.disconnect(self._on_frame_ready)
+            ev.sequenceFinished.disconnect(self._on_sequence_finished)
+            self._mmc.events.systemConfigurationLoaded.disconnect(
+                self._on_config_loaded
+            )
@@ -0,0 +1,316 @@
+"""MDA writers configured with the performance options of the `SaveGroupBox`."""
+
+from __future__ import annotations
+
+import inspect
+import shutil
+import tempfile
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import cache
+from importlib.util import find_spec
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Protocol
+
+import numpy as np
+import useq
+
+from ._save_widget import (
+    DEFAULT_WRITER_OPTIONS,
+    OME_TIFF,
+    OME_ZARR,
+    TIFF_SEQ,
+    WRITERS,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Mapping
+
+    from pymmcore_plus.mda.handlers import OMEZarrWriter
+    from pymmcore_plus.metadata.schema import FrameMetaV1
+
+    from ._save_widget import WriterOptions
+
+# number of frames written by `benchmark_writer`
+BENCHMARK_FRAMES = 64
+
+
+class FrameWriter(Protocol):
+    """An MDA handler writing frames (it may also have the sequence callbacks)."""
+
+    def frameReady(
+        self, frame: np.ndarray, event: useq.MDAEvent, meta: FrameMetaV1, /
+    ) -> None: ...
+
+
+def has_sharding() -> bool:
+    """Return True if sharded (zarr v3) stores can be written."""
+    return find_spec("tensorstore") is not None
+
+
+def create_writer(
+    path: str | Path,
+    fmt: str,
+    options: Mapping[str, Any] | None = None,
+    frame_shape: tuple[int, int] = (512, 512),
+) -> str | Path | FrameWriter:
+    """Return the handler writing an MDA to `path` with the writer `options`.
+
+    With the default options, `path` is returned unchanged, and pymmcore-plus picks
+    its default writer for it.
+
+    Parameters
+    ----------
+    path : str | Path
+        Destination of the acquisition.
+    fmt : str
+        One of `WRITERS`.
+    options : Mapping[str, Any] | None
+        Writer options (see `WriterOptions`), missing keys take the default value.
+    frame_shape : tuple[int, int]
+        (height, width) of the images, used to size sharded chunks.
+    """
+    # pymmcore_plus.mda.handlers warns on import, so it is only imported when used
+    from pymmcore_plus.mda.handlers import ImageSequenceWriter
+
+    opts: WriterOptions = {**DEFAULT_WRITER_OPTIONS, **(options or {})}  # type: ignore
+    if opts == DEFAULT_WRITER_OPTIONS:
+        return path
+
+    writer: FrameWriter
+    if fmt == OME_ZARR and opts["shard_frames"] > 0:
+        writer = _tensorstore_writer(path, opts, frame_shape)
+        # tensorstore writes asynchronously with its own thread pools
+        return writer
+    if fmt == OME_ZARR:
+        writer = _zarr_writer(path, opts)
+    elif fmt == TIFF_SEQ:
+        writer = ImageSequenceWriter(path, imwrite_kwargs=_tiff_kwargs(opts))
+    elif fmt == OME_TIFF:
+        return path  # no options for this writer
+    else:  # pragma: no cover
+        raise ValueError(f"Invalid format {fmt!r}. Must be one of {list(WRITERS)}")
+
+    if opts["write_workers"] > 0:
+        writer = QueuedWriter(writer)
+    return writer
+
+
+def benchmark_writer(
+    folder: str | Path,
+    fmt: str,
+    options: Mapping[str, Any] | None = None,
+    frame_shape: tuple[int, int] = (512, 512),
+    dtype: str = "uint16",
+    n_frames: int = BENCHMARK_FRAMES,
+) -> float:
+    """Return the throughput (bytes/s) of writing `n_frames` images to `folder`.
+
+    The frames (camera-like noise, so that compression is realistic) are written
+    with the writer and `options` of `create_writer`, in a temporary directory of
+    `folder` that is removed afterwards.
+    """
+    rng = np.random.default_rng()
+    frames = [
+        rng.poisson(100, frame_shape).astype(dtype) for _ in range(min(n_frames, 8))
+    ]
+    seq = useq.MDASequence(time_plan={"interval": 0, "loops": n_frames})
+
+    with tempfile.TemporaryDirectory(dir=folder, prefix=".pmmw-bench") as tmp:
+        dest = Path(tmp, "bench" + WRITERS[fmt][0])
+        writer = create_writer(dest, fmt, options, frame_shape)
+        if isinstance(writer, (str, Path)):
+            writer = _default_writer(writer, fmt)
+        start = time.perf_counter()
+        _start_sequence(writer, seq, {})
+        for i, event in enumerate(seq.iter_events()):
+            meta: FrameMetaV1 = {
+                "format": "frame-dict",
+                "version": "1.0",
+                "pixel_size_um": 1.0,
+                "camera_device": None,
+                "exposure_ms": 0.0,
+                "property_values": (),
+                "runner_time_ms": (time.perf_counter() - start) * 1000,
+                "mda_event": event,
+            }
+            writer.frameReady(frames[i % len(frames)], event, meta)
+        _finish_sequence(writer, seq)
+        elapsed = time.perf_counter() - start
+        shutil.rmtree(dest, ignore_errors=True)
+    return n_frames * frames[0].nbytes / elapsed if elapsed > 0 else 0
+
+
+def _zarr_writer(path: str | Path, opts: WriterOptions) -> OMEZarrWriter:
+    """Return an OMEZarrWriter with the chunks and compressor of `opts`."""
+    array_kwargs: dict[str, Any] = {"compressor": _zarr_compressor(opts)}
+    if opts["chunk_frames"] > 1:
+        return _frame_chunked_zarr_writer()(path, opts["chunk_frames"], array_kwargs)
+    from pymmcore_plus.mda.handlers import OMEZarrWriter
+
+    return OMEZarrWriter(path, array_kwargs=array_kwargs)  # type: ignore[arg-type]
+
+
+@cache
+def _frame_chunked_zarr_writer() -> Callable[
+    [str | Path, int, dict[str, Any]], OMEZarrWriter
+]:
+    """Return an OMEZarrWriter subclass storing several frames per chunk."""
+    from pymmcore_plus.mda.handlers import OMEZarrWriter
+
+    class FrameChunkedOMEZarrWriter(OMEZarrWriter):
+        """Stores `chunk_frames` frames per chunk along the last non-XY axis."""
+
+        def __init__(
+            self, store: str | Path, chunk_frames: int, array_kwargs: dict[str, Any]
+        ) -> None:
+            super().__init__(store, array_kwargs=array_kwargs)  # type: ignore[arg-type]
+            self.chunk_frames = chunk_frames
+            self.array_kwargs = array_kwargs
+
+        def new_array(self, key: str, dtype: Any, sizes: dict[str, int]) -> Any:
+            ary = super().new_array(key, dtype, sizes)
+            if ary.ndim < 3 or (n := min(self.chunk_frames, ary.shape[-3])) < 2:
+                return ary
+            # the array is still empty: create it again with larger chunks
+            attrs = ary.attrs.asdict()
+            ary = self.group.create(
+                key,
+                shape=ary.shape,
+                chunks=(*ary.chunks[:-3], n, *ary.chunks[-2:]),
+                dtype=ary.dtype,
+                overwrite=True,
+                **self.array_kwargs,
+            )
+            ary.attrs.update(attrs)
+            return ary
+
+    return FrameChunkedOMEZarrWriter
+
+
+class QueuedWriter:
+    """Writes the frames of an MDA on a background thread.
+
+    The acquisition only queues the frames, and `sequenceFinished` waits until they
+    are all written. A single thread writes them in the order of acquisition: the
+    handlers are not thread-safe, and keep the frame metadata in that order.
+
+    Parameters
+    ----------
+    writer : FrameWriter
+        The handler doing the actual writing.
+    """
+
+    def __init__(self, writer: FrameWriter) -> None:
+        self.writer = writer
+        self._pool: ThreadPoolExecutor | None = None
+        self._futures: deque[Future[None]] = deque()
+
+    def sequenceStarted(self, seq: useq.MDASequence, meta: Any = None) -> None:
+        _start_sequence(self.writer, seq, meta)
+        self._pool = ThreadPoolExecutor(1, thread_name_prefix="mda-writer")
+
+    def frameReady(
+        self, frame: np.ndarray, event: useq.MDAEvent, meta: FrameMetaV1
+    ) -> None:
+        if self._pool is None:  # not started by an MDA
+            self.writer.frameReady(frame, event, meta)
+            return
+        self._futures.append(
+            self._pool.submit(self.writer.frameReady, frame, event, meta)
+        )
+        # raise write errors early, and drop the references to written frames
+        while self._futures and self._futures[0].done():
+            self._futures.popleft().result()
+
+    def sequenceFinished(self, seq: useq.MDASequence) -> None:
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+        futures, self._futures = self._futures, deque()
+        for f in futures:
+            f.result()
+        _finish_sequence(self.writer, seq)
+
+
+def _start_sequence(writer: Any, seq: useq.MDASequence, meta: Any) -> None:
+    """Call `writer.sequenceStarted`, with the summary `meta` if it accepts it."""
+    if (started := getattr(writer, "sequenceStarted", None)) is None:
+        return
+    if len(inspect.signature(started).parameters) > 1:
+        started(seq, meta)
+    else:
+        started(seq)
+
+
+def _finish_sequence(writer: Any, seq: useq.MDASequence) -> None:
+    if (finished := getattr(writer, "sequenceFinished", None)) is not None:
+        finished(seq)
+
+
+def _default_writer(path: str | Path, fmt: str) -> FrameWriter:
+    from pymmcore_plus.mda.handlers import (
+        ImageSequenceWriter,
+        OMETiffWriter,
+        OMEZarrWriter,
+    )
+
+    if fmt == OME_ZARR:
+        return OMEZarrWriter(path)
+    if fmt == OME_TIFF:
+        return OMETiffWriter(path)
+    return ImageSequenceWriter(path)
+
+
+def _tiff_kwargs(opts: WriterOptions) -> dict[str, Any]:
+    if (codec := opts["compression"]) == "none":
+        return {}
+    return {
+        "compression": codec,
+        "compressionargs": {"level": opts["compression_level"]},
+    }
+
+
+def _zarr_compressor(opts: WriterOptions) -> Any:
+    """Return the numcodecs compressor for `opts` (None for no compression)."""
+    import numcodecs  # type: ignore[import-untyped]
+
+    codec, level = opts["compression"], opts["compression_level"]
+    if codec == "none":
+        return None
+    if codec == "zlib":
+        return numcodecs.Zlib(level=min(level, 9))
+    shuffle = numcodecs.Blosc.BITSHUFFLE
+    return numcodecs.Blosc(cname=codec, clevel=min(level, 9), shuffle=shuffle)
+
+
+def _tensorstore_writer(
+    path: str | Path, opts: WriterOptions, frame_shape: tuple[int, int]
+) -> FrameWriter:
+    """Return a handler writing a sharded zarr v3 store with tensorstore."""
+    from pymmcore_plus.mda.handlers import TensorStoreHandler
+
+    frame = int(np.prod(frame_shape))
+    spec: dict[str, Any] = {
+        "schema": {
+            "chunk_layout": {
+                "read_chunk": {"elements": frame * opts["chunk_frames"]},
+                "write_chunk": {"elements": frame * opts["shard_frames"]},
+            }
+        }
+    }
+    codec, level = opts["compression"], opts["compression_level"]
+    if codec == "zlib":
+        codecs = [{"name": "gzip", "configuration": {"level": min(level, 9)}}]
+    elif codec != "none":
+        blosc = {"cname": codec, "clevel": min(level, 9), "shuffle": "bitshuffle"}
+        codecs = [{"name": "blosc", "configuration": blosc}]
+    if codec != "none":
+        spec["schema"]["codec"] = {"driver": "zarr3", "codecs": codecs}
+    if (workers := opts["write_workers"]) > 0:
+        limit = {"limit": workers}
+        spec["context"] = {"file_io_concurrency": limit, "data_copy_concurrency": limit}
+    return TensorStoreHandler(
+        driver="zarr3", kvstore=f"file://{Path(path).absolute()}", spec=spec
+    )
@@ -14,6 +14,7 @@ from ._grid import GridPlanWidget
 from ._mda_sequence import PYMMCW_METADATA_KEY, MDASequenceWidget
 from ._positions import PositionTable
 from ._time import TimePlanWidget
+from ._virtual_positions import PositionArrayModel, VirtualPositionTable
 from ._well_plate_widget import WellPlateWidget
 from ._z import ZPlanWidget
 from .points_plans import PointsPlanWidget
@@ -30,10 +31,12 @@ __all__ = [
     "IntColumn",
     "MDASequenceWidget",
     "PointsPlanWidget",
+    "PositionArrayModel",
     "PositionTable",
     "TextColumn",
     "TimeDeltaColumn",
     "TimePlanWidget",
+    "VirtualPositionTable",
     "WellPlateWidget",
     "ZPlanWidget",
 ]
@@ -66,6 +66,19 @@ class ColumnInfo:
     ) -> None:
         raise NotImplementedError("Must be implemented by subclass")
 
+    def get_column_data(
+        self, table: QTableWidget, col: int, rows: Iterable[int]
+    ) -> list[dict[str, Any]]:
+        """Return the data of the cells of `rows` (see `get_cell_data`)."""
+        return [self.get_cell_data(table, row, col) for row in rows]
+
+    def set_column_data(
+        self, table: QTableWidget, col: int, values: Iterable[tuple[int, Any]]
+    ) -> None:
+        """Set the data of several cells of this column from (row, value) pairs."""
+        for row, value in values:
+            self.set_cell_data(table, row, col, value)
+
     def isChecked(self, table: QTableWidget, row: int, col: int) -> bool:
         return False  # pragma: no cover
 
@@ -192,6 +205,23 @@ class WidgetColumn(ColumnInfo, Generic[W, T]):
         if value is not None and (wdg := table.cellWidget(row, col)):
             self.data_type.setter(cast("W", wdg), value)
 
+    def get_column_data(
+        self, table: QTableWidget, col: int, rows: Iterable[int]
+    ) -> list[dict[str, Any]]:
+        key, getter, cell_widget = self.key, self.data_type.getter, table.cellWidget
+        return [
+            {key: getter(cast("W", wdg))} if (wdg := cell_widget(row, col)) else {}
+            for row in rows
+        ]
+
+    def set_column_data(
+        self, table: QTableWidget, col: int, values: Iterable[tuple[int, Any]]
+    ) -> None:
+        setter, cell_widget = self.data_type.setter, table.cellWidget
+        for row, value in values:
+            if value is not None and (wdg := cell_widget(row, col)):
+                setter(cast("W", wdg), value)
+
 
 # ############################# Booleans ################################
 
@@ -610,3 +640,13 @@ class ButtonColumn(WidgetColumn):
         self, table: QTableWidget, row: int, col: int, value: Any
     ) -> None:
         pass  # pragma: no cover
+
+    def get_column_data(
+        self, table: QTableWidget, col: int, rows: Iterable[int]
+    ) -> list[dict[str, Any]]:
+        return [{} for _ in rows]
+
+    def set_column_data(
+        self, table: QTableWidget, col: int, values: Iterable[tuple[int, Any]]
+    ) -> None:
+        pass  # pragma: no cover
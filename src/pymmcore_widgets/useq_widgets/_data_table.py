@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from contextlib import contextmanager
 from typing import TYPE_CHECKING, ClassVar, cast
 
 from qtpy.QtCore import QSize, Qt, Signal
@@ -47,6 +48,8 @@ class DataTable(QTableWidget):
 
     def __init__(self, rows: int = 0, parent: QWidget | None = None):
         super().__init__(rows, 0, parent=parent)
+        # nesting level of `bulkUpdate` blocks
+        self._bulk_depth = 0
 
         self.verticalHeader().setVisible(False)
         h_header = cast("QHeaderView", self.horizontalHeader())
@@ -110,26 +113,66 @@ class DataTable(QTableWidget):
                     return col
         return -1
 
+    @contextmanager
+    def bulkUpdate(self) -> Iterator[None]:
+        """Context manager to make many changes with a single `valueChanged` signal.
+
+        Repaints and signals of the table are suspended until the (outermost) block
+        exits, after which `valueChanged` is emitted once.
+        """
+        if self._bulk_depth:
+            yield
+            return
+        self._bulk_depth += 1
+        updates_enabled = self.updatesEnabled()
+        self.setUpdatesEnabled(False)
+        try:
+            with signals_blocked(self):
+                yield
+        finally:
+            self._bulk_depth -= 1
+            self.setUpdatesEnabled(updates_enabled)
+        self.valueChanged.emit()
+
     def iterRecords(
         self, exclude_unchecked: bool = False, exclude_hidden_cols: bool = False
     ) -> Iterator[Record]:
         """Return an iterator over the data in the table in records format.
 
         (Records are a list of dicts mapping {'column header' -> value} for each row.)
+        The data is read one column at a time.
         """
         selector_col = self._get_selector_col() if exclude_unchecked else -1
-        for row in range(self.rowCount()):
-            if self._is_row_checked(row, selector_col):
-                if data := self.rowData(row, exclude_hidden_cols):
-                    yield data
+        rows = self._checked_rows(selector_col)
+        columns = [
+            info.get_column_data(self, col, rows)
+            for col, info in self._columns(exclude_hidden_cols)
+        ]
+        for cells in zip(*columns, strict=True):
+            data: Record = {}
+            for cell in cells:
+                data.update(cell)
+            if data:
+                yield data
 
     def setValue(self, records: Iterable[Record]) -> None:
-        """Set the value of the table."""
-        self.setRowCount(0)
+        """Set the value of the table.
+
+        All rows are replaced, one column at a time, and `valueChanged` is emitted
+        once.
+        """
         _records = list(records)
-        self.setRowCount(len(_records))
-        for row, record in enumerate(_records):
-            self.setRowData(row, record)
+        for record in _records:
+            if not isinstance(record, dict):
+                raise TypeError(f"Expected dict, got {type(record)}")
+        with self.bulkUpdate():
+            self.setRowCount(0)
+            self.setRowCount(len(_records))
+            for col, info in self._columns():
+                key = info.key
+                info.set_column_data(
+                    self, col, [(r, d[key]) for r, d in enumerate(_records) if key in d]
+                )
 
     def checkAllRows(self) -> None:
         self._check_all(Qt.CheckState.Checked)
@@ -139,38 +182,44 @@ class DataTable(QTableWidget):
 
     def rowData(self, row: int, exclude_hidden_cols: bool = False) -> Record:
         d: Record = {}
-        for col in range(self.columnCount()):
-            if exclude_hidden_cols and self.isColumnHidden(col):
-                continue
-            if info := self.columnInfo(col):
-                d.update(info.get_cell_data(self, row, col))
+        for col, info in self._columns(exclude_hidden_cols):
+            d.update(info.get_cell_data(self, row, col))
         return d
 
     def setRowData(self, row: int, data: Record) -> None:
         if not isinstance(data, dict):
             raise TypeError(f"Expected dict, got {type(data)}")  # pragma: no cover
 
-        for col in range(self.columnCount()):
-            if info := self.columnInfo(col):
-                if info.key in data:
-                    info.set_cell_data(self, row, col, data[info.key])
+        for col, info in self._columns():
+            if info.key in data:
+                info.set_cell_data(self, row, col, data[info.key])
 
     # ############################## Private #################
 
-    def _is_row_checked(self, row: int, selector_col: int) -> bool:
+    def _columns(self, exclude_hidden: bool = False) -> list[tuple[int, ColumnInfo]]:
+        """Return the (column index, ColumnInfo) of all (visible) columns."""
+        return [
+            (col, info)
+            for col in range(self.columnCount())
+            if (info := self.columnInfo(col))
+            and not (exclude_hidden and self.isColumnHidden(col))
+        ]
+
+    def _checked_rows(self, selector_col: int) -> list[int]:
+        """Return the indices of the rows checked in `selector_col` (all if < 0)."""
         if selector_col < 0:
-            return True
-
-        if info := self.columnInfo(selector_col):
-            return info.isChecked(self, row, selector_col)
-
-        return False  # pragma: no cover
+            return list(range(self.rowCount()))
+        if (info := self.columnInfo(selector_col)) is None:
+            return []  # pragma: no cover
+        is_checked = info.isChecked
+        return [r for r in range(self.rowCount()) if is_checked(self, r, selector_col)]
 
     def _check_all(self, state: Qt.CheckState) -> None:
         if (selector_col := self._get_selector_col()) >= 0:
-            for row in range(self.rowCount()):
-                if info := self.columnInfo(selector_col):
-                    info.setCheckState(self, row, selector_col, state)
+            if info := self.columnInfo(selector_col):
+                with self.bulkUpdate():
+                    for row in range(self.rowCount()):
+                        info.setCheckState(self, row, selector_col, state)
 
                 # if item := self.item(row, selector_col):
                 #     item.setCheckState(state)
@@ -185,15 +234,16 @@ class DataTable(QTableWidget):
     def _on_rows_inserted(self, parent: Any, start: int, end: int) -> None:
         # when a new row is inserted by any means, populate it with default values
         # this is connected above in __init_ with self.model().rowsInserted.connect
-        with signals_blocked(self):
+        columns = self._columns()
+        with self.bulkUpdate():
             for row_idx in range(start, end + 1):
-                self._populate_new_row(row_idx)
-        self.valueChanged.emit()
+                self._populate_new_row(row_idx, columns)
 
-    def _populate_new_row(self, row: int) -> None:
-        for col in range(self.columnCount()):
-            if column_info := self.columnInfo(col):
-                column_info.init_cell(self, row, col, self.valueChanged)
+    def _populate_new_row(
+        self, row: int, columns: list[tuple[int, ColumnInfo]] | None = None
+    ) -> None:
+        for col, column_info in columns or self._columns():
+            column_info.init_cell(self, row, col, self.valueChanged)
 
     def _populate_new_column(self, column_info: ColumnInfo, col: int) -> None:
         """Add default values/widgets to a newly created column."""
@@ -1,12 +1,14 @@
 from __future__ import annotations
 
+import threading
+from collections import Counter, OrderedDict
 from importlib.util import find_spec
 from itertools import permutations
 from pathlib import Path
-from typing import TYPE_CHECKING, cast
+from typing import TYPE_CHECKING, Any, cast
 
 import useq
-from qtpy.QtCore import Qt, Signal
+from qtpy.QtCore import QObject, Qt, QTimer, Signal
 from qtpy.QtWidgets import (
     QCheckBox,
     QComboBox,
@@ -19,7 +21,7 @@ from qtpy.QtWidgets import (
     QVBoxLayout,
     QWidget,
 )
-from superqt.utils import signals_blocked
+from superqt.utils import create_worker, signals_blocked
 
 import pymmcore_widgets
 from pymmcore_widgets._humanize import humanize_time
@@ -28,10 +30,11 @@ from pymmcore_widgets.useq_widgets._checkable_tabwidget_widget import CheckableT
 from pymmcore_widgets.useq_widgets._grid import GridPlanWidget
 from pymmcore_widgets.useq_widgets._positions import AF_PER_POS_TOOLTIP, PositionTable
 from pymmcore_widgets.useq_widgets._time import TimePlanWidget
+from pymmcore_widgets.useq_widgets._virtual_positions import VirtualPositionTable
 from pymmcore_widgets.useq_widgets._z import Mode, ZPlanWidget
 
 if TYPE_CHECKING:
-    from collections.abc import Sequence
+    from collections.abc import Hashable, Sequence
 
 
 def _check_order(x: str, first: str, second: str) -> bool:
@@ -54,22 +57,102 @@ AF_AXIS_TOOLTIP = "Use Hardware Autofocus on the selected axes."
 AF_DISABLED_TOOLTIP = (
     "The hardware autofocus cannot be used with absolute Z positions (TOP_BOTTOM mode)."
 )
+# delay between the last change and the (re)computation of the duration estimate
+ESTIMATE_DELAY_MS = 150
+
+
+def _estimate_key(seq: useq.MDASequence) -> Hashable:
+    """Return a key identifying the duration estimate of `seq`.
+
+    The estimate depends on the number of positions and on their sub-sequences,
+    but not on their coordinates, names or order: editing or reordering positions
+    doesn't change the key. Sub-sequences are part of the key, not cached on their
+    own: any change to the plan re-estimates the whole sequence.
+    """
+    base = seq.replace(stage_positions=[]).model_dump_json(exclude={"metadata"})
+    subs = Counter(
+        p.sequence.model_dump_json() if p.sequence else "" for p in seq.stage_positions
+    )
+    return base, frozenset(subs.items())
+
+
+class _DurationEstimator(QObject):
+    """Estimates the duration of sequences on a worker thread.
+
+    Results are cached by `_estimate_key`, and only the result of the latest
+    request is emitted (as a `useq.TimeEstimate`, or the exception that prevented
+    the estimate).
+    """
+
+    estimated = Signal(object)
+    _done = Signal(int, object)
+
+    CACHE_SIZE = 64
+
+    def __init__(self) -> None:
+        # no parent: workers keep the estimator alive until they are done
+        super().__init__()
+        self._cache: OrderedDict[Hashable, Any] = OrderedDict()
+        self._lock = threading.Lock()
+        self._generation = 0
+        self._done.connect(self._on_done)
+
+    def request(self, seq: useq.MDASequence) -> None:
+        """Start estimating the duration of `seq`, superseding earlier requests."""
+        self._generation += 1
+        create_worker(self._run, seq, self._generation, _start_thread=True)
+
+    def _run(self, seq: useq.MDASequence, generation: int) -> None:
+        result: Any = None
+        try:
+            key = _estimate_key(seq)
+            with self._lock:
+                if (result := self._cache.get(key)) is not None:
+                    self._cache.move_to_end(key)
+            if result is None:
+                if generation != self._generation:
+                    return  # superseded before it started
+                result = seq.estimate_duration()
+                with self._lock:
+                    self._cache[key] = result
+                    while len(self._cache) > self.CACHE_SIZE:
+                        self._cache.popitem(last=False)
+        except Exception as e:
+            result = e
+        self._done.emit(generation, result)
+
+    def _on_done(self, generation: int, result: Any) -> None:
+        if generation == self._generation:
+            self.estimated.emit(result)
 
 
 class MDATabs(CheckableTabWidget):
     """Checkable QTabWidget for editing a useq.MDASequence.
 
     It contains a Tab for each of the MDASequence, axis (channels, positions, etc...).
+
+    Parameters
+    ----------
+    parent : QWidget | None
+        Optional parent widget, by default None.
+    virtual_positions : bool
+        If True, positions are edited in a
+        [VirtualPositionTable](../VirtualPositionTable#), which handles tens of
+        thousands of positions (e.g. of a well plate), instead of a
+        [PositionTable](../PositionTable#). By default False.
     """
 
     time_plan: TimePlanWidget
-    stage_positions: PositionTable
+    stage_positions: PositionTable | VirtualPositionTable
     grid_plan: GridPlanWidget
     z_plan: ZPlanWidget
     channels: ChannelTable
 
-    def __init__(self, parent: QWidget | None = None) -> None:
+    def __init__(
+        self, parent: QWidget | None = None, *, virtual_positions: bool = False
+    ) -> None:
         super().__init__(parent)
+        self._virtual_positions = virtual_positions
         # self.setMovable(True)
         self.tabChecked.connect(self._on_tab_checked)
 
@@ -91,7 +174,10 @@ class MDATabs(CheckableTabWidget):
     def create_subwidgets(self) -> None:
         """Create the Tabs of the widget."""
         self.time_plan = TimePlanWidget(1)
-        self.stage_positions = PositionTable(1)
+        if self._virtual_positions:
+            self.stage_positions = VirtualPositionTable(1)
+        else:
+            self.stage_positions = PositionTable(1)
         self.grid_plan = GridPlanWidget()
         self.z_plan = ZPlanWidget()
         self.channels = ChannelTable(1)
@@ -154,7 +240,12 @@ class MDATabs(CheckableTabWidget):
             raise TypeError(f"Expected useq.MDASequence, got {type(value)}")
 
         widget: (
-            ChannelTable | TimePlanWidget | ZPlanWidget | PositionTable | GridPlanWidget
+            ChannelTable
+            | TimePlanWidget
+            | ZPlanWidget
+            | PositionTable
+            | VirtualPositionTable
+            | GridPlanWidget
         )
         for f in ("channels", "time_plan", "z_plan", "stage_positions", "grid_plan"):
             widget = getattr(self, f)
@@ -268,6 +359,17 @@ class MDASequenceWidget(QWidget):
 
     This widget requires no connection to a microscope or core instance.  It strictly
     deals with loading and creating `useq-schema` [`useq.MDASequence`][] objects.
+
+    Parameters
+    ----------
+    parent : QWidget | None
+        Optional parent widget, by default None.
+    tab_widget : MDATabs | None
+        The tab widget holding the axis widgets, by default a new `MDATabs`.
+    virtual_positions : bool
+        If True (and no `tab_widget` is given), positions are edited in a
+        [VirtualPositionTable](../VirtualPositionTable#), suited to very long
+        position lists. By default False.
     """
 
     valueChanged = Signal()
@@ -277,12 +379,13 @@ class MDASequenceWidget(QWidget):
         parent: QWidget | None = None,
         *,
         tab_widget: MDATabs | None = None,
+        virtual_positions: bool = False,
     ) -> None:
         super().__init__(parent)
 
         # -------------- Main MDA Axis Widgets --------------
 
-        self.tab_wdg = tab_widget or MDATabs(self)
+        self.tab_wdg = tab_widget or MDATabs(self, virtual_positions=virtual_positions)
 
         self.axis_order = QComboBox()
         self.axis_order.setToolTip("Slowest to fastest axis order.")
@@ -350,7 +453,14 @@ class MDASequenceWidget(QWidget):
         self.grid_plan.valueChanged.connect(self._on_grid_plan_value_changed)
         self.tab_wdg.tabChecked.connect(self._on_tab_checked)
         self.axis_order.currentTextChanged.connect(self.valueChanged)
-        self.valueChanged.connect(self._update_time_estimate)
+        # the estimate is computed (off-thread) shortly after the last change
+        self._estimator = _DurationEstimator()
+        self._estimator.estimated.connect(self._on_time_estimated)
+        self._estimate_timer = QTimer(self)
+        self._estimate_timer.setSingleShot(True)
+        self._estimate_timer.setInterval(ESTIMATE_DELAY_MS)
+        self._estimate_timer.timeout.connect(self._update_time_estimate)
+        self.valueChanged.connect(self._estimate_timer.start)
 
         self.keep_shutter_open.valueChanged.connect(self.valueChanged)
         self.af_axis.valueChanged.connect(self.valueChanged)
@@ -374,7 +484,7 @@ class MDASequenceWidget(QWidget):
         return self.tab_wdg.z_plan
 
     @property
-    def stage_positions(self) -> PositionTable:
+    def stage_positions(self) -> PositionTable | VirtualPositionTable:
         return self.tab_wdg.stage_positions
 
     @property
@@ -600,14 +710,18 @@ class MDASequenceWidget(QWidget):
         self.valueChanged.emit()
 
     def _update_time_estimate(self) -> None:
+        """Request an estimate of the current sequence duration."""
+        self._estimate_timer.stop()
+        self._estimator.request(self.value())
+
+    def _on_time_estimated(self, estimate: Any) -> None:
         """Update the time estimate label."""
-        val = self.value()
-        try:
-            self._time_estimate = val.estimate_duration()
-        except ValueError as e:  # pragma: no cover
-            self._duration_label.setText(f"Error estimating time:\n{e}")
+        if isinstance(estimate, Exception):  # pragma: no cover
+            self._duration_label.setText(f"Error estimating time:\n{estimate}")
             return
 
+        self._time_estimate = estimate
+
         self._time_warning.setVisible(self._time_estimate.time_interval_exceeded)
 
         d = humanize_time(self._time_estimate.total_duration)
@@ -318,42 +318,12 @@ class PositionTable(DataTableWidget):
 
     def save(self, file: str | Path | None = None) -> None:
         """Save the current positions to a JSON file."""
-        if not isinstance(file, (str, Path)):
-            file, _ = QFileDialog.getSaveFileName(
-                self, "Save MDASequence and filename.", "", "json(*.json)"
-            )
-            if not file:
-                return  # pragma: no cover
-
-        dest = Path(file)
-        if not dest.suffix:
-            dest = dest.with_suffix(".json")
-
-        if dest.suffix != ".json":  # pragma: no cover
-            raise ValueError(f"Invalid file extension: {dest.suffix!r}, expected .json")
-
-        # doing it this way because model_json_dump knows how to serialize everything.
-        inner = ",\n".join([x.model_dump_json() for x in self.value()])
-        dest.write_text(f"[\n{inner}\n]\n")
+        _save_positions(self, file, self.value())
 
     def load(self, file: str | Path | None = None) -> None:
         """Load positions from a JSON file and set the table value."""
-        if not isinstance(file, (str, Path)):
-            file, _ = QFileDialog.getOpenFileName(
-                self, "Select an MDAsequence file.", "", "json(*.json)"
-            )
-            if not file:
-                return  # pragma: no cover
-
-        src = Path(file)
-        if not src.is_file():  # pragma: no cover
-            raise FileNotFoundError(f"File not found: {src}")
-
-        try:
-            data = json.loads(src.read_text())
-            self.setValue([useq.Position(**d) for d in data])
-        except Exception as e:  # pragma: no cover
-            raise ValueError(f"Failed to load MDASequence file: {src}") from e
+        if (positions := _load_positions(self, file)) is not None:
+            self.setValue(positions)
 
     def setXYEnabled(self, enabled: bool) -> None:
         """Disable or enable X/Y columns for all rows (e.g. global absolute grid)."""
@@ -429,3 +399,48 @@ class PositionTable(DataTableWidget):
 def _seq_has_absolute_grid(seq: useq.MDASequence | None) -> bool:
     """Return True if the sequence has an absolute grid plan."""
     return bool(seq and seq.grid_plan and not seq.grid_plan.is_relative)
+
+
+def _save_positions(
+    parent: QWidget, file: str | Path | None, positions: Sequence[useq.Position]
+) -> None:
+    """Save `positions` to a JSON `file` (or ask for one, if None)."""
+    if not isinstance(file, (str, Path)):
+        file, _ = QFileDialog.getSaveFileName(
+            parent, "Save MDASequence and filename.", "", "json(*.json)"
+        )
+        if not file:
+            return  # pragma: no cover
+
+    dest = Path(file)
+    if not dest.suffix:
+        dest = dest.with_suffix(".json")
+
+    if dest.suffix != ".json":  # pragma: no cover
+        raise ValueError(f"Invalid file extension: {dest.suffix!r}, expected .json")
+
+    # doing it this way because model_json_dump knows how to serialize everything.
+    inner = ",\n".join([x.model_dump_json() for x in positions])
+    dest.write_text(f"[\n{inner}\n]\n")
+
+
+def _load_positions(
+    parent: QWidget, file: str | Path | None
+) -> list[useq.Position] | None:
+    """Load positions from a JSON `file` (or ask for one, if None)."""
+    if not isinstance(file, (str, Path)):
+        file, _ = QFileDialog.getOpenFileName(
+            parent, "Select an MDAsequence file.", "", "json(*.json)"
+        )
+        if not file:
+            return None  # pragma: no cover
+
+    src = Path(file)
+    if not src.is_file():  # pragma: no cover
+        raise FileNotFoundError(f"File not found: {src}")
+
+    try:
+        data = json.loads(src.read_text())
+        return [useq.Position(**d) for d in data]
+    except Exception as e:  # pragma: no cover
+        raise ValueError(f"Failed to load MDASequence file: {src}") from e
@@ -0,0 +1,634 @@
+"""Model-backed table of stage positions, for very long position lists."""
+
+from __future__ import annotations
+
+import warnings
+from typing import TYPE_CHECKING, Any, cast
+
+import numpy as np
+import useq
+from qtpy.QtCore import (
+    QAbstractItemModel,
+    QAbstractTableModel,
+    QModelIndex,
+    QSize,
+    Qt,
+    Signal,
+)
+from qtpy.QtWidgets import (
+    QCheckBox,
+    QHBoxLayout,
+    QHeaderView,
+    QPushButton,
+    QSizePolicy,
+    QStyledItemDelegate,
+    QTableView,
+    QToolBar,
+    QVBoxLayout,
+    QWidget,
+)
+from superqt.iconify import QIconifyIcon
+from superqt.utils import signals_blocked
+
+from ._positions import (
+    AF_PER_POS_TOOLTIP,
+    NULL_SEQUENCE,
+    PositionTable,
+    _load_positions,
+    _MDAPopup,
+    _save_positions,
+    _seq_has_absolute_grid,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Sequence
+    from pathlib import Path
+
+    from PyQt6.QtGui import QAction
+    from qtpy.QtWidgets import QDoubleSpinBox, QStyleOptionViewItem
+
+    from ._column_info import FloatColumn
+else:
+    from qtpy.QtGui import QAction
+
+# columns of the model
+NAME, X, Y, Z, AF, SEQ = range(6)
+_HEADERS = ("Name", "X [µm]", "Y [µm]", "Z [µm]", "AF", "Sub-Sequence")
+# editors of the float columns are configured like the PositionTable spinboxes
+_FLOAT_COLUMNS: dict[int, FloatColumn] = {
+    X: PositionTable.X,
+    Y: PositionTable.Y,
+    Z: PositionTable.Z,
+    AF: PositionTable.AF,
+}
+_CHECKED = Qt.CheckState.Checked
+_UNCHECKED = Qt.CheckState.Unchecked
+_ABS_GRID_TIP = "X/Y defined by the absolute grid in the sub-sequence."
+_GLOBAL_GRID_TIP = "X/Y defined by the global absolute grid plan."
+_SEQ_TIP = "Double-click to edit the sub-sequence."
+
+
+class PositionArrayModel(QAbstractTableModel):
+    """Table model storing stage positions in columnar arrays.
+
+    The x, y, z and autofocus offset of all positions are stored in one (N, 4)
+    float array (NaN meaning "not set"), and the check state in a boolean array.
+    Sub-sequences are stored once in a list and referenced by index from each row,
+    so that thousands of positions sharing the same sub-sequence cost one index
+    each (equal sub-sequences share one entry, and unused ones are dropped). No
+    widget or `useq.Position` is created per row.
+    """
+
+    def __init__(self, parent: QWidget | None = None) -> None:
+        super().__init__(parent)
+        self._names: list[str | None] = []
+        self._coords = np.empty((0, 4), dtype=float)  # x, y, z, af
+        self._checked = np.empty(0, dtype=bool)
+        self._seq_index = np.empty(0, dtype=np.intp)  # -1: no sub-sequence
+        self._sequences: list[useq.MDASequence] = []
+        self._abs_grid: list[bool] = []  # per entry of _sequences
+        self._xy_enabled = True
+        self._seq_icon: QIconifyIcon | None = None
+
+    # ------------------------- Public API -------------------------
+
+    def names(self) -> list[str | None]:
+        """Return the names of all positions (None if not set)."""
+        return self._names
+
+    def coords(self) -> np.ndarray:
+        """Return the (N, 4) array of x, y, z and AF offset (NaN if not set)."""
+        return self._coords
+
+    def checked(self) -> np.ndarray:
+        """Return the boolean array of checked rows."""
+        return self._checked
+
+    def subSequence(self, row: int) -> useq.MDASequence | None:
+        """Return the sub-sequence of `row`, if any."""
+        idx = int(self._seq_index[row])
+        return self._sequences[idx] if idx >= 0 else None
+
+    def subSequences(self) -> list[useq.MDASequence | None]:
+        """Return the sub-sequence of every row."""
+        seqs = self._sequences
+        return [seqs[i] if i >= 0 else None for i in self._seq_index.tolist()]
+
+    def setSubSequence(self, row: int, seq: useq.MDASequence | None) -> None:
+        """Set the sub-sequence of `row` (None or an empty sequence to clear it)."""
+        if seq is None or seq == NULL_SEQUENCE:
+            self._seq_index[row] = -1
+        else:
+            self._seq_index[row] = self._sequence_slot(seq)
+        self._drop_unused_sequences()
+        self.dataChanged.emit(self.index(row, X), self.index(row, SEQ))
+
+    def setPositionData(
+        self,
+        names: list[str | None],
+        coords: np.ndarray,
+        sequences: list[useq.MDASequence],
+        seq_index: np.ndarray,
+    ) -> None:
+        """Replace all positions at once (all rows are checked)."""
+        self.beginResetModel()
+        self._names = list(names)
+        self._coords = np.asarray(coords, dtype=float).reshape(-1, 4)
+        self._checked = np.ones(len(self._names), dtype=bool)
+        self._seq_index = np.asarray(seq_index, dtype=np.intp)
+        self._sequences = list(sequences)
+        self._abs_grid = [_seq_has_absolute_grid(s) for s in self._sequences]
+        self.endResetModel()
+
+    def setXYEnabled(self, enabled: bool) -> None:
+        """Make the x/y cells of all rows editable or read-only."""
+        if enabled != self._xy_enabled:
+            self._xy_enabled = enabled
+            if rows := self.rowCount():
+                self.dataChanged.emit(self.index(0, X), self.index(rows - 1, Y))
+
+    def setAllChecked(self, checked: bool) -> None:
+        """Check or uncheck all rows."""
+        self._checked[:] = checked
+        if rows := self.rowCount():
+            self.dataChanged.emit(
+                self.index(0, NAME),
+                self.index(rows - 1, NAME),
+                [Qt.ItemDataRole.CheckStateRole],
+            )
+
+    # ------------------------- Qt Model API -------------------------
+
+    def rowCount(self, parent: QModelIndex | None = None) -> int:
+        if parent is not None and parent.isValid():
+            return 0
+        return len(self._names)
+
+    def columnCount(self, parent: QModelIndex | None = None) -> int:
+        if parent is not None and parent.isValid():
+            return 0
+        return len(_HEADERS)
+
+    def headerData(
+        self,
+        section: int,
+        orientation: Qt.Orientation,
+        role: int = Qt.ItemDataRole.DisplayRole,
+    ) -> Any:
+        if role == Qt.ItemDataRole.DisplayRole:
+            if orientation == Qt.Orientation.Horizontal:
+                return _HEADERS[section]
+            return str(section + 1)
+        return None
+
+    def flags(self, index: QModelIndex) -> Qt.ItemFlag:
+        flags = Qt.ItemFlag.ItemIsEnabled | Qt.ItemFlag.ItemIsSelectable
+        if not index.isValid():
+            return Qt.ItemFlag.NoItemFlags
+        col = index.column()
+        if col == NAME:
+            return flags | Qt.ItemFlag.ItemIsEditable | Qt.ItemFlag.ItemIsUserCheckable
+        if col == SEQ or (col in (X, Y) and not self._is_xy_editable(index.row())):
+            return flags
+        return flags | Qt.ItemFlag.ItemIsEditable
+
+    def data(self, index: QModelIndex, role: int = Qt.ItemDataRole.DisplayRole) -> Any:
+        if not index.isValid():
+            return None
+        row, col = index.row(), index.column()
+        if col == NAME:
+            if role in (Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.EditRole):
+                return self._names[row] or ""
+            if role == Qt.ItemDataRole.CheckStateRole:
+                return _CHECKED if self._checked[row] else _UNCHECKED
+        elif col == SEQ:
+            if role == Qt.ItemDataRole.DecorationRole:
+                return self._sub_sequence_icon() if self._seq_index[row] >= 0 else None
+            if role == Qt.ItemDataRole.ToolTipRole:
+                return _SEQ_TIP
+        elif role in (Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.EditRole):
+            value = float(self._coords[row, col - X])
+            if np.isnan(value):
+                return "" if role == Qt.ItemDataRole.DisplayRole else None
+            if role == Qt.ItemDataRole.DisplayRole:
+                return f"{value:.{_FLOAT_COLUMNS[col].decimals}f}"
+            return value
+        elif role == Qt.ItemDataRole.TextAlignmentRole:
+            return Qt.AlignmentFlag.AlignCenter
+        elif role == Qt.ItemDataRole.ToolTipRole and col in (X, Y):
+            if not self._xy_enabled:
+                return _GLOBAL_GRID_TIP
+            if not self._is_xy_editable(row):
+                return _ABS_GRID_TIP
+        return None
+
+    def setData(
+        self, index: QModelIndex, value: Any, role: int = Qt.ItemDataRole.EditRole
+    ) -> bool:
+        if not index.isValid():
+            return False
+        row, col = index.row(), index.column()
+        if col == NAME:
+            if role == Qt.ItemDataRole.CheckStateRole:
+                self._checked[row] = getattr(value, "value", value) == _CHECKED.value
+            elif role == Qt.ItemDataRole.EditRole:
+                self._names[row] = str(value) if value else None
+            else:
+                return False
+        elif col in _FLOAT_COLUMNS and role == Qt.ItemDataRole.EditRole:
+            self._coords[row, col - X] = np.nan if value is None else float(value)
+        else:
+            return False
+        self.dataChanged.emit(index, index, [role])
+        return True
+
+    def insertRows(
+        self, row: int, count: int, parent: QModelIndex | None = None
+    ) -> bool:
+        if count < 1 or row < 0 or row > self.rowCount():
+            return False
+        self.beginInsertRows(QModelIndex(), row, row + count - 1)
+        self._names[row:row] = [None] * count
+        self._coords = np.insert(self._coords, row, np.zeros((count, 4)), axis=0)
+        self._checked = np.insert(self._checked, row, np.ones(count, dtype=bool))
+        self._seq_index = np.insert(self._seq_index, row, np.full(count, -1))
+        self.endInsertRows()
+        return True
+
+    def removeRows(
+        self, row: int, count: int, parent: QModelIndex | None = None
+    ) -> bool:
+        if count < 1 or row < 0 or row + count > self.rowCount():
+            return False
+        self.beginRemoveRows(QModelIndex(), row, row + count - 1)
+        del self._names[row : row + count]
+        rows = slice(row, row + count)
+        self._coords = np.delete(self._coords, rows, axis=0)
+        self._checked = np.delete(self._checked, rows)
+        self._seq_index = np.delete(self._seq_index, rows)
+        self._drop_unused_sequences()
+        self.endRemoveRows()
+        return True
+
+    # ------------------------- Private API -------------------------
+
+    def _sequence_slot(self, seq: useq.MDASequence) -> int:
+        """Return the index of `seq` in `_sequences`, adding it if needed."""
+        for i, other in enumerate(self._sequences):
+            if other is seq or other == seq:
+                return i
+        self._sequences.append(seq)
+        self._abs_grid.append(_seq_has_absolute_grid(seq))
+        return len(self._sequences) - 1
+
+    def _drop_unused_sequences(self) -> None:
+        """Remove the sub-sequences that no row refers to anymore."""
+        used = np.unique(self._seq_index[self._seq_index >= 0])
+        if len(used) == len(self._sequences):
+            return
+        remap = np.full(len(self._sequences) + 1, -1, dtype=np.intp)
+        remap[used] = np.arange(len(used))
+        # -1 (no sub-sequence) maps to the last entry of `remap`, i.e. -1
+        self._seq_index = remap[self._seq_index]
+        self._sequences = [self._sequences[i] for i in used.tolist()]
+        self._abs_grid = [self._abs_grid[i] for i in used.tolist()]
+
+    def _is_xy_editable(self, row: int) -> bool:
+        if not self._xy_enabled:
+            return False
+        idx = int(self._seq_index[row])
+        return idx < 0 or not self._abs_grid[idx]
+
+    def _sub_sequence_icon(self) -> QIconifyIcon:
+        if self._seq_icon is None:
+            self._seq_icon = QIconifyIcon("mdi:axis-arrow", color="green")
+        return self._seq_icon
+
+
+class _PositionDelegate(QStyledItemDelegate):
+    """Creates a spinbox editor for the coordinate columns, only while editing."""
+
+    def createEditor(
+        self,
+        parent: QWidget | None,
+        option: QStyleOptionViewItem,
+        index: QModelIndex,
+    ) -> QWidget | None:
+        if (info := _FLOAT_COLUMNS.get(index.column())) is None:
+            return super().createEditor(parent, option, index)
+        editor = cast("QWidget", info._init_widget())
+        editor.setParent(parent)
+        return editor
+
+    def setEditorData(self, editor: QWidget | None, index: QModelIndex) -> None:
+        if index.column() in _FLOAT_COLUMNS:
+            value = index.data(Qt.ItemDataRole.EditRole)
+            cast("QDoubleSpinBox", editor).setValue(0.0 if value is None else value)
+        else:
+            super().setEditorData(editor, index)
+
+    def setModelData(
+        self,
+        editor: QWidget | None,
+        model: QAbstractItemModel | None,
+        index: QModelIndex,
+    ) -> None:
+        if model is not None and index.column() in _FLOAT_COLUMNS:
+            spinbox = cast("QDoubleSpinBox", editor)
+            spinbox.interpretText()
+            model.setData(index, spinbox.value(), Qt.ItemDataRole.EditRole)
+        else:
+            super().setModelData(editor, model, index)
+
+
+class VirtualPositionTable(QWidget):
+    """Table to edit a very long list of [useq.Position](https://pymmcore-plus.github.io/useq-schema/schema/axes/#useq.Position).
+
+    Has the same `value`/`setValue` API as [PositionTable](../PositionTable#), but
+    keeps the positions in a `PositionArrayModel` shown by a `QTableView`, instead of
+    creating a widget for every cell. Setting tens of thousands of positions
+    (e.g. from the HCS wizard) takes a fraction of a second, and `useq.Position`
+    objects are only created by `value()`. Cells are edited with a spinbox that only
+    exists while editing, and sub-sequences are edited by double-clicking the
+    "Sub-Sequence" column.
+
+    Parameters
+    ----------
+    rows : int
+        Number of (default) rows to initialize the table with, by default 0.
+    parent : QWidget | None
+        Optional parent widget, by default None.
+    """
+
+    valueChanged = Signal()
+
+    def __init__(self, rows: int = 0, parent: QWidget | None = None):
+        super().__init__(parent)
+
+        # -------- table --------
+        self._model = PositionArrayModel(self)
+        if rows:
+            self._model.insertRows(0, rows)
+        self._view = QTableView(self)
+        self._view.setModel(self._model)
+        self._view.setItemDelegate(_PositionDelegate(self._view))
+        cast("QHeaderView", self._view.verticalHeader()).setVisible(False)
+        h_header = cast("QHeaderView", self._view.horizontalHeader())
+        h_header.setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
+        self._view.setSelectionBehavior(QTableView.SelectionBehavior.SelectRows)
+        self._view.doubleClicked.connect(self._on_double_clicked)
+
+        self._model.dataChanged.connect(self.valueChanged)
+        self._model.rowsInserted.connect(self.valueChanged)
+        self._model.rowsRemoved.connect(self.valueChanged)
+        self._model.modelReset.connect(self.valueChanged)
+
+        # -------- actions (for toolbar below) --------
+        # fmt: off
+        red = "#C33"
+        green = "#3A3"
+        gray = "#666"
+
+        self.act_add_row = QAction(QIconifyIcon('mdi:plus-thick', color=green), "Add new row", self) # noqa
+        self.act_add_row.triggered.connect(self._add_row)
+
+        self.act_check_all = QAction(QIconifyIcon('mdi:checkbox-multiple-marked-outline', color=gray), "Select all rows", self)  # noqa
+        self.act_check_all.triggered.connect(lambda: self._model.setAllChecked(True))
+
+        self.act_check_none = QAction(QIconifyIcon('mdi:checkbox-multiple-blank-outline', color=gray), "Clear selection", self)  # noqa
+        self.act_check_none.triggered.connect(lambda: self._model.setAllChecked(False))
+
+        self.act_remove_row = QAction(QIconifyIcon('mdi:close-box-outline', color=red), "Remove selected row", self)  # noqa
+        self.act_remove_row.triggered.connect(self._remove_selected)
+
+        self.act_clear = QAction(QIconifyIcon('mdi:close-box-multiple-outline', color=red), "Remove all rows", self)  # noqa
+        self.act_clear.triggered.connect(self._remove_all)
+        # fmt: on
+
+        # -------- toolbar --------
+        self._toolbar = QToolBar(self)
+        self._toolbar.setFloatable(False)
+        self._toolbar.setIconSize(QSize(22, 22))
+        spacer = QWidget()
+        spacer.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Expanding)
+        self._toolbar.addWidget(spacer)
+        self._toolbar.addAction(self.act_add_row)
+        self._toolbar.addSeparator()  # ------------
+        self._toolbar.addAction(self.act_check_all)
+        self._toolbar.addAction(self.act_check_none)
+        self._toolbar.addSeparator()  # ------------
+        self._toolbar.addAction(self.act_remove_row)
+        self._toolbar.addAction(self.act_clear)
+
+        # -------- options --------
+        self.include_z = QCheckBox("Include Z")
+        self.include_z.setChecked(True)
+        self.include_z.toggled.connect(self._on_include_z_toggled)
+
+        self.af_per_position = QCheckBox("Set AF Offset per Position")
+        self.af_per_position.setToolTip(AF_PER_POS_TOOLTIP)
+        self.af_per_position.toggled.connect(self._on_af_per_position_toggled)
+        self._on_af_per_position_toggled(self.af_per_position.isChecked())
+
+        self._save_button = QPushButton("Save...")
+        self._save_button.clicked.connect(self.save)
+        self._load_button = QPushButton("Load...")
+        self._load_button.clicked.connect(self.load)
+
+        self._btn_row = QHBoxLayout()
+        self._btn_row.setSpacing(15)
+        self._btn_row.addWidget(self.include_z)
+        self._btn_row.addWidget(self.af_per_position)
+        self._btn_row.addStretch()
+        self._btn_row.addWidget(self._save_button)
+        self._btn_row.addWidget(self._load_button)
+
+        # -------- layout --------
+        layout = QVBoxLayout(self)
+        layout.setSpacing(5)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.addWidget(self._toolbar)
+        layout.addWidget(self._view)
+        layout.addLayout(self._btn_row)
+
+    # ------------------------- Public API -------------------------
+
+    def model(self) -> PositionArrayModel:
+        return self._model
+
+    def view(self) -> QTableView:
+        return self._view
+
+    def toolBar(self) -> QToolBar:
+        return self._toolbar
+
+    def value(
+        self, exclude_unchecked: bool = True, exclude_hidden_cols: bool = True
+    ) -> Sequence[useq.Position]:
+        """Return the current value of the table as a tuple of [useq.Position](https://pymmcore-plus.github.io/useq-schema/schema/axes/#useq.Position).
+
+        Parameters
+        ----------
+        exclude_unchecked : bool, optional
+            Exclude unchecked rows, by default True
+        exclude_hidden_cols : bool, optional
+            Exclude the Z position (if `include_z` is unchecked) and the AF offset
+            (if `af_per_position` is unchecked), by default True
+
+        Returns
+        -------
+        tuple[useq.Position, ...]
+            A tuple of [useq.Position](https://pymmcore-plus.github.io/useq-schema/schema/axes/#useq.Position).
+        """
+        model = self._model
+        rows = np.arange(model.rowCount())
+        if exclude_unchecked:
+            rows = rows[model.checked()]
+        if not rows.size:
+            return ()
+
+        use_z = not exclude_hidden_cols or self.include_z.isChecked()
+        use_af = not exclude_hidden_cols or (
+            self.af_per_position.isChecked() and self.af_per_position.isEnabled()
+        )
+        # convert once to python objects, NaN means "not set"
+        coords = model.coords()[rows]
+        values = coords.astype(object)
+        values[np.isnan(coords)] = None
+        names = model.names()
+        seqs = model.subSequences()
+        out: list[useq.Position] = []
+        for row, (x, y, z, af) in zip(rows.tolist(), values.tolist(), strict=True):
+            sub = seqs[row]
+            if use_af and af is not None:
+                sub_dict = sub.model_dump() if sub is not None else {}
+                sub_dict["autofocus_plan"] = useq.AxesBasedAF(
+                    autofocus_motor_offset=af, axes=("p",)
+                )
+                sub = useq.MDASequence(**sub_dict)
+            # an absolute grid plan in the sub-sequence defines x/y
+            if _seq_has_absolute_grid(sub):
+                x = y = None
+            out.append(
+                useq.Position(
+                    x=x,
+                    y=y,
+                    z=z if use_z else None,
+                    name=names[row],
+                    sequence=sub,
+                )
+            )
+        return tuple(out)
+
+    def setValue(self, value: Iterable[useq.Position]) -> None:
+        """Set the current value of the table from a Sequence of [useq.Position](https://pymmcore-plus.github.io/useq-schema/schema/axes/#useq.Position).
+
+        Parameters
+        ----------
+        value : Iterable[useq.Position]
+            An iterable of [useq.Position](https://pymmcore-plus.github.io/useq-schema/schema/axes/#useq.Position)
+            (or of objects that can be cast to one).
+        """
+        positions = [
+            v if isinstance(v, useq.Position) else useq.Position.model_validate(v)
+            for v in value
+        ]
+        model = self._model
+        names: list[str | None] = []
+        coords = np.full((len(positions), 4), np.nan)
+        seq_index = np.full(len(positions), -1, dtype=np.intp)
+        sequences: list[useq.MDASequence] = []
+        # {id(original sub-sequence): index in `sequences` (-1 if empty)}
+        slots: dict[int, int] = {}
+        use_af = False
+        for row, p in enumerate(positions):
+            names.append(p.name)
+            coords[row, :3] = (_nan(p.x), _nan(p.y), _nan(p.z))
+            if (seq := p.sequence) is None:
+                continue
+            if (af := seq.autofocus_plan) is not None:
+                coords[row, 3] = af.autofocus_motor_offset or 0.0
+                use_af = True
+            if (slot := slots.get(id(seq))) is None:
+                # the AF plan is shown in the AF column instead
+                if af is not None:
+                    seq = useq.MDASequence(**seq.model_dump(exclude={"autofocus_plan"}))
+                if seq == NULL_SEQUENCE:
+                    slot = -1
+                else:
+                    # equal (but distinct) sub-sequences, e.g. loaded from a file
+                    slot = next(
+                        (i for i, other in enumerate(sequences) if other == seq),
+                        len(sequences),
+                    )
+                    if slot == len(sequences):
+                        sequences.append(seq)
+                slots[id(p.sequence)] = slot
+            seq_index[row] = slot
+
+        z = coords[:, 2]
+        n_with_z = int(np.count_nonzero(~np.isnan(z)))
+        if (include_z := n_with_z > 0) and n_with_z < len(positions):
+            warnings.warn(
+                "Only some positions have a z-position set. Z will be included, "
+                "but missing z-positions will be set to 0.",
+                stacklevel=2,
+            )
+            z[np.isnan(z)] = 0.0
+        coords[np.isnan(coords[:, 3]), 3] = 0.0
+
+        with signals_blocked(self):
+            model.setPositionData(names, coords, sequences, seq_index)
+            self.include_z.setChecked(include_z)
+            self.af_per_position.setChecked(use_af)
+
+    def setXYEnabled(self, enabled: bool) -> None:
+        """Disable or enable X/Y columns for all rows (e.g. global absolute grid)."""
+        self._model.setXYEnabled(enabled)
+
+    def save(self, file: str | Path | None = None) -> None:
+        """Save the current positions to a JSON file."""
+        _save_positions(self, file, self.value())
+
+    def load(self, file: str | Path | None = None) -> None:
+        """Load positions from a JSON file and set the table value."""
+        if (positions := _load_positions(self, file)) is not None:
+            self.setValue(positions)
+
+    # ------------------------- Private API -------------------------
+
+    def _add_row(self) -> None:
+        self._model.insertRows(self._model.rowCount(), 1)
+
+    def _remove_selected(self) -> None:
+        """Remove the selected rows, one contiguous block at a time."""
+        if (selection := self._view.selectionModel()) is None:
+            return  # pragma: no cover
+        rows = sorted({i.row() for i in selection.selectedRows()}, reverse=True)
+        while rows:
+            end = start = rows.pop(0)
+            while rows and rows[0] == start - 1:
+                start = rows.pop(0)
+            self._model.removeRows(start, end - start + 1)
+
+    def _remove_all(self) -> None:
+        self._model.removeRows(0, self._model.rowCount())
+
+    def _on_double_clicked(self, index: QModelIndex) -> None:
+        if index.column() != SEQ:
+            return
+        dialog = _MDAPopup(self._model.subSequence(index.row()), self)
+        if dialog.exec():
+            self._model.setSubSequence(index.row(), dialog.mda_tabs.value())
+
+    def _on_include_z_toggled(self, checked: bool) -> None:
+        self._view.setColumnHidden(Z, not checked)
+        self.valueChanged.emit()
+
+    def _on_af_per_position_toggled(self, checked: bool) -> None:
+        self._view.setColumnHidden(AF, not checked)
+        self.valueChanged.emit()
+
+
+def _nan(value: float | None) -> float:
+    return np.nan if value is None else value
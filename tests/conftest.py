@@ -12,7 +12,7 @@ import pytest
 from pymmcore_plus import CMMCorePlus
 from pymmcore_plus._accumulator import DeviceAccumulator
 from pymmcore_plus.core import _mmcore_plus
-from qtpy.QtCore import QEvent
+from qtpy.QtCore import QEvent, QSettings
 
 if TYPE_CHECKING:
     from collections.abc import Callable, Iterator
@@ -155,6 +155,16 @@ def _mock_pyconify(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Iterator[
     yield
 
 
+@pytest.fixture(autouse=True)
+def _isolate_timing_profiles(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Store the MDA timing profiles in tmp_path, not in the user's settings."""
+    ini = str(tmp_path / "timing_profiles.ini")
+    monkeypatch.setattr(
+        "pymmcore_widgets.mda._timing._settings",
+        lambda: QSettings(ini, QSettings.Format.IniFormat),
+    )
+
+
 @pytest.fixture(autouse=True)
 def _mock_available_versions(monkeypatch: pytest.MonkeyPatch) -> Iterator[None]:
     """Mock pymmcore_plus available_versions to avoid network requests."""
@@ -313,17 +313,29 @@ def test_set_config_groups_round_trip(global_mmcore: CMMCorePlus) -> None:
 
 
 def test_set_config_groups_emits_signals(global_mmcore: CMMCorePlus) -> None:
-    """set_config_groups emits configDefined once per group (not per setting)."""
+    """set_config_groups emits configDefined once per changed group only."""
     groups = list(get_config_groups(global_mmcore))
     defined: list[str] = []
+    deleted: list[str] = []
     global_mmcore.events.configDefined.connect(lambda g, *_: defined.append(g))
+    global_mmcore.events.configGroupDeleted.connect(deleted.append)
 
+    # nothing changed: nothing is applied
     set_config_groups(global_mmcore, groups)
-
-    groups_with_settings = [
-        g for g in groups if any(s for p in g.presets.values() for s in p.settings)
+    assert not defined
+    assert not deleted
+
+    # a single changed setting only touches its group
+    camera = next(g for g in groups if g.name == "Camera")
+    preset = next(iter(camera.presets.values()))
+    setting = next(s for s in preset.settings if s.property_name == "Binning")
+    setting.value = "8"
+    set_config_groups(global_mmcore, groups)
+    assert defined == ["Camera"]
+    assert not deleted
+    assert ("Camera", "Binning", "8") in [
+        tuple(s) for s in global_mmcore.getConfigData("Camera", preset.name)
     ]
-    assert len(defined) == len(groups_with_settings)
 
 
 def test_editor_dirty_groups(editor: ConfigGroupsEditor) -> None:
@@ -4,7 +4,7 @@ from typing import TYPE_CHECKING
 
 import pytest
 from pymmcore_plus import CMMCorePlus
-from qtpy.QtCore import QModelIndex, Qt
+from qtpy.QtCore import QModelIndex, QSortFilterProxyModel, Qt
 from qtpy.QtGui import QFont, QIcon, QPixmap
 
 from pymmcore_widgets._models import (
@@ -346,6 +346,50 @@ def test_standard_item_model(
     qtmodeltester.check(model)
 
 
+@pytest.mark.parametrize("n", [10, 5000])
+def test_tree_model_large(n: int) -> None:
+    """Parent lookups in models with thousands of nodes (cached node rows)."""
+    presets = {
+        f"P{i}": ConfigPreset(
+            name=f"P{i}",
+            settings=[DevicePropertySetting(device="Camera", property_name="Mode")],
+        )
+        for i in range(n)
+    }
+    model = QConfigGroupsModel([ConfigGroup(name="Big", presets=presets)])
+    group_idx = model.index(0, 0)
+
+    def _check_parents(parent: QModelIndex) -> None:
+        for row in range(model.rowCount(parent)):
+            preset_idx = model.index(row, 0, parent)
+            if model.rowCount(preset_idx):
+                child = model.index(0, 0, preset_idx)
+                assert model.parent(child).row() == row
+
+    _check_parents(group_idx)
+    # cached rows are kept up to date on insert and remove
+    model.removeRows(0, 2, group_idx)
+    assert model.rowCount(group_idx) == n - 2
+    _check_parents(group_idx)
+    model.add_preset(group_idx, "New")
+    model.insertRows(0, 1, group_idx)
+    assert model.index(0, 0, group_idx).data() == "Preset"
+    _check_parents(group_idx)
+
+    device = Device(
+        label="Big",
+        properties=tuple(
+            DevicePropertySetting(device="Big", property_name=f"Prop{i}")
+            for i in range(n)
+        ),
+    )
+    dev_model = QDevicePropertyModel([device])
+    dev_idx = dev_model.index(0, 0)
+    last = dev_model.index(n - 1, 0, dev_idx)
+    assert dev_model.parent(last) == dev_idx
+    assert last.data(Qt.ItemDataRole.UserRole).property_name == f"Prop{n - 1}"
+
+
 def test_pivot_model(model: QConfigGroupsModel, qtmodeltester: ModelTester) -> None:
     pivot = ConfigGroupPivotModel()
     pivot.setSourceModel(model)
@@ -468,6 +512,50 @@ def test_pivot_model_two_way_sync(
     assert pivot.columnCount() == 3
 
 
+def test_pivot_model_incremental(model: QConfigGroupsModel, qtbot: QtBot) -> None:
+    pivot = ConfigGroupPivotModel()
+    pivot.setSourceModel(model)
+    pivot.setGroup("Camera")
+    camera_idx = model.index_for_group("Camera")
+    resets: list[bool] = []
+    pivot.modelReset.connect(lambda: resets.append(True))
+
+    # editing a value only touches its cell
+    highres_idx = model.index_for_preset(camera_idx, "HighRes")
+    with qtbot.waitSignal(pivot.dataChanged) as blocker:
+        model.setData(model.index(1, 2, highres_idx), "12")
+    top_left, bottom_right = blocker.args[:2]
+    assert (top_left.row(), top_left.column()) == (1, 0)
+    assert (bottom_right.row(), bottom_right.column()) == (1, 0)
+    assert pivot.data(pivot.index(1, 0)) == "12"
+
+    # adding a preset inserts a column, removing it removes the column
+    with qtbot.waitSignal(pivot.columnsInserted):
+        new_idx = model.add_preset(camera_idx, "TestPreset")
+    assert pivot.columnCount() == 4
+    with qtbot.waitSignal(pivot.rowsInserted):
+        model.update_preset_settings(
+            new_idx, [DevicePropertySetting(device="Camera", property_name="Mode")]
+        )
+    assert pivot.headerData(2, Qt.Orientation.Vertical) == "Camera-Mode"
+    with qtbot.waitSignal(pivot.columnsRemoved):
+        model.remove(new_idx)
+    assert pivot.columnCount() == 3
+    assert pivot.rowCount() == 2
+
+    # renaming a preset updates the header
+    with qtbot.waitSignal(pivot.headerDataChanged):
+        model.setData(model.index_for_preset(camera_idx, "LowRes"), "Low")
+    assert pivot.headerData(1, Qt.Orientation.Horizontal) == "Low"
+
+    # changes in other groups are ignored
+    with qtbot.assertNotEmitted(pivot.dataChanged):
+        channel_idx = model.index_for_group("Channel")
+        preset_idx = model.index(0, 0, channel_idx)
+        model.setData(model.index(0, 2, preset_idx), "foo")
+    assert not resets
+
+
 # ── QDevicePropertyModel tests ─────────────────────────────────────
 
 
@@ -661,3 +749,45 @@ def test_device_property_flat_proxy_sort(
         first = proxy.index(0, 0).data() or ""
         second = proxy.index(1, 0).data() or ""
         assert first >= second
+
+
+def test_device_property_flat_proxy_incremental(
+    device_model: QDevicePropertyModel,
+) -> None:
+    filtered = QSortFilterProxyModel()
+    filtered.setRecursiveFilteringEnabled(True)
+    filtered.setSourceModel(device_model)
+    proxy = DevicePropertyFlatProxy()
+    proxy.setSourceModel(filtered)
+    resets: list[bool] = []
+    proxy.modelReset.connect(lambda: resets.append(True))
+
+    def _flat_rows() -> list[tuple[str, str]]:
+        return [
+            (proxy.index(r, 0).data(), proxy.index(r, 1).data())
+            for r in range(proxy.rowCount())
+        ]
+
+    def _expected() -> list[tuple[str, str]]:
+        rows = []
+        for d in range(filtered.rowCount()):
+            dev_idx = filtered.index(d, 0)
+            for p in range(filtered.rowCount(dev_idx)):
+                rows.append((dev_idx.data(), filtered.index(p, 0, dev_idx).data()))
+        return rows
+
+    n_rows = proxy.rowCount()
+    filtered.setFilterFixedString("Binning")
+    assert 0 < proxy.rowCount() < n_rows
+    assert _flat_rows() == _expected()
+    filtered.setFilterFixedString("")
+    assert _flat_rows() == _expected()
+
+    # inserted rows are placed according to the current sort order
+    proxy.sort(1, Qt.SortOrder.DescendingOrder)
+    filtered.setFilterFixedString("Mode")
+    filtered.setFilterFixedString("")
+    props = [p for _, p in _flat_rows()]
+    assert props == sorted(props, reverse=True)
+    assert sorted(_flat_rows()) == sorted(_expected())
+    assert not resets
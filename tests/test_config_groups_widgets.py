@@ -335,6 +335,65 @@ def test_undo_change_property_value(
     assert value_idx.data(Qt.ItemDataRole.DisplayRole) == old_value
 
 
+def test_undo_change_property_value_merge(
+    undo_model: tuple[QConfigGroupsModel, QUndoStack],
+) -> None:
+    model, stack = undo_model
+    grp_idx = model.index(0, 0)
+    preset_idx = model.index(0, 0, grp_idx)
+    value_idx = model.index(0, 2, preset_idx)
+    old_value = value_idx.data(Qt.ItemDataRole.DisplayRole)
+
+    # repeated edits of the same cell are a single undo step
+    stack.push(ChangePropertyValueCommand(model, value_idx, "A"))
+    stack.push(ChangePropertyValueCommand(model, value_idx, "B"))
+    assert stack.count() == 1
+    stack.undo()
+    assert value_idx.data(Qt.ItemDataRole.DisplayRole) == old_value
+    stack.redo()
+    assert value_idx.data(Qt.ItemDataRole.DisplayRole) == "B"
+
+    # editing back to the original value drops the command
+    stack.push(ChangePropertyValueCommand(model, value_idx, old_value))
+    assert stack.count() == 0
+    assert value_idx.data(Qt.ItemDataRole.DisplayRole) == old_value
+
+    # edits of other cells are not merged
+    stack.push(ChangePropertyValueCommand(model, value_idx, "A"))
+    stack.push(ChangePropertyValueCommand(model, model.index(1, 2, preset_idx), "C"))
+    assert stack.count() == 2
+
+
+def test_undo_commands_share_settings(
+    undo_model: tuple[QConfigGroupsModel, QUndoStack],
+) -> None:
+    model, stack = undo_model
+    grp_idx = model.index_for_group("Camera")
+    group = grp_idx.data(Qt.ItemDataRole.UserRole)
+
+    # removed groups are restored as the same object, not a copy
+    stack.push(RemoveGroupCommand(model, grp_idx))
+    stack.undo()
+    assert model.index_for_group("Camera").data(Qt.ItemDataRole.UserRole) is group
+
+    preset_idx = model.index_for_preset("Camera", "HighRes")
+    old_settings = list(preset_idx.data(Qt.ItemDataRole.UserRole).settings)
+    old_value = old_settings[0].value
+    new_setting = DevicePropertySetting(device="D", property_name="P")
+    new_settings = [old_settings[0], new_setting]
+    stack.push(UpdatePresetSettingsCommand(model, preset_idx, new_settings))
+    settings = preset_idx.data(Qt.ItemDataRole.UserRole).settings
+    assert settings[0] is old_settings[0]  # unchanged settings are shared
+    assert settings[1] is not new_setting  # foreign ones are copied
+
+    # values edited in place are restored on undo
+    settings[0].value = "changed"
+    stack.undo()
+    settings = preset_idx.data(Qt.ItemDataRole.UserRole).settings
+    assert all(a is b for a, b in zip(settings, old_settings, strict=True))
+    assert settings[0].value == old_value
+
+
 def test_undo_update_preset_settings(
     undo_model: tuple[QConfigGroupsModel, QUndoStack],
 ) -> None:
@@ -9,6 +9,7 @@ from pymmcore_plus.model import Microscope
 from qtpy.QtCore import Qt
 from qtpy.QtGui import QCloseEvent, QFocusEvent
 
+from pymmcore_widgets._models._core_metadata import CoreMetadataCache
 from pymmcore_widgets.hcwizard import devices_page
 from pymmcore_widgets.hcwizard._dev_setup_dialog import DeviceSetupDialog
 from pymmcore_widgets.hcwizard._peripheral_setup_dialog import PeripheralSetupDlg
@@ -160,6 +161,23 @@ def test_device_setup_dialog(qtbot, global_mmcore: CMMCorePlus):
     assert "MyHub" not in global_mmcore.getLoadedDevices()
 
 
+def test_device_setup_dialog_invalidates_metadata(qtbot, global_mmcore: CMMCorePlus):
+    cache = CoreMetadataCache.for_core(global_mmcore)
+    cache.device_info("Camera")
+    cache.property_info("Camera", "Binning")
+    dlg = DeviceSetupDialog.for_loaded_device(global_mmcore, "Camera")
+    qtbot.addWidget(dlg)
+
+    # reloading (or initializing) a device drops its cached metadata
+    dlg._reload_device()
+    assert "Camera" not in cache._devices
+    assert ("Camera", "Binning") not in cache._properties
+    cache.device_info("Camera")
+    dlg._on_ok_clicked()
+    assert "Camera" not in cache._devices
+    assert cache.property_info("Camera", "Binning")["allowed_values"]
+
+
 def test_peripheral_setup_dialog(qtbot, global_mmcore: CMMCorePlus):
     model = Microscope.create_from_core(global_mmcore)
 
@@ -3,11 +3,17 @@ from __future__ import annotations
 import os
 from typing import TYPE_CHECKING
 
+import numpy as np
+import pytest
 from qtpy.QtWidgets import QApplication
 
 from pymmcore_widgets import CoreLogWidget
+from pymmcore_widgets._log_index import _GrowingArray, _tail_lines
+from pymmcore_widgets._log_profiler import DeviceCallProfiler
 
 if TYPE_CHECKING:
+    from pathlib import Path
+
     from pymmcore_plus import CMMCorePlus
     from pytestqt.qtbot import QtBot
 
@@ -26,7 +32,7 @@ def test_core_log_widget_init(qtbot: QtBot, global_mmcore: CMMCorePlus) -> None:
         global_mmcore.loadSystemConfiguration()
 
     def _check_log() -> None:
-        if "Finished initializing" not in wdg._log_view.toPlainText():
+        if "Finished initializing" not in wdg._model.visibleText():
             raise AssertionError("CoreLogWidget did not finish initializing.")
 
     qtbot.waitUntil(_check_log, timeout=1000)
@@ -35,7 +41,7 @@ def test_core_log_widget_init(qtbot: QtBot, global_mmcore: CMMCorePlus) -> None:
 def test_core_log_widget_update(qtbot: QtBot, global_mmcore: CMMCorePlus) -> None:
     wdg = CoreLogWidget()
     qtbot.addWidget(wdg)
-    wdg._log_view.clear()
+    wdg.clear()
 
     # Write directly to the log file rather than using logMessage(), which goes
     # through C++ std::ofstream buffering that may not flush to disk in time
@@ -51,7 +57,7 @@ def test_core_log_widget_update(qtbot: QtBot, global_mmcore: CMMCorePlus) -> Non
         QApplication.processEvents()
         wdg._reader._read_new()
         QApplication.processEvents()
-        if f"[IFO,App] {new_message}" not in wdg._log_view.toPlainText():
+        if f"[IFO,App] {new_message}" not in wdg._model.visibleText():
             raise AssertionError("New message not found in CoreLogWidget.")
 
     qtbot.waitUntil(wait_for_update)
@@ -61,9 +67,9 @@ def test_core_log_widget_clear(qtbot: QtBot, global_mmcore: CMMCorePlus) -> None
     wdg = CoreLogWidget()
     qtbot.addWidget(wdg)
 
-    assert wdg._log_view.toPlainText() != ""
+    qtbot.waitUntil(lambda: wdg._model.visibleText() != "")
     wdg._clear_btn.click()
-    assert wdg._log_view.toPlainText() == ""
+    assert wdg._model.visibleText() == ""
 
 
 def test_core_log_widget_debug(qtbot: QtBot, global_mmcore: CMMCorePlus) -> None:
@@ -80,27 +86,32 @@ def test_core_log_widget_debug(qtbot: QtBot, global_mmcore: CMMCorePlus) -> None
     assert global_mmcore.debugLogEnabled() == is_debug_enabled
 
 
-def test_core_log_widget_autoscroll(qtbot: QtBot, global_mmcore: CMMCorePlus) -> None:
-    wdg = CoreLogWidget()
+def _log_line(
+    msg: str, level: str = "IFO", component: str = "App", tid: int = 1
+) -> str:
+    return f"2025-01-01T00:00:00.000000 tid{tid} [{level},{component}] {msg}\n"
+
+
+def test_core_log_widget_autoscroll(
+    qtbot: QtBot, global_mmcore: CMMCorePlus, tmp_path: Path
+) -> None:
+    log = tmp_path / "log.txt"
+    log.write_text(_log_line("first"))
+    wdg = CoreLogWidget(path=str(log))
     qtbot.addWidget(wdg)
     # Note that we must show the widget for the scrollbar maximum to be computed
     wdg.show()
     sb = wdg._log_view.verticalScrollBar()
     assert sb is not None
 
-    # Stop the log file reader so only explicit _append_line calls affect
-    # the scrollbar. Otherwise the reader's poll timer can add extra lines
-    # during processEvents, causing the scrollbar maximum to jump
-    # unpredictably (especially under parallel test execution).
-    wdg._reader._stop()
-
     def add_new_line() -> None:
-        wdg._append_line("Test message")
+        with open(log, "a") as f:
+            f.write(_log_line("Test message"))
+        wdg._reader._read_new()
         QApplication.processEvents()
 
     # Make sure we have a scrollbar with nonzero size to test with
     # But we don't want it full yet
-    wdg._log_view.clear()
     while sb.maximum() == 0:
         add_new_line()
 
@@ -115,3 +126,204 @@ def test_core_log_widget_autoscroll(qtbot: QtBot, global_mmcore: CMMCorePlus) ->
     add_new_line()
     qtbot.waitUntil(lambda: sb.maximum() > old_max)
     assert sb.value() == sb.maximum()
+
+
+def test_core_log_widget_reader_thread(
+    qtbot: QtBot, global_mmcore: CMMCorePlus
+) -> None:
+    wdg = CoreLogWidget()
+    qtbot.addWidget(wdg)
+
+    # the reader lives (and reads) in its own thread
+    assert wdg._reader_thread.isRunning()
+    assert wdg._reader.thread() is wdg._reader_thread
+    assert wdg._reader.thread() is not QApplication.instance().thread()
+
+    wdg.close()
+    assert not wdg._reader_thread.isRunning()
+    assert wdg._reader._file is None
+
+
+def test_core_log_widget_full_index(
+    qtbot: QtBot, global_mmcore: CMMCorePlus, tmp_path: Path
+) -> None:
+    log = tmp_path / "log.txt"
+    log.write_text("".join(_log_line(f"line {i}") for i in range(1000)))
+    wdg = CoreLogWidget(path=str(log), max_lines=10)
+    qtbot.addWidget(wdg)
+
+    # the tail is shown first, the rest of the file is indexed in the background
+    qtbot.waitUntil(lambda: wdg._model.rowCount() == 1000)
+    assert wdg._model.lineText(0).endswith("line 0")
+    assert wdg._model.lineText(999).endswith("line 999")
+
+
+def test_core_log_widget_filter_and_search(
+    qtbot: QtBot, global_mmcore: CMMCorePlus, tmp_path: Path
+) -> None:
+    log = tmp_path / "log.txt"
+    log.write_text(
+        _log_line("camera ok", "dbg", "dev:Camera", tid=1)
+        + _log_line("stage moved", "IFO", "dev:XY", tid=2)
+        + "  continued stage message\n"
+        + _log_line("camera failed", "ERR", "dev:Camera", tid=1)
+        + _log_line("core msg", "WRN", "Core", tid=3)
+    )
+    wdg = CoreLogWidget(path=str(log))
+    qtbot.addWidget(wdg)
+    model = wdg._model
+    qtbot.waitUntil(lambda: model.rowCount() == 5)
+    assert wdg._device_combo.findData("dev:Camera") > 0
+    assert wdg._thread_combo.findData(3) > 0
+
+    # filter by level
+    wdg._level_combo.setCurrentIndex(wdg._level_combo.findData(3))  # >= WRN
+    assert model.visibleText().splitlines()[0].endswith("camera failed")
+    assert model.rowCount() == 2
+
+    # filter by device (continuation lines belong to the preceding entry)
+    wdg._level_combo.setCurrentIndex(0)
+    wdg._device_combo.setCurrentIndex(wdg._device_combo.findData("dev:XY"))
+    assert model.visibleText().splitlines() == [
+        _log_line("stage moved", "IFO", "dev:XY", tid=2).strip(),
+        "  continued stage message",
+    ]
+
+    # filter by thread
+    wdg._device_combo.setCurrentIndex(0)
+    wdg._thread_combo.setCurrentIndex(wdg._thread_combo.findData(1))
+    assert model.rowCount() == 2
+
+    # regex search runs in a worker thread
+    wdg._thread_combo.setCurrentIndex(0)
+    wdg._search.setText("camera (ok|failed)")
+    qtbot.waitUntil(lambda: model.rowCount() == 2)
+    assert "camera ok" in model.visibleText()
+
+    # new lines are matched as they arrive
+    with open(log, "a") as f:
+        f.write(_log_line("camera ok again"))
+        f.write(_log_line("unrelated"))
+    wdg._reader._read_new()
+    qtbot.waitUntil(lambda: model.rowCount() == 3)
+
+    wdg._search.clear()
+    qtbot.waitUntil(lambda: model.rowCount() == 7)
+
+    # invalid patterns (e.g. while typing) clear the search instead of raising
+    wdg._search.setText("camera (")
+    wdg._start_search()
+    assert model.rowCount() == 7
+    assert wdg._status.text().startswith("Invalid regex")
+    model.setSearchResults("[", np.empty(0, np.int64))
+    assert model.rowCount() == 7
+
+
+def test_growing_array() -> None:
+    buf = _GrowingArray(np.arange(3))
+    for i in range(3, 100, 7):
+        view = buf.extend(np.arange(i, min(i + 7, 100)))
+    assert np.array_equal(view, np.arange(100))
+    # the capacity doubles, rather than growing on every extend
+    assert len(buf._data) < 200
+
+
+def test_tail_lines(tmp_path: Path) -> None:
+    lines = [f"[IFO,App] message {i}" for i in range(1000)]
+    log = tmp_path / "log.txt"
+    log.write_text("\n".join(lines) + "\n")
+
+    # small blocks force several backwards reads, with lines split across blocks
+    assert _tail_lines(str(log), 10, block_size=7) == lines[-10:]
+    assert _tail_lines(str(log), 5000) == lines
+    assert _tail_lines(str(log), 0) == []
+
+    # no trailing newline
+    log.write_text("\n".join(lines[:3]))
+    assert _tail_lines(str(log), 2, block_size=4) == lines[1:3]
+
+
+# real CoreLog lines (debug logging, demo config), with the timestamps adjusted
+_CORE_CALLS = """\
+2025-01-01T00:00:00.000000 tid7 [dbg,Core] Will start absolute move of XY to \
+position (10.000, 20.000) um
+2025-01-01T00:00:00.001000 tid7 [dbg,Core] Waiting for device XY...
+2025-01-01T00:00:00.250000 tid7 [dbg,Core] Finished waiting for device XY
+2025-01-01T00:00:00.300000 tid7 [dbg,Core] Will start relative move of Z by offset \
+1.00000 um
+2025-01-01T00:00:00.301000 tid7 [dbg,Core] Waiting for device Z...
+2025-01-01T00:00:00.400000 tid7 [dbg,Core] Finished waiting for device Z
+2025-01-01T00:00:00.500000 tid7 [dbg,Core] Will set Objective to label Nikon 10X S Fluor
+2025-01-01T00:00:00.550000 tid7 [dbg,Core] Did set Objective to label Nikon 10X S Fluor
+2025-01-01T00:00:01.000000 tid7 [dbg,Core] Will snap image from current camera
+2025-01-01T00:00:01.010000 tid7 [dbg,dev:Camera] Reading property ScanMode
+2025-01-01T00:00:01.020000 tid7 [dbg,Core] Did snap image from current camera
+2025-01-01T00:00:01.100000 tid7 [dbg,Core:dev:Camera] Will set property "Binning" to "2"
+2025-01-01T00:00:01.105000 tid7 [dbg,Core:dev:Camera] Did set property "Binning" to "2"
+2025-01-01T00:00:01.200000 tid7 [dbg,Core] Will set Core property: AutoShutter = 0
+2025-01-01T00:00:01.201000 tid7 [dbg,Core] Did set Core property: AutoShutter = 0
+2025-01-01T00:00:02.000000 tid8 [dbg,Core] Did set camera Camera exposure to 20.000 ms
+"""
+
+
+def test_device_call_profiler() -> None:
+    profiler = DeviceCallProfiler()
+    profiler.feed(_CORE_CALLS.encode().splitlines())
+    stats = profiler.snapshot()
+    # unmatched "Did" lines are ignored
+    assert set(stats) == {
+        ("XY", "absolute move"),
+        ("XY", "wait"),
+        ("Z", "relative move"),
+        ("Z", "wait"),
+        ("Objective", "set state label"),
+        ("Core", "snap image"),
+        ("Camera", "set property Binning"),
+        ("Core", "set property AutoShutter"),
+    }
+    assert stats[("XY", "absolute move")].mean == pytest.approx(0.25)
+    assert stats[("XY", "wait")].mean == pytest.approx(0.249)
+    assert stats[("Z", "relative move")].percentile(95) == pytest.approx(0.1)
+    assert stats[("Objective", "set state label")].count == 1
+    assert stats[("Core", "snap image")].max == pytest.approx(0.02)
+    assert stats[("Camera", "set property Binning")].mean == pytest.approx(0.005)
+
+    # statistics are bounded, the least recently updated ones are dropped first
+    profiler = DeviceCallProfiler(max_operations=2)
+    profiler.feed(_CORE_CALLS.encode().splitlines())
+    assert list(profiler.snapshot()) == [
+        ("Camera", "set property Binning"),
+        ("Core", "set property AutoShutter"),
+    ]
+
+
+def test_core_log_widget_profiler(
+    qtbot: QtBot, global_mmcore: CMMCorePlus, tmp_path: Path
+) -> None:
+    log = tmp_path / "log.txt"
+    log.write_text(_log_line("start"))
+    wdg = CoreLogWidget(path=str(log))
+    qtbot.addWidget(wdg)
+    wdg.show()
+    qtbot.waitUntil(lambda: wdg._model.rowCount() == 1)
+
+    wdg._profile_btn.click()
+    assert wdg._profile_table.isVisible()
+    with open(log, "a") as f:
+        f.write(_CORE_CALLS)
+    wdg._reader._read_new()
+    table = wdg._profile_table
+    table.refresh()
+    assert table.rowCount() == 8
+    assert (item := table.item(0, 0)) is not None
+    assert item.text() == "XY"
+
+    # rows are updated in place
+    with open(log, "a") as f:
+        f.write(_CORE_CALLS)
+    wdg._reader._read_new()
+    table.refresh()
+    assert table.rowCount() == 8
+    assert table.item(0, 0) is item
+    assert (count := table.item(0, 2)) is not None
+    assert count.text() == "2"
@@ -1,6 +1,8 @@
 from __future__ import annotations
 
 import re
+import subprocess
+import sys
 from inspect import signature
 from pathlib import Path
 from typing import TYPE_CHECKING
@@ -34,6 +36,12 @@ def test_no_direct_isinstance() -> None:
             )
 
 
+def test_import_with_warnings_as_errors() -> None:
+    # deprecated modules (e.g. pymmcore_plus.mda.handlers) must be imported lazily
+    cmd = [sys.executable, "-W", "error", "-c", "import pymmcore_widgets"]
+    subprocess.run(cmd, check=True)
+
+
 PUBLIC_WIDGETS = [
     obj
     for name, obj in vars(pymmcore_widgets).items()
@@ -91,3 +91,50 @@ def test_preset_widget_ignores_empty_device(
     qtbot.addWidget(wdg)
     # Should not raise RuntimeError: No device with label ""
     global_mmcore.events.propertyChanged.emit("", "State", "1")
+
+
+def test_preset_index(qtbot: QtBot, global_mmcore: CMMCorePlus) -> None:
+    from pymmcore_widgets.control._config_state import PresetIndex
+
+    index = PresetIndex(global_mmcore, "Camera")
+    assert index.properties == {("Camera", "Binning"), ("Camera", "BitDepth")}
+    global_mmcore.setConfig("Camera", "HighRes")
+    assert index.match(global_mmcore) == "HighRes"
+    global_mmcore.setProperty("Camera", "Binning", "8")
+    assert index.match(global_mmcore) is None
+
+    # the widget's index is rebuilt when presets change
+    wdg = PresetsWidget("Camera", mmcore=global_mmcore)
+    qtbot.addWidget(wdg)
+    assert wdg.value() == "<no match>"
+    global_mmcore.defineConfig("Camera", "HighRes", "Camera", "Binning", "8")
+    assert wdg.value() == "HighRes"
+
+
+def test_config_state_tracker(qtbot: QtBot, global_mmcore: CMMCorePlus) -> None:
+    from pymmcore_widgets.control._config_state import ConfigStateTracker
+
+    tracker = ConfigStateTracker.for_core(global_mmcore)
+    w1 = PresetsWidget("Camera", mmcore=global_mmcore)
+    w2 = PresetsWidget("Channel", mmcore=global_mmcore)
+    qtbot.addWidget(w1)
+    qtbot.addWidget(w2)
+    assert w1._tracker is w2._tracker is tracker
+    assert ("Camera", "Binning") in tracker.groupProperties("Camera")
+
+    global_mmcore.setConfig("Camera", "HighRes")
+    assert w1.value() == "HighRes"
+    # one batched signal, with only the groups whose preset changed
+    with qtbot.waitSignal(tracker.groupsChanged) as blocker:
+        global_mmcore.setProperty("Camera", "Binning", "8")
+    assert blocker.args == [{"Camera": None}]
+    assert tracker.currentPreset("Camera") is None
+    assert w1.value() == "<no match>"
+
+    global_mmcore.setConfig("Camera", "LowRes")
+    assert tracker.currentPreset("Camera") == "LowRes"
+    assert w1.value() == "LowRes"
+
+    global_mmcore.setConfig("Channel", "FITC")
+    assert w2.value() == "FITC"
+    assert w1.value() == "LowRes"
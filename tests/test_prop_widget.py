@@ -102,3 +102,34 @@ def test_bad_val(global_mmcore: CMMCorePlus, qtbot) -> None:
         PropertyWidget("NotADev", "Binning", mmcore=global_mmcore)
     with pytest.raises(ValueError, match="has no property"):
         PropertyWidget("Camera", "NotAProp", mmcore=global_mmcore)
+
+
+def test_property_change_dispatcher(global_mmcore: CMMCorePlus, qtbot) -> None:
+    from pymmcore_widgets.device_properties._property_dispatcher import (
+        PropertyChangeDispatcher,
+    )
+
+    dispatcher = PropertyChangeDispatcher.for_core(global_mmcore)
+    assert PropertyChangeDispatcher.for_core(global_mmcore) is dispatcher
+
+    received: list = []
+    unsubscribe = dispatcher.subscribe(
+        "Camera", "Binning", lambda *args: received.append(args)
+    )
+    global_mmcore.setProperty("Camera", "Gain", 1)
+    assert not received
+    global_mmcore.setProperty("Camera", "Binning", 2)
+    assert received == [("Camera", "Binning", "2")]
+    unsubscribe()
+    global_mmcore.setProperty("Camera", "Binning", 1)
+    assert len(received) == 1
+
+    # widgets subscribe to their own property only, and unsubscribe when destroyed
+    n_subs = dispatcher.subscriberCount("Camera", "Binning")
+    wdg = PropertyWidget("Camera", "Binning", mmcore=global_mmcore)
+    assert dispatcher.subscriberCount("Camera", "Binning") == n_subs + 1
+    global_mmcore.setProperty("Camera", "Binning", 4)
+    assert wdg.value() == "4"
+    with qtbot.waitSignal(wdg.destroyed):
+        wdg.deleteLater()
+    assert dispatcher.subscriberCount("Camera", "Binning") == n_subs
@@ -1,4 +1,7 @@
-from pymmcore_plus import PropertyType
+import gc
+import time
+
+from pymmcore_plus import CMMCorePlus, PropertyType
 from qtpy.QtWidgets import QLabel
 
 from pymmcore_widgets import PropertiesWidget, PropertyWidget
@@ -16,6 +19,10 @@ def test_properties_widget(qtbot, global_mmcore):
     )
     qtbot.addWidget(widget)
     assert widget.layout().count() == 10
+    # values are loaded in the background
+    qtbot.waitUntil(
+        lambda: all(w.inner_widget.isEnabled() for w in widget._prop_widgets.values())
+    )
 
     for i in range(widget.layout().count()):
         wdg = widget.layout().itemAt(i).widget()
@@ -29,3 +36,64 @@ def test_properties_widget(qtbot, global_mmcore):
                 continue
             wdg.setValue(0.1)
             assert wdg.value() == 0.1
+
+
+def test_property_value_loader(qtbot, global_mmcore):
+    from pymmcore_widgets.device_properties._property_loader import (
+        PropertyValueLoader,
+    )
+
+    loader = PropertyValueLoader(global_mmcore)
+    loaded: dict = {}
+    failed: list = []
+    loader.valueLoaded.connect(lambda d, p, v, g: loaded.__setitem__((d, p), v))
+    loader.loadFailed.connect(lambda d, p, e, g: failed.append((d, p)))
+
+    props = [("Camera", "Binning"), ("Camera", "Mode"), ("Objective", "Label")]
+    loader.load([*props, ("Camera", "NotAProp")])
+    qtbot.waitUntil(lambda: len(loaded) + len(failed) == 4)
+    assert loaded == {(d, p): global_mmcore.getProperty(d, p) for d, p in props}
+    assert failed == [("Camera", "NotAProp")]
+
+    # results of cancelled reads are dropped
+    loader.cancel()
+    assert loader.generation() == 1
+    assert not loader._emit(0, "Camera", "Binning", "1")
+
+    # all loaders of a core share one reader thread
+    assert PropertyValueLoader(global_mmcore)._reader is loader._reader
+
+
+def test_property_value_loader_does_not_own_core(qtbot):
+    from pymmcore_widgets.device_properties._property_loader import (
+        PropertyValueLoader,
+    )
+
+    core = CMMCorePlus()
+    core.loadSystemConfiguration()
+    loader = PropertyValueLoader(core)
+    loader.load([("Camera", "Binning")])
+    qtbot.waitUntil(lambda: not loader.isBusy())
+
+    # queued reads don't keep the core alive: it must be destroyed by its owner
+    # (on the main thread), not when the reader thread drops the last reference
+    assert not any(ref is vars(loader) for ref in gc.get_referrers(core))
+    assert loader._mmc() is core
+
+
+def test_property_value_loader_rate_budget(qtbot, global_mmcore):
+    from pymmcore_widgets.device_properties._property_loader import (
+        PropertyValueLoader,
+    )
+
+    # the rate budget is shared by all (rate-limited) loaders of a core
+    loaders = [PropertyValueLoader(global_mmcore, max_rate=20) for _ in range(2)]
+    loaded: list = []
+    for loader in loaders:
+        loader.valueLoaded.connect(lambda d, p, v, g: loaded.append((d, p)))
+    start = time.perf_counter()
+    for loader in loaders:
+        loader.load([("Camera", "Binning"), ("Camera", "Mode"), ("Camera", "Gain")])
+    qtbot.waitUntil(lambda: len(loaded) == 6)
+    assert time.perf_counter() - start >= 5 / 20
+    qtbot.waitUntil(lambda: not any(loader.isBusy() for loader in loaders))
@@ -1,10 +1,19 @@
 from __future__ import annotations
 
 from typing import TYPE_CHECKING
+from unittest.mock import patch
+
+from qtpy.QtCore import Qt
+from superqt.utils import signals_blocked
 
 from pymmcore_widgets import PropertyBrowser
+from pymmcore_widgets.device_properties import (
+    DevicePropertyTable,
+    _device_property_table,
+)
 
 if TYPE_CHECKING:
+    import pytest
     from pymmcore_plus import CMMCorePlus
     from pytestqt.qtbot import QtBot
 
@@ -22,3 +31,124 @@ def test_prop_browser_core_reset(global_mmcore: CMMCorePlus, qtbot: QtBot):
     qtbot.addWidget(pb)
     global_mmcore.loadSystemConfiguration()
     global_mmcore.reset()
+
+
+def test_prop_table_lazy_widgets(global_mmcore: CMMCorePlus, qtbot: QtBot):
+    table = DevicePropertyTable(mmcore=global_mmcore)
+    qtbot.addWidget(table)
+    table.resize(500, 200)
+    table.show()
+
+    # only the rows in view get a PropertyWidget
+    qtbot.waitUntil(lambda: bool(table._materialized))
+    assert len(table._materialized) < table.rowCount()
+
+    # ... and the others are created on demand
+    last = table.rowCount() - 1
+    assert last not in table._materialized
+    assert table.cellWidget(last, 1) is not None
+    assert last in table._materialized
+
+
+def test_prop_table_evicts_offscreen_widgets(
+    global_mmcore: CMMCorePlus, qtbot: QtBot, monkeypatch: pytest.MonkeyPatch
+):
+    monkeypatch.setattr(_device_property_table, "_MAX_LIVE_WIDGETS", 10)
+    table = DevicePropertyTable(mmcore=global_mmcore)
+    qtbot.addWidget(table)
+    table.resize(500, 200)
+    table.show()
+    qtbot.waitUntil(lambda: bool(table._materialized))
+    top = set(table._materialized)
+
+    # scrolling through the whole table doesn't keep every widget alive
+    vbar = table.verticalScrollBar()
+    assert vbar is not None
+    for value in range(vbar.minimum(), vbar.maximum() + 1, vbar.pageStep()):
+        vbar.setValue(value)
+        table._materialize_visible_rows()
+    vbar.setValue(vbar.maximum())
+    table._materialize_visible_rows()
+    assert len(table._materialized) < table.rowCount() / 2
+    assert not top & table._materialized
+    assert all(table.cellWidget(row, 1) is not None for row in top)
+
+
+def test_prop_table_filter(global_mmcore: CMMCorePlus, qtbot: QtBot):
+    from pymmcore_plus import DeviceType
+
+    table = DevicePropertyTable(mmcore=global_mmcore)
+    qtbot.addWidget(table)
+
+    def visible() -> list[str]:
+        return [
+            table.item(row, 0).text()
+            for row in range(table.rowCount())
+            if not table.isRowHidden(row)
+        ]
+
+    table.filterDevices("BINNING")
+    assert "Camera-Binning" in visible()
+    assert all("binning" in r.lower() for r in visible())
+
+    table.filterDevices(include_devices=[DeviceType.Camera], include_read_only=False)
+    rows = [r for r in range(table.rowCount()) if not table.isRowHidden(r)]
+    assert rows
+    for row in rows:
+        prop = table.item(row, 0).data(table.PROP_ROLE)
+        assert prop.deviceType() == DeviceType.Camera
+        assert not prop.isReadOnly()
+
+    table.setRowsCheckable(True)
+    table.item(0, 0).setCheckState(Qt.CheckState.Checked)
+    table.filterDevices("Binning", always_show_checked=True)
+    assert table.item(0, 0).text() in visible()
+    # checked rows are shown regardless of the device type filters too, also when
+    # checked with signals blocked (as done by the pixel configuration widget)
+    with signals_blocked(table):
+        table.item(1, 0).setCheckState(Qt.CheckState.Checked)
+    dev_type = table.item(1, 0).data(table.PROP_ROLE).deviceType()
+    table.filterDevices(exclude_devices=[dev_type], always_show_checked=True)
+    assert table.item(1, 0).text() in visible()
+
+    table.filterDevices(predicate=lambda prop: prop.device == "Camera")
+    assert all(r.startswith("Camera-") for r in visible())
+    table.filterDevices()
+    assert len(visible()) == table.rowCount()
+
+
+def test_prop_table_watch_visible(global_mmcore: CMMCorePlus, qtbot: QtBot):
+    from pymmcore_widgets._util import block_core
+
+    table = DevicePropertyTable(mmcore=global_mmcore)
+    qtbot.addWidget(table)
+    table.filterDevices("Camera-Binning")
+    table.show()
+    qtbot.waitExposed(table)
+    qtbot.wait(10)  # let pending core events rebuild the table first
+    row = next(r for r in range(table.rowCount()) if not table.isRowHidden(r))
+    wdg = table.cellWidget(row, 1)
+    assert wdg.value() == "1"
+    # values of an editor that has the focus are not overwritten
+    table.setFocus()
+
+    # a change that the core doesn't report...
+    with block_core(global_mmcore.events):
+        global_mmcore.setProperty("Camera", "Binning", "2")
+    assert wdg.value() == "1"
+
+    # ... is picked up by watching the visible rows
+    table.setWatchVisibleProperties(interval=10)
+    assert table.isWatchingVisibleProperties()
+    qtbot.waitUntil(lambda: wdg.value() == "2")
+
+    # watching pauses during an acquisition
+    with patch.object(global_mmcore.mda, "is_running", return_value=True):
+        qtbot.waitUntil(lambda: not table._watcher.isBusy())
+        with block_core(global_mmcore.events):
+            global_mmcore.setProperty("Camera", "Binning", "4")
+        qtbot.wait(100)
+        assert wdg.value() == "2"
+    qtbot.waitUntil(lambda: wdg.value() == "4")
+    table.setWatchVisibleProperties(False)
+    assert not table.isWatchingVisibleProperties()
@@ -1,3 +1,7 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
 from pymmcore_plus import CMMCorePlus
 
 from pymmcore_widgets._models import (
@@ -6,6 +10,9 @@ from pymmcore_widgets._models import (
     get_loaded_devices,
 )
 
+if TYPE_CHECKING:
+    from pytestqt.qtbot import QtBot
+
 
 def test_get_loaded_devices() -> None:
     core = CMMCorePlus()
@@ -13,3 +20,30 @@ def test_get_loaded_devices() -> None:
     get_loaded_devices(core)
     get_available_devices(core)
     get_config_groups(core)
+
+
+def test_core_metadata_cache(qtbot: QtBot) -> None:
+    from pymmcore_widgets._models._core_metadata import CoreMetadataCache
+
+    core = CMMCorePlus()
+    core.loadSystemConfiguration()
+    cache = CoreMetadataCache.for_core(core)
+    assert CoreMetadataCache.for_core(core) is cache
+
+    devices = list(get_loaded_devices(core))
+    assert cache.calls_saved == 0
+    assert list(get_loaded_devices(core)) == devices
+    saved = cache.calls_saved
+    assert saved > 0
+    # groups read the same (already cached) devices and properties
+    list(get_config_groups(core))
+    assert cache.calls_saved > saved
+
+    info = cache.property_info("Camera", "Binning")
+    assert info["allowed_values"] == core.getAllowedPropertyValues("Camera", "Binning")
+
+    with qtbot.waitSignal(core.events.systemConfigurationLoaded):
+        core.loadSystemConfiguration()
+    assert cache.property_info("Camera", "Binning") is not info
+    cache.invalidate("Camera")
+    assert not any(key[0] == "Camera" for key in cache._properties)
@@ -1,9 +1,13 @@
+import time
 from pathlib import Path
 
+import numpy as np
 import pytest
+import useq
 from pytestqt.qtbot import QtBot
 
 from pymmcore_widgets.mda._save_widget import (
+    DEFAULT_WRITER_OPTIONS,
     DIRECTORY_WRITERS,
     FILE_NAME,
     OME_TIFF,
@@ -13,6 +17,7 @@ from pymmcore_widgets.mda._save_widget import (
     WRITERS,
     SaveGroupBox,
 )
+from pymmcore_widgets.mda._writers import QueuedWriter, benchmark_writer, create_writer
 
 
 def test_set_get_value(qtbot: QtBot) -> None:
@@ -82,3 +87,100 @@ def test_writer_combo_text_changed(qtbot: QtBot, writer: str) -> None:
     expected_label = SUBFOLDER if writer in DIRECTORY_WRITERS else FILE_NAME
     qtbot.waitUntil(lambda: wdg.name_label.text() == expected_label)
     qtbot.waitUntil(lambda: wdg.save_name.text() == f"name{WRITERS[writer][0]}")
+
+
+def test_writer_options(qtbot: QtBot) -> None:
+    wdg = SaveGroupBox()
+    qtbot.addWidget(wdg)
+
+    # default options are not part of the value
+    wdg.setValue({"save_dir": "/some_path", "save_name": "a.ome.zarr"})
+    assert "writer_options" not in wdg.value()
+
+    options = {"chunk_frames": 8, "compression": "zstd", "write_workers": 2}
+    with qtbot.waitSignal(wdg.valueChanged):
+        wdg.setValue(
+            {"save_dir": "/some_path", "should_save": True, "writer_options": options}
+        )
+    assert wdg.value()["writer_options"] == {**DEFAULT_WRITER_OPTIONS, **options}
+
+    # options that the writer can't use are disabled
+    opts = wdg.writer_options
+    assert opts.chunk_frames.isEnabled()
+    wdg._writer_combo.setCurrentText(OME_TIFF)
+    assert not opts.chunk_frames.isEnabled()
+    assert not opts.write_workers.isEnabled()
+    wdg._writer_combo.setCurrentText(TIFF_SEQ)
+    assert opts.compression.isEnabled()
+    assert not opts.chunk_frames.isEnabled()
+
+
+@pytest.mark.filterwarnings("ignore::FutureWarning")  # pymmcore_plus.mda.handlers
+def test_create_writer(tmp_path: Path) -> None:
+    path = tmp_path / "a.ome.zarr"
+    assert create_writer(path, OME_ZARR) == path
+    assert create_writer(path, OME_ZARR, DEFAULT_WRITER_OPTIONS) == path
+    assert create_writer(path, OME_TIFF, {"compression": "zlib"}) == path
+    writer = create_writer(tmp_path / "seq", TIFF_SEQ, {"write_workers": 2})
+    assert isinstance(writer, QueuedWriter)
+
+    # zarr arrays get the chunks and compressor of the options
+    options = {"chunk_frames": 4, "compression": "zlib", "compression_level": 3}
+    writer = create_writer(path, OME_ZARR, options)
+    seq = useq.MDASequence(time_plan={"interval": 0, "loops": 6})
+    writer.sequenceStarted(seq, {})
+    for event in seq:
+        writer.frameReady(np.zeros((8, 8), "uint16"), event, {})
+    writer.sequenceFinished(seq)
+    ary = writer.group["p0"]
+    assert ary.chunks == (4, 8, 8)
+    assert ary.compressor.codec_id == "zlib"
+    assert ary.attrs["_ARRAY_DIMENSIONS"] == ["t", "y", "x"]
+
+
+def test_queued_writer_keeps_order() -> None:
+    written: list[int] = []
+
+    class SlowWriter:
+        def frameReady(self, frame: np.ndarray, event: useq.MDAEvent, meta) -> None:
+            time.sleep(0.01 * (frame[0, 0] % 3))
+            written.append(event.index["t"])
+
+    writer = QueuedWriter(SlowWriter())
+    seq = useq.MDASequence(time_plan={"interval": 0, "loops": 10})
+    writer.sequenceStarted(seq)
+    for event in seq:
+        writer.frameReady(np.full((2, 2), event.index["t"]), event, {})
+    writer.sequenceFinished(seq)
+    assert written == list(range(10))
+
+
+@pytest.mark.filterwarnings("ignore::FutureWarning")  # pymmcore_plus.mda.handlers
+@pytest.mark.parametrize("writer", [OME_ZARR, TIFF_SEQ])
+def test_benchmark_writer(tmp_path: Path, writer: str) -> None:
+    options = {"chunk_frames": 4, "compression": "zlib", "write_workers": 2}
+    rate = benchmark_writer(tmp_path, writer, options, (64, 64), n_frames=8)
+    assert rate > 0
+    # the benchmark cleans up after itself
+    assert not list(tmp_path.glob(".pmmw-bench*"))
+
+
+@pytest.mark.filterwarnings("ignore::FutureWarning")  # pymmcore_plus.mda.handlers
+def test_writer_benchmark_button(qtbot: QtBot, tmp_path: Path) -> None:
+    wdg = SaveGroupBox()
+    qtbot.addWidget(wdg)
+    wdg.setValue(
+        {
+            "save_dir": str(tmp_path),
+            "save_name": "a",
+            "format": TIFF_SEQ,
+            "should_save": True,
+        }
+    )
+    opts = wdg.writer_options
+    opts.frame_shape = (64, 64)
+
+    with qtbot.waitSignal(opts._benchmarked, timeout=10000):
+        opts.benchmark_btn.click()
+    assert opts._benchmark_result.text().endswith("MB/s")
+    assert opts.benchmark_btn.isEnabled()
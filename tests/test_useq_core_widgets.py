@@ -1,12 +1,14 @@
 from __future__ import annotations
 
+from dataclasses import replace
 from pathlib import Path
 from typing import TYPE_CHECKING, cast
 from unittest.mock import Mock, patch
 
 import pytest
 import useq
-from qtpy.QtCore import Qt, QTimer
+from pymmcore_plus.core import iter_sequenced_events
+from qtpy.QtCore import QSettings, Qt, QTimer
 from qtpy.QtWidgets import QMessageBox
 
 from pymmcore_widgets import HCSWizard
@@ -17,8 +19,13 @@ from pymmcore_widgets.mda._core_grid import CoreConnectedGridPlanWidget
 from pymmcore_widgets.mda._core_positions import (
     AF_UNAVAILABLE,
     CoreConnectedPositionTable,
+    CoreConnectedVirtualPositionTable,
 )
 from pymmcore_widgets.mda._core_z import CoreConnectedZPlanWidget
+from pymmcore_widgets.mda._preflight import AcquisitionBudget, analyze_budget
+from pymmcore_widgets.mda._sequencing import analyze_sequencing
+from pymmcore_widgets.mda._throughput import RingBuffer
+from pymmcore_widgets.mda._timing import XY, XY_MOVE, TimingProfile, simulate
 from pymmcore_widgets.useq_widgets._mda_sequence import (
     AF_AXIS_TOOLTIP,
     AF_DISABLED_TOOLTIP,
@@ -713,6 +720,41 @@ def test_core_mda_with_hcs_value(qtbot: QtBot, global_mmcore: CMMCorePlus) -> No
     assert wdg.stage_positions._plate_plan == pos
 
 
+def test_core_mda_virtual_positions(qtbot: QtBot, global_mmcore: CMMCorePlus) -> None:
+    wdg = MDAWidget(virtual_positions=True)
+    qtbot.addWidget(wdg)
+    wdg.show()
+    pos_table = wdg.stage_positions
+    assert isinstance(pos_table, CoreConnectedVirtualPositionTable)
+    model = pos_table.model()
+
+    # new rows are set to the current stage position
+    global_mmcore.setXYPosition(11, 22)
+    global_mmcore.setZPosition(33)
+    global_mmcore.waitForSystem()
+    with qtbot.waitSignal(pos_table.valueChanged):
+        pos_table.act_add_row.trigger()
+    val = pos_table.value()[-1]
+    assert (round(val.x), round(val.y), round(val.z)) == (11, 22, 33)
+
+    # the positions of a well plate plan are set in the table
+    plan = useq.WellPlatePlan(
+        plate="96-well", a1_center_xy=(0, 0), selected_wells=((0, 1), (0, 1))
+    )
+    with patch.object(pos_table._hcs, "value", return_value=plan):
+        with patch.object(
+            QMessageBox, "exec", return_value=QMessageBox.StandardButton.Yes
+        ):
+            pos_table._on_hcs_accepted()
+    assert model.rowCount() == len(plan)
+    assert [p.name for p in pos_table.value()] == [p.name for p in plan]
+
+    # the X/Y columns follow the XY stage device
+    with qtbot.waitSignal(global_mmcore.events.propertyChanged):
+        global_mmcore.setProperty("Core", "XYStage", "")
+    assert pos_table.view().isColumnHidden(1)
+
+
 def test_core_mda_with_hcs_enable_disable(
     qtbot: QtBot, global_mmcore: CMMCorePlus
 ) -> None:
@@ -1147,3 +1189,236 @@ def test_sub_wdg_channel_tab(qtbot: QtBot, global_mmcore: CMMCorePlus) -> None:
 
     # Click the button (this will open the dialog)
     btn.seq_btn.click()
+
+
+def test_acquisition_budget_problems() -> None:
+    budget = AcquisitionBudget(n_frames=10, frame_bytes=100, duration=10)
+    assert budget.total_bytes == 1000
+    assert budget.write_bandwidth == 100
+    assert not budget.problems()
+
+    assert len(replace(budget, free_disk=500).problems()) == 1
+    assert len(replace(budget, write_throughput=50).problems()) == 1
+    assert len(replace(budget, free_memory=500).problems()) == 1
+    assert not replace(budget, free_disk=10**6, write_throughput=1000).problems()
+
+
+def test_analyze_budget(tmp_path: Path) -> None:
+    seq = useq.MDASequence(
+        channels=["DAPI", "FITC"], time_plan={"interval": 0, "loops": 3}
+    )
+    budget = analyze_budget(seq, 100, tmp_path / "new_dir" / "out.ome.zarr")
+    assert budget.n_frames == 6
+    assert budget.total_bytes == 600
+    assert budget.free_disk is not None
+    assert budget.write_throughput is not None and budget.write_throughput > 0
+    assert budget.free_memory is None
+    assert not list(tmp_path.glob(".pmmw-probe*"))  # the probe file was removed
+
+    # the throughput of a folder is only measured once
+    with patch("pymmcore_widgets.mda._preflight.measure_write_throughput") as probe:
+        again = analyze_budget(seq, 100, tmp_path / "other.ome.zarr")
+    probe.assert_not_called()
+    assert again.write_throughput == budget.write_throughput
+
+
+def test_run_mda_preflight(qtbot: QtBot) -> None:
+    wdg = MDAWidget()
+    qtbot.addWidget(wdg)
+    wdg.setValue(useq.MDASequence(time_plan={"interval": 0, "loops": 2}))
+
+    full_disk = AcquisitionBudget(n_frames=2, frame_bytes=100, free_disk=10)
+    cancel = Mock(return_value=QMessageBox.StandardButton.Cancel)
+    with (
+        patch("pymmcore_widgets.mda._core_mda.analyze_budget", return_value=full_disk),
+        patch.object(QMessageBox, "warning", cancel),
+        patch.object(wdg, "execute_mda") as execute,
+    ):
+        wdg.control_btns.run_btn.click()
+        qtbot.waitUntil(wdg.control_btns.run_btn.isEnabled)
+        cancel.assert_called_once()
+        execute.assert_not_called()
+
+        # the checked sequence is run, even if the widget changed in the meantime
+        checked = wdg.value()
+        with patch(
+            "pymmcore_widgets.mda._core_mda.analyze_budget",
+            return_value=replace(full_disk, free_disk=None),
+        ):
+            wdg.control_btns.run_btn.click()
+            wdg.setValue(useq.MDASequence(time_plan={"interval": 0, "loops": 5}))
+            qtbot.waitUntil(lambda: execute.called)
+        execute.assert_called_once_with(None, checked)
+        execute.reset_mock()
+
+        # the check can be disabled
+        wdg.preflight_check = False
+        wdg.control_btns.run_btn.click()
+        execute.assert_called_once_with(None)
+        cancel.assert_called_once()
+
+
+def test_analyze_sequencing(global_mmcore: CMMCorePlus) -> None:
+    # nothing changes between the events of a burst: a single hardware sequence
+    burst = useq.MDASequence(time_plan={"interval": 0, "loops": 5})
+    report = analyze_sequencing(global_mmcore, burst, overhead=0.1)
+    assert report.sequence_lengths == (5,)
+    assert not report.breaks
+    assert report.axes == {"t": None}
+    assert report.speedup > 1
+
+    # the demo Z stage isn't sequenceable by default
+    seq = useq.MDASequence(
+        time_plan={"interval": 1, "loops": 2},
+        z_plan={"range": 2, "step": 1},
+        axis_order="tz",
+    )
+    report = analyze_sequencing(global_mmcore, seq)
+    assert report.n_events == 6
+    assert report.sequence_lengths == (1,) * 6
+    assert "is not sequenceable" in (report.axes["z"] or "")
+    assert "time plan" in (report.axes["t"] or "")
+    assert report.breaks[0].axes == ("z",)
+    assert report.speedup == pytest.approx(1)
+
+    global_mmcore.setProperty("Z", "UseSequences", "Yes")
+    report = analyze_sequencing(global_mmcore, seq)
+    assert report.axes["z"] is None
+    assert report.sequence_lengths == (3, 3)
+    assert report.summary()
+
+    # the sequences are exactly those the engine runs
+    seq = useq.MDASequence(
+        channels=["DAPI", "FITC"],
+        z_plan={"range": 2, "step": 1},
+        time_plan={"interval": 0, "loops": 2},
+        axis_order="tcz",
+    )
+    report = analyze_sequencing(global_mmcore, seq)
+    engine = iter_sequenced_events(global_mmcore, seq.iter_events())
+    assert report.sequence_lengths == tuple(
+        len(getattr(e, "events", (e,))) for e in engine
+    )
+    assert len(report.breaks) == len(report.sequence_lengths) - 1
+    assert report.breaks[0].reason
+
+
+def test_mda_sequencing_report(qtbot: QtBot) -> None:
+    wdg = MDAWidget()
+    qtbot.addWidget(wdg)
+    wdg.setValue(useq.MDASequence(channels=["DAPI", "FITC"]))
+
+    report = wdg.analyze_sequencing()
+    assert report.n_events == 2
+    assert report.axes["c"] is not None
+
+    with patch.object(QMessageBox, "information") as info:
+        wdg.control_btns.sequencing_btn.click()
+        assert not wdg.control_btns.sequencing_btn.isEnabled()
+        qtbot.waitUntil(lambda: info.called)
+    info.assert_called_once()
+    assert wdg.control_btns.sequencing_btn.isEnabled()
+    assert report.summary() in info.call_args.args
+
+
+def test_timing_profile(tmp_path: Path) -> None:
+    e0 = useq.MDAEvent(x_pos=0, y_pos=0, exposure=10)
+    e1 = useq.MDAEvent(x_pos=0, y_pos=0, exposure=10)
+    e2 = useq.MDAEvent(x_pos=100, y_pos=0, exposure=10)
+
+    e3 = useq.MDAEvent(x_pos=400, y_pos=0, exposure=10)
+
+    profile = TimingProfile()
+    profile.record(e0, e1, 0.03)  # 20 ms of overhead
+    profile.record(e1, e2, 0.13)  # 100 ms more to move 100 µm
+    rates = profile.rates()
+    assert rates["event"] == pytest.approx(0.02)
+    # a single move length: it's all attributed to the move, not to the distance
+    assert rates[XY_MOVE] == pytest.approx(0.1)
+    assert rates[XY] == 0
+
+    profile.record(e2, e3, 0.18)  # 150 ms more to move 300 µm
+    rates = profile.rates()
+    assert rates[XY_MOVE] == pytest.approx(0.075)
+    assert rates[XY] == pytest.approx(0.00025)
+
+    # the calibrated estimate adds the measured overheads to the exposures
+    seq = useq.MDASequence(
+        stage_positions=[(0, 0, None), (100, 0, None)],
+        channels=[{"config": "DAPI", "exposure": 10}],
+    )
+    finish, autofocus = simulate(seq, rates)
+    assert finish == pytest.approx([0.03, 0.03 + 0.13])
+    assert not autofocus.any()
+
+    settings = QSettings(str(tmp_path / "profile.ini"), QSettings.Format.IniFormat)
+    profile.save("my_config", settings)
+    assert TimingProfile.load("my_config", settings).rates() == rates
+    assert not len(TimingProfile.load("other_config", settings))
+
+
+def test_mda_calibrated_estimate(qtbot: QtBot) -> None:
+    wdg = MDAWidget()
+    qtbot.addWidget(wdg)
+    wdg.preflight_check = False
+    wdg.setValue(useq.MDASequence(time_plan={"interval": 0, "loops": 4}))
+    assert not len(wdg.timing_profile)  # the tests don't share the user's profile
+
+    with qtbot.waitSignal(wdg._mmc.mda.events.sequenceFinished, timeout=5000):
+        wdg.control_btns.run_btn.click()
+    assert len(wdg.timing_profile)
+    assert wdg.calibrated_duration() > 0
+
+    with qtbot.waitSignal(wdg._calibrated, timeout=2000):
+        wdg._update_time_estimate()
+    assert "Calibrated estimate" in wdg._duration_label.text()
+
+
+def test_ring_buffer() -> None:
+    buf = RingBuffer(4)
+    assert not len(buf)
+    for i in range(6):
+        buf.append(i)
+    assert len(buf) == 4
+    assert sorted(buf.values()) == [2, 3, 4, 5]
+    assert list(buf.last(3)) == [3, 4, 5]
+    assert list(buf.last(10)) == [2, 3, 4, 5]
+    buf.clear()
+    assert not len(buf)
+
+
+def test_mda_throughput_dashboard(qtbot: QtBot) -> None:
+    wdg = MDAWidget()
+    qtbot.addWidget(wdg)
+    wdg.preflight_check = False
+    dashboard = wdg.throughput
+    assert dashboard.isHidden()
+    wdg.control_btns.dashboard_btn.click()
+    assert not dashboard.isHidden()
+
+    wdg.setValue(useq.MDASequence(time_plan={"interval": 0, "loops": 5}))
+    with qtbot.waitSignal(wdg._mmc.mda.events.sequenceFinished, timeout=5000):
+        wdg.control_btns.run_btn.click()
+    qtbot.waitUntil(lambda: dashboard.metrics()["dropped_frames"] is not None)
+
+    metrics = dashboard.metrics()
+    assert metrics["frames"] == metrics["expected_frames"] == 5
+    assert metrics["dropped_frames"] == 0
+    assert metrics["mean_fps"] > 0
+    assert set(metrics["gap_percentiles"]) == {50, 90, 99}
+    assert metrics["elapsed"] > 0
+    assert metrics["estimate"] is not None  # from the plan, without a live ETA
+    assert metrics["mean_lag"] >= 0  # frame and delivery times on the same clock
+    assert dashboard._labels["Frames"].text() == "5 / 5"
+
+    # the plan of the pre-flight check is used for the run, not computed again
+    wdg.preflight_check = True
+    wdg.setValue(useq.MDASequence(time_plan={"interval": 0, "loops": 3}))
+    with (
+        patch.object(wdg._timing, "_plan") as plan,
+        qtbot.waitSignal(wdg._mmc.mda.events.sequenceFinished, timeout=5000),
+    ):
+        wdg.control_btns.run_btn.click()
+    qtbot.waitUntil(lambda: dashboard.metrics()["dropped_frames"] is not None)
+    plan.assert_not_called()
+    assert dashboard.metrics()["expected_frames"] == 3
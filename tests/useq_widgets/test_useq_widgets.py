@@ -3,12 +3,12 @@ from __future__ import annotations
 import enum
 from datetime import timedelta
 from typing import TYPE_CHECKING
-from unittest.mock import patch
+from unittest.mock import Mock, patch
 
 import pint
 import pytest
 import useq
-from qtpy.QtCore import Qt, QTimer
+from qtpy.QtCore import QItemSelectionModel, Qt, QTimer
 from qtpy.QtWidgets import QMessageBox
 
 import pymmcore_widgets
@@ -20,11 +20,13 @@ from pymmcore_widgets.useq_widgets import (
     MDASequenceWidget,
     PositionTable,
     TimePlanWidget,
+    VirtualPositionTable,
     ZPlanWidget,
     _grid,
     _z,
 )
 from pymmcore_widgets.useq_widgets._column_info import (
+    BoolColumn,
     FloatColumn,
     QTimeLineEdit,
     TextColumn,
@@ -38,6 +40,12 @@ if TYPE_CHECKING:
     from pytestqt.qtbot import QtBot
 
 
+CHECK_ROLE = Qt.ItemDataRole.CheckStateRole
+SELECT_ROWS = (
+    QItemSelectionModel.SelectionFlag.Select | QItemSelectionModel.SelectionFlag.Rows
+)
+
+
 class MyEnum(enum.Enum):
     foo = "bar"
     baz = "qux"
@@ -102,6 +110,39 @@ def test_data_table(qtbot: QtBot) -> None:
     assert table.rowCount() == 0
 
 
+@pytest.mark.parametrize("n_rows", [10, 10_000])
+def test_data_table_bulk_round_trip(qtbot: QtBot, n_rows: int) -> None:
+    wdg = DataTableWidget()
+    qtbot.addWidget(wdg)
+    table = wdg.table()
+    table.addColumns(
+        [
+            TextColumn(key="name", is_row_selector=True),
+            FloatColumn(key="value", minimum=-1, maximum=n_rows),
+            BoolColumn(key="flag"),
+        ]
+    )
+    records = [
+        {"name": f"row{i}", "value": float(i), "flag": bool(i % 2)}
+        for i in range(n_rows)
+    ]
+
+    mock = Mock()
+    table.valueChanged.connect(mock)
+    table.setValue(records)
+    mock.assert_called_once()
+    assert list(table.iterRecords()) == records
+
+    # missing keys keep their default values
+    table.setValue([{"value": 1.0}])
+    assert list(table.iterRecords()) == [{"name": "", "value": 1.0, "flag": False}]
+
+    mock.reset_mock()
+    wdg.act_check_none.trigger()
+    mock.assert_called_once()
+    assert not list(table.iterRecords(exclude_unchecked=True))
+
+
 SUB_SEQ = useq.MDASequence(
     time_plan=useq.TIntervalLoops(interval=4, loops=4),
     z_plan=useq.ZRangeAround(range=4, step=0.2),
@@ -157,6 +198,32 @@ def test_mda_wdg(qtbot: QtBot):
     assert wdg.value().replace(metadata={}) == MDA_ZT
 
 
+def test_mda_wdg_duration_estimate(qtbot: QtBot) -> None:
+    wdg = MDASequenceWidget()
+    qtbot.addWidget(wdg)
+    estimator = wdg._estimator
+
+    # changes are debounced: a single estimate for several changes
+    with qtbot.waitSignal(estimator.estimated) as blocker:
+        wdg.setValue(MDA_CP)
+        wdg.setValue(MDA_ZT)
+    assert blocker.args[0] == wdg.value().estimate_duration()
+    assert wdg._duration_label.text().startswith("Estimated duration")
+    assert len(estimator._cache) == 1
+
+    # moving positions doesn't require a new estimate
+    moved = MDA_ZT.replace(stage_positions=[(10, 10), (0, 0)])
+    with qtbot.waitSignal(estimator.estimated):
+        wdg.setValue(moved)
+    assert len(estimator._cache) == 1
+
+    # stale results are discarded
+    with qtbot.waitSignal(estimator.estimated) as blocker:
+        estimator.request(MDA_CP)
+        estimator.request(MDA)
+    assert blocker.args[0] == MDA.estimate_duration()
+
+
 @pytest.mark.parametrize("ext", ["json", "yaml", "foo"])
 def test_mda_wdg_load_save(
     qtbot: QtBot, tmp_path: Path, monkeypatch: pytest.MonkeyPatch, ext: str
@@ -347,6 +414,114 @@ def test_position_load_save(
     assert wdg.value() == MDA.stage_positions
 
 
+def test_virtual_position_table(
+    qtbot: QtBot, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    wdg = VirtualPositionTable()
+    qtbot.addWidget(wdg)
+    wdg.show()
+
+    wdg.setValue(MDA.stage_positions)
+    assert wdg.value() == MDA.stage_positions
+
+    dest = tmp_path / "positions.json"
+    monkeypatch.setattr(QFileDialog, "getSaveFileName", lambda *a: (dest, None))
+    monkeypatch.setattr(QFileDialog, "getOpenFileName", lambda *a: (dest, None))
+    wdg.save()
+    wdg.act_clear.trigger()
+    assert wdg.value() == ()
+    wdg.load()
+    assert wdg.value() == MDA.stage_positions
+
+    # autofocus offsets are shown in the AF column
+    af_seq = SUB_SEQ.replace(
+        autofocus_plan=useq.AxesBasedAF(autofocus_motor_offset=5, axes=("p",))
+    )
+    positions = [useq.Position(x=1, y=2, z=3, name="a", sequence=af_seq)]
+    wdg.setValue(positions)
+    assert wdg.af_per_position.isChecked()
+    assert wdg.model().subSequence(0) == SUB_SEQ
+    assert wdg.value() == tuple(positions)
+
+    # hidden columns and unchecked rows are excluded
+    wdg.af_per_position.setChecked(False)
+    wdg.include_z.setChecked(False)
+    assert wdg.value() == (useq.Position(x=1, y=2, name="a", sequence=SUB_SEQ),)
+    model = wdg.model()
+    with qtbot.waitSignal(wdg.valueChanged):
+        model.setData(model.index(0, 0), Qt.CheckState.Unchecked, CHECK_ROLE)
+    assert wdg.value() == ()
+    assert len(wdg.value(exclude_unchecked=False)) == 1
+
+
+def test_virtual_position_table_large(qtbot: QtBot) -> None:
+    wdg = VirtualPositionTable()
+    qtbot.addWidget(wdg)
+    wdg.show()
+
+    n = 20_000
+    positions = [useq.Position(x=i, y=-i, z=0.5, sequence=SUB_SEQ) for i in range(n)]
+    with qtbot.waitSignal(wdg.model().modelReset):
+        wdg.setValue(positions)
+    model = wdg.model()
+    assert model.rowCount() == n
+    # the shared sub-sequence is stored once, and no cell widgets are created
+    assert len(model._sequences) == 1
+    assert wdg.view().indexWidget(model.index(n - 1, 1)) is None
+
+    # editing a cell only touches the arrays
+    model.setData(model.index(n - 1, 1), 42.0)
+    assert model.coords()[n - 1, 0] == 42.0
+
+    value = wdg.value()
+    assert len(value) == n
+    assert value[0] == positions[0]
+    assert value[-1] == positions[-1].replace(x=42.0)
+
+    # remove a block of selected rows
+    sel = wdg.view().selectionModel()
+    for row in (1, 2, 3, 10):
+        sel.select(model.index(row, 0), SELECT_ROWS)
+    wdg.act_remove_row.trigger()
+    assert model.rowCount() == n - 4
+    assert wdg.value()[1].x == 4
+
+
+def test_virtual_position_table_sub_sequences(qtbot: QtBot) -> None:
+    wdg = VirtualPositionTable()
+    qtbot.addWidget(wdg)
+    model = wdg.model()
+
+    # equal sub-sequences share one entry, even if they are distinct objects
+    positions = [
+        useq.Position(x=i, sequence=SUB_SEQ.model_copy(deep=True)) for i in range(4)
+    ]
+    wdg.setValue(positions)
+    assert len(model._sequences) == 1
+
+    other = SUB_SEQ.replace(axis_order="tgcz")
+    model.setSubSequence(0, other)
+    model.setSubSequence(1, other.model_copy(deep=True))
+    assert len(model._sequences) == 2
+    assert model.subSequence(1) == other
+
+    # sub-sequences that are no longer used are dropped
+    model.setSubSequence(2, None)
+    model.setSubSequence(3, None)
+    assert model._sequences == [other]
+    model.removeRows(0, 2)
+    assert model._sequences == []
+    assert model.subSequences() == [None, None]
+
+
+def test_mda_sequence_virtual_positions(qtbot: QtBot) -> None:
+    wdg = MDASequenceWidget(virtual_positions=True)
+    qtbot.addWidget(wdg)
+    assert isinstance(wdg.stage_positions, VirtualPositionTable)
+    wdg.setValue(MDA)
+    assert wdg.value().replace(metadata={}) == MDA
+
+
 def test_channel_groups(qtbot: QtBot) -> None:
     wdg = ChannelTable()
     qtbot.addWidget(wdg)